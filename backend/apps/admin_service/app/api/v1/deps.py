@@ -1,19 +1,13 @@
 from typing import Optional
 from fastapi import Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from apps.auth_service.app.core.security import decode_token
+from apps.admin_service.app.core.security import claims_verifier
+from libs.shared.shared.security.jwt_claims import TokenClaims
+from libs.shared.shared.security.verifier import verified_claims
 
-security = HTTPBearer()
+get_current_claims = verified_claims(claims_verifier)
 
 
 def get_current_user_role(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+    claims: Optional[TokenClaims] = Depends(get_current_claims)
 ) -> Optional[str]:
-    if not credentials:
-        return None
-    
-    payload = decode_token(credentials.credentials)
-    if not payload:
-        return None
-    
-    return payload.get("role", "user")
+    return claims.role if claims else None
@@ -12,7 +12,7 @@ router = APIRouter(prefix="/audits", tags=["audits"])
 
 
 @router.get("", response_model=list[AuditLogOut])
-async def get_audits(
+def get_audits(
     actor_id: Optional[int] = Query(default=None),
     entity_type: Optional[str] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=100),
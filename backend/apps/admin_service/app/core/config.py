@@ -4,6 +4,11 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     app_name: str = "Admin Service"
     database_url: str = "sqlite:///./admin_service.db"
+    # Потоки для синхронных обработчиков (запросы к БД блокирующие и не выполняются в event loop)
+    threadpool_size: int = 40
+    # Открытые ключи auth_service для проверки токенов на месте; проверенные токены кэшируются до exp
+    auth_jwks_url: str = "http://localhost:8001/.well-known/jwks.json"
+    claims_cache_size: int = 4096
     
     class Config:
         env_file = ".env"
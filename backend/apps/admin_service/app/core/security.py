@@ -0,0 +1,7 @@
+from libs.shared.shared.security.jwks import JWKSKeySet, fetch_jwks
+from libs.shared.shared.security.verifier import ClaimsVerifier
+from apps.admin_service.app.core.config import settings
+
+# Ключи загружаются в startup; токен с новым kid после ротации перечитывает JWKS
+jwks = JWKSKeySet(fetch_jwks(settings.auth_jwks_url))
+claims_verifier = ClaimsVerifier(jwks.decode, maxsize=settings.claims_cache_size)
@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from apps.admin_service.app.core.config import settings
+from apps.admin_service.app.core.security import jwks
 from apps.admin_service.app.db.session import init_db
 from apps.admin_service.app.api.v1.routes import audits
+from libs.shared.shared.utils.concurrency import configure_threadpool
 
 app = FastAPI(title=settings.app_name, version="1.0.0")
 
@@ -19,7 +21,10 @@ app.include_router(audits.router, prefix="/api/v1")
 
 @app.on_event("startup")
 async def startup_event():
+    configure_threadpool(settings.threadpool_size)
     init_db()
+    # Если auth_service еще не поднялся, ключи загрузятся с первым токеном
+    jwks.try_load()
 
 
 @app.get("/health")
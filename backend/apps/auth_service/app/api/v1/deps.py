@@ -1,49 +1,5 @@
-from typing import Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from apps.auth_service.app.db.session import get_db
-from apps.auth_service.app.core.security import decode_token
-from apps.auth_service.app.repositories.user_repo import UserRepository
-from libs.shared.shared.errors.exceptions import UnauthorizedError
+from libs.shared.shared.security.verifier import verified_claims
+from apps.auth_service.app.core.security import claims_verifier
 
-security = HTTPBearer()
-
-
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    token = credentials.credentials
-    payload = decode_token(token)
-    
-    if not payload or "sub" not in payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
-    
-    user_id = int(payload["sub"])
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(user_id)
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    
-    return user
-
-
-def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
-):
-    if not credentials:
-        return None
-    
-    try:
-        return get_current_user(credentials, db)
-    except HTTPException:
-        return None
+# Id и роль из токена без запроса к БД; пользователя загружает сервис, если он нужен
+get_current_claims = verified_claims(claims_verifier, required=True)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from apps.auth_service.app.db.session import get_db
 from apps.auth_service.app.services.auth_service import AuthService
 from apps.auth_service.app.services.email_service import EmailService
 from apps.auth_service.app.core.rate_limit import rate_limit
+from apps.auth_service.app.core.hashing import password_slot
 from apps.auth_service.app.schemas.auth import (
     RegisterRequest,
     RegisterResponse,
@@ -15,17 +16,20 @@ from apps.auth_service.app.schemas.auth import (
     ResetPasswordRequest,
     EmailVerifyRequest
 )
-from apps.auth_service.app.api.v1.deps import get_current_user
-from apps.auth_service.app.db.models.user import User
+from apps.auth_service.app.api.v1.deps import get_current_claims
+from libs.shared.shared.security.jwt_claims import TokenClaims
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
-@rate_limit(max_requests=5, window_seconds=300)
-async def register(
+@router.post(
+    "/register",
+    response_model=RegisterResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(password_slot), Depends(rate_limit("register", 5, 300))]
+)
+def register(
     data: RegisterRequest,
-    request: Request,
     db: Session = Depends(get_db)
 ):
     auth_service = AuthService(db)
@@ -39,10 +43,13 @@ async def register(
     return RegisterResponse(user=user)
 
 
-@router.post("/login", response_model=LoginResponse)
-async def login(
+@router.post(
+    "/login",
+    response_model=LoginResponse,
+    dependencies=[Depends(password_slot), Depends(rate_limit("login", 10, 300))]
+)
+def login(
     data: LoginRequest,
-    request: Request,
     db: Session = Depends(get_db)
 ):
     auth_service = AuthService(db)
@@ -50,8 +57,8 @@ async def login(
     return LoginResponse(user=user, tokens=tokens)
 
 
-@router.post("/refresh", response_model=RefreshResponse)
-async def refresh(
+@router.post("/refresh", response_model=RefreshResponse, dependencies=[Depends(rate_limit("refresh", 30, 60))])
+def refresh(
     data: RefreshRequest,
     db: Session = Depends(get_db)
 ):
@@ -61,9 +68,9 @@ async def refresh(
 
 
 @router.post("/logout")
-async def logout(
+def logout(
     data: RefreshRequest,
-    current_user: User = Depends(get_current_user),
+    claims: TokenClaims = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     auth_service = AuthService(db)
@@ -71,11 +78,9 @@ async def logout(
     return {"message": "Logged out successfully"}
 
 
-@router.post("/password/forgot")
-@rate_limit(max_requests=3, window_seconds=3600)
-async def forgot_password(
+@router.post("/password/forgot", dependencies=[Depends(rate_limit("password_forgot", 3, 3600))])
+def forgot_password(
     data: ForgotPasswordRequest,
-    request: Request,
     db: Session = Depends(get_db)
 ):
     auth_service = AuthService(db)
@@ -88,8 +93,11 @@ async def forgot_password(
     return {"message": "If email exists, password reset link has been sent"}
 
 
-@router.post("/password/reset")
-async def reset_password(
+@router.post(
+    "/password/reset",
+    dependencies=[Depends(password_slot), Depends(rate_limit("password_reset", 5, 300))]
+)
+def reset_password(
     data: ResetPasswordRequest,
     db: Session = Depends(get_db)
 ):
@@ -99,7 +107,7 @@ async def reset_password(
 
 
 @router.post("/email/verify")
-async def verify_email(
+def verify_email(
     data: EmailVerifyRequest,
     db: Session = Depends(get_db)
 ):
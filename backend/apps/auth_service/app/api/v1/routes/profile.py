@@ -3,39 +3,40 @@ from sqlalchemy.orm import Session
 from apps.auth_service.app.db.session import get_db
 from apps.auth_service.app.services.user_service import UserService
 from apps.auth_service.app.schemas.user import ProfileResponse, ProfileUpdateRequest, ChangePasswordRequest
-from apps.auth_service.app.api.v1.deps import get_current_user
-from apps.auth_service.app.db.models.user import User
+from apps.auth_service.app.api.v1.deps import get_current_claims
+from apps.auth_service.app.core.hashing import password_slot
+from libs.shared.shared.security.jwt_claims import TokenClaims
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
 
 @router.get("", response_model=ProfileResponse)
-async def get_profile(
-    current_user: User = Depends(get_current_user),
+def get_profile(
+    claims: TokenClaims = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     user_service = UserService(db)
-    user = user_service.get_profile(current_user.id)
+    user = user_service.get_profile(claims.user_id)
     return ProfileResponse(user=user)
 
 
 @router.patch("", response_model=ProfileResponse)
-async def update_profile(
+def update_profile(
     data: ProfileUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    claims: TokenClaims = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     user_service = UserService(db)
-    user = user_service.update_profile(current_user.id, data)
+    user = user_service.update_profile(claims.user_id, data)
     return ProfileResponse(user=user)
 
 
-@router.post("/password/change")
-async def change_password(
+@router.post("/password/change", dependencies=[Depends(password_slot)])
+def change_password(
     data: ChangePasswordRequest,
-    current_user: User = Depends(get_current_user),
+    claims: TokenClaims = Depends(get_current_claims),
     db: Session = Depends(get_db)
 ):
     user_service = UserService(db)
-    user_service.change_password(current_user.id, data)
+    user_service.change_password(claims.user_id, data)
     return {"message": "Password changed successfully"}
@@ -15,13 +15,42 @@ class Settings(BaseSettings):
     # Создаем директорию если не существует
     _db_path.parent.mkdir(parents=True, exist_ok=True)
     database_url: str = f"sqlite:///{_db_path}"
-    # SECRET_KEY автоматически читается из переменной окружения SECRET_KEY через BaseSettings
+    # Потоки для синхронных обработчиков (запросы к БД блокирующие и не выполняются в event loop)
+    threadpool_size: int = 40
+    # Access- и refresh-токены подписываются RS256 ключами из jwt_keys_dir (<kid>.pem), открытые ключи
+    # публикуются в /.well-known/jwks.json. Новый ключ начинает подписывать через jwt_key_activation_seconds,
+    # чтобы сервисы успели перечитать JWKS; jwt_active_kid задает ключ явно
+    jwt_keys_dir: str = str(_service_dir / "keys")
+    jwt_active_kid: str = ""
+    jwt_key_activation_seconds: float = 300.0
+    # SECRET_KEY автоматически читается из переменной окружения SECRET_KEY через BaseSettings.
+    # Им подписываются только токены из писем (подтверждение email, сброс пароля)
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
+    # Refresh-токены HS256, выданные до перехода на RS256, обновляются на новые, пока их строки есть
+    # в refresh_tokens (не дольше refresh_token_expire_days). Старые access-токены не принимаются:
+    # клиент получает 401 и обновляет пару, повторный вход не нужен
+    jwt_accept_legacy_hs256: bool = True
     access_token_expire_minutes: int = 30
+    # Проверенные access-токены в памяти процесса до их exp
+    claims_cache_size: int = 4096
     refresh_token_expire_days: int = 7
+    # Очистка истекших и отозванных refresh-токенов в фоне: интервал (0 - выключена) и размер пачки удаления
+    refresh_token_purge_interval_seconds: float = 3600.0
+    refresh_token_purge_batch_size: int = 1000
     email_verification_token_expire_hours: int = 24
     password_reset_token_expire_hours: int = 1
+    # Стоимость bcrypt: при изменении хэш пользователя пересчитывается при следующем входе
+    bcrypt_rounds: int = 12
+    # Процессы для bcrypt (0 - в потоке обработчика) и предел запросов с bcrypt в работе и в очереди, сверх него 503
+    password_hash_workers: int = os.cpu_count() or 1
+    password_hash_max_pending: int = 64
+    # Ограничение частоты запросов (GCRA): memory - в процессе воркера, sqlite - общее для всех воркеров
+    rate_limit_backend: str = "memory"
+    rate_limit_max_keys: int = 100000
+    rate_limit_database_url: str = f"sqlite:///{_service_dir / 'rate_limits.db'}"
+    rate_limit_busy_timeout_ms: int = 5000
+    rate_limit_evict_interval_seconds: float = 60.0
     
     class Config:
         env_file = ".env"
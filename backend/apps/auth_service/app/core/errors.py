@@ -11,7 +11,8 @@ async def app_exception_handler(request: Request, exc: AppException):
             error_code=exc.error_code,
             message=exc.message,
             details=exc.details
-        ).model_dump()
+        ).model_dump(),
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -0,0 +1,88 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Optional
+import bcrypt
+from libs.shared.shared.errors.exceptions import ServiceUnavailableError
+from apps.auth_service.app.core.config import settings
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _check(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def _ready() -> bool:
+    return True
+
+
+class PasswordHasher:
+    """bcrypt в отдельных процессах: не больше workers хэширований одновременно.
+    Запросы с bcrypt занимают слот через password_slot, сверх max_pending - 503.
+    До start() (скрипты, миграции) хэширование идет в вызывающем потоке"""
+
+    def __init__(self, workers: int, max_pending: int):
+        self._workers = workers
+        self._max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Занятые слоты - запросы с bcrypt в работе и в очереди
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def start(self) -> None:
+        if self._executor is not None or self._workers <= 0:
+            return
+        # spawn, а не fork: к моменту старта в процессе уже есть потоки и соединения с БД
+        self._executor = ProcessPoolExecutor(self._workers, mp_context=multiprocessing.get_context("spawn"))
+        # Процессы поднимаются заранее, чтобы первые логины не ждали их запуска
+        for future in [self._executor.submit(_ready) for _ in range(self._workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def acquire(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailableError("Too many password operations in progress", retry_after=1)
+
+    def release(self) -> None:
+        self._slots.release()
+
+    def _run(self, fn, *args):
+        executor = self._executor
+        if executor is None:
+            return fn(*args)
+        # Ждет поток пула FastAPI, event loop не блокируется
+        return executor.submit(fn, *args).result()
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password.encode("utf-8"), settings.bcrypt_rounds).decode("utf-8")
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._run(_check, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    @staticmethod
+    def needs_rehash(hashed: str) -> bool:
+        """Хэш сделан с другой стоимостью, чем в настройках: $2b$<rounds>$..."""
+        try:
+            return int(hashed.split("$")[2]) != settings.bcrypt_rounds
+        except (IndexError, ValueError):
+            return True
+
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_max_pending)
+
+
+async def password_slot() -> AsyncIterator[None]:
+    """Dependency для маршрутов с bcrypt. Слот берется в event loop, до очереди пула потоков
+    FastAPI: иначе лишние запросы ждут свободный поток без ограничения и 503 не отдается.
+    Ставится первой, раньше синхронных зависимостей: dependencies=[Depends(password_slot), ...]"""
+    password_hasher.acquire()
+    try:
+        yield
+    finally:
+        password_hasher.release()
@@ -0,0 +1,104 @@
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+from jose.backends import RSAKey
+from libs.shared.shared.security.jwks import ALGORITHMS
+
+
+class SigningKeys:
+    """Ключи подписи токенов: файлы <kid>.pem в keys_dir. В JWKS публикуются все ключи каталога,
+    поэтому токены, подписанные прежним ключом, проверяются до своего exp.
+    Подписывает active_kid, а если он не задан - самый новый ключ, которому не меньше
+    activation_seconds: сервисы успевают увидеть его в JWKS раньше первого токена с ним.
+    Каталог перечитывается при изменении, ротация не требует перезапуска"""
+
+    def __init__(self, keys_dir: Path, active_kid: str = "", activation_seconds: float = 0.0):
+        self._dir = keys_dir
+        self._active_kid = active_kid
+        self._activation = activation_seconds
+        self._lock = threading.Lock()
+        self._dir_mtime: Optional[int] = None
+        # kid -> (закрытый ключ, время создания файла)
+        self._keys: Dict[str, Tuple[RSAKey, float]] = {}
+        self._jwks: dict = {"keys": []}
+
+    def generate(self) -> str:
+        """Новый ключ RSA 2048 в каталоге; возвращает kid"""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        kid = f"{time.strftime('%Y%m%d%H%M%S')}-{secrets.token_hex(4)}"
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        )
+        # Файл пишется целиком до появления под своим именем: воркеры не прочтут половину ключа
+        tmp_path = self._dir / f".{kid}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            file.write(pem)
+        os.rename(tmp_path, self._dir / f"{kid}.pem")
+        return kid
+
+    def _refresh(self) -> None:
+        try:
+            mtime = self._dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime is not None and mtime == self._dir_mtime:
+            return
+        with self._lock:
+            paths = sorted(self._dir.glob("*.pem")) if mtime is not None else []
+            if not paths:
+                # Первый запуск без ключей (разработка): создаем ключ сами
+                self.generate()
+                paths = sorted(self._dir.glob("*.pem"))
+                mtime = self._dir.stat().st_mtime_ns
+            keys = {}
+            for path in paths:
+                known = self._keys.get(path.stem)
+                keys[path.stem] = known or (RSAKey(path.read_text(), ALGORITHMS[0]), path.stat().st_mtime)
+            jwks = []
+            for kid, (key, _) in keys.items():
+                public = key.public_key().to_dict()
+                public.update(kid=kid, use="sig")
+                jwks.append(public)
+            self._keys = keys
+            self._jwks = {"keys": jwks}
+            self._dir_mtime = mtime
+
+    def validate(self) -> None:
+        """Проверка при старте: без нее ошибка в настройке ключей стала бы 500 на каждом логине"""
+        self.active()
+
+    def active(self) -> Tuple[str, RSAKey]:
+        self._refresh()
+        keys = self._keys
+        if not keys:
+            raise RuntimeError(f"No signing keys (*.pem) in JWT_KEYS_DIR={self._dir}")
+        if self._active_kid:
+            if self._active_kid not in keys:
+                raise RuntimeError(
+                    f"JWT_ACTIVE_KID={self._active_kid} has no key file in JWT_KEYS_DIR={self._dir}; "
+                    f"available: {', '.join(sorted(keys))}"
+                )
+            return self._active_kid, keys[self._active_kid][0]
+        by_age: List[Tuple[float, str]] = sorted((created, kid) for kid, (_, created) in keys.items())
+        ready = [(created, kid) for created, kid in by_age if created + self._activation <= time.time()]
+        # Пока ни один ключ не выдержан (первый запуск), подписывает самый старый: он опубликован раньше всех
+        _, kid = ready[-1] if ready else by_age[0]
+        return kid, keys[kid][0]
+
+    def sign(self, payload: dict) -> str:
+        kid, key = self.active()
+        return jwt.encode(payload, key, algorithm=ALGORITHMS[0], headers={"kid": kid})
+
+    def jwks(self) -> dict:
+        self._refresh()
+        return self._jwks
@@ -1,34 +1,157 @@
-from functools import lru_cache, wraps
-from typing import Dict, Callable
-from datetime import datetime, timedelta
-from fastapi import Request, HTTPException, status, Depends
-from fastapi.routing import APIRoute
-import functools
-
-
-class RateLimiter:
-    def __init__(self):
-        self._requests: Dict[str, list] = {}
-    
-    def is_allowed(self, key: str, max_requests: int, window_seconds: int) -> bool:
-        now = datetime.now()
-        if key not in self._requests:
-            self._requests[key] = []
-        
-        window_start = now - timedelta(seconds=window_seconds)
-        self._requests[key] = [
-            req_time for req_time in self._requests[key]
-            if req_time > window_start
-        ]
-        
-        if len(self._requests[key]) >= max_requests:
-            return False
-        
-        self._requests[key].append(now)
-        return True
-
-
-_rate_limiter = RateLimiter()
+import heapq
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import Request, HTTPException, status
+from sqlalchemy import create_engine, event, text
+from apps.auth_service.app.core.config import settings
+
+
+@dataclass(frozen=True)
+class RatePolicy:
+    """limit запросов за period_seconds; burst - сколько можно сделать подряд (по умолчанию limit)"""
+    limit: int
+    period_seconds: float
+    burst: Optional[int] = None
+
+    @property
+    def interval(self) -> float:
+        return self.period_seconds / self.limit
+
+    @property
+    def tolerance(self) -> float:
+        return self.interval * (self.burst or self.limit)
+
+
+@dataclass(frozen=True)
+class RateDecision:
+    allowed: bool
+    retry_after: float = 0.0
+
+
+class MemoryBackend:
+    """GCRA в памяти процесса: на ключ хранится одно число - теоретическое время прихода (TAT).
+    Ключ с TAT в прошлом ничем не отличается от нового, такие ключи удаляются в порядке TAT"""
+
+    name = "memory"
+
+    def __init__(self, max_keys: int, clock: Callable[[], float] = time.monotonic):
+        self._tat: Dict[str, float] = {}
+        # Куча (TAT, ключ) в порядке истечения; записи, устаревшие после нового запроса ключа, пропускаются
+        self._expiry: List[Tuple[float, str]] = []
+        self._max_keys = max_keys
+        self._clock = clock
+        # Синхронные зависимости выполняются в пуле потоков
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def hit(self, key: str, policy: RatePolicy) -> RateDecision:
+        with self._lock:
+            now = self._clock()
+            self._evict(now)
+            tat = max(self._tat.get(key, now), now)
+            new_tat = tat + policy.interval
+            if new_tat - policy.tolerance > now:
+                return RateDecision(False, new_tat - policy.tolerance - now)
+            self._tat[key] = new_tat
+            heapq.heappush(self._expiry, (new_tat, key))
+            return RateDecision(True)
+
+    def _pop(self) -> None:
+        tat, key = heapq.heappop(self._expiry)
+        if self._tat.get(key) == tat:
+            del self._tat[key]
+            self.evicted += 1
+
+    def _evict(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            self._pop()
+        # Жесткий предел памяти: первым теряет состояние ключ, который истек бы раньше всех.
+        # Ключ у предела имеет самый поздний TAT, поэтому поток новых ключей не сбрасывает его счетчик
+        while len(self._tat) > self._max_keys:
+            self._pop()
+        if len(self._expiry) > 2 * len(self._tat) + 1024:
+            self._expiry = [(tat, key) for key, tat in self._tat.items()]
+            heapq.heapify(self._expiry)
+
+    def evict_expired(self) -> int:
+        """Удаляет все истекшие ключи"""
+        with self._lock:
+            evicted = self.evicted
+            self._evict(self._clock())
+            return self.evicted - evicted
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"backend": self.name, "keys": len(self._tat), "max_keys": self._max_keys, "evicted": self.evicted}
+
+
+class SQLiteBackend:
+    """GCRA в общей базе SQLite: одно состояние на все воркеры. Проверка и обновление TAT -
+    один атомарный UPSERT; используется время на часах, а не monotonic, оно общее для процессов"""
+
+    name = "sqlite"
+
+    _HIT = text("""
+        INSERT INTO rate_limits (key, tat) VALUES (:key, :now + :interval)
+        ON CONFLICT(key) DO UPDATE SET tat = max(tat, :now) + :interval
+        WHERE max(tat, :now) + :interval - :tolerance <= :now
+        RETURNING tat
+    """)
+
+    def __init__(self, url: str, evict_interval_seconds: float, clock: Callable[[], float] = time.time):
+        self._engine = create_engine(url, connect_args={"check_same_thread": False})
+        event.listen(self._engine, "connect", self._configure)
+        self._clock = clock
+        self._evict_interval = evict_interval_seconds
+        self._next_evict = 0.0
+        self.evicted = 0
+        with self._engine.begin() as conn:
+            conn.execute(text("CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID"))
+
+    @staticmethod
+    def _configure(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.rate_limit_busy_timeout_ms}")
+        cursor.close()
+
+    def hit(self, key: str, policy: RatePolicy) -> RateDecision:
+        now = self._clock()
+        params = {"key": key, "now": now, "interval": policy.interval, "tolerance": policy.tolerance}
+        with self._engine.begin() as conn:
+            if conn.execute(self._HIT, params).first() is not None:
+                decision = RateDecision(True)
+            else:
+                tat = conn.execute(text("SELECT tat FROM rate_limits WHERE key = :key"), {"key": key}).scalar()
+                decision = RateDecision(False, max(tat + policy.interval - policy.tolerance - now, 0.0))
+        if now >= self._next_evict:
+            self._next_evict = now + self._evict_interval
+            self.evict_expired()
+        return decision
+
+    def evict_expired(self) -> int:
+        with self._engine.begin() as conn:
+            deleted = conn.execute(text("DELETE FROM rate_limits WHERE tat <= :now"), {"now": self._clock()}).rowcount
+        self.evicted += deleted
+        return deleted
+
+    def stats(self) -> dict:
+        with self._engine.connect() as conn:
+            keys = conn.execute(text("SELECT count(*) FROM rate_limits")).scalar()
+        return {"backend": self.name, "keys": keys, "evicted": self.evicted}
+
+
+def _create_backend():
+    if settings.rate_limit_backend == "sqlite":
+        return SQLiteBackend(settings.rate_limit_database_url, settings.rate_limit_evict_interval_seconds)
+    return MemoryBackend(settings.rate_limit_max_keys)
+
+
+_rate_limiter = _create_backend()
 
 
 def get_client_ip(request: Request) -> str:
@@ -37,45 +160,18 @@ def get_client_ip(request: Request) -> str:
     return "unknown"
 
 
-def check_rate_limit(request: Request, max_requests: int = 5, window_seconds: int = 60):
-    """Dependency для проверки rate limit"""
-    ip = get_client_ip(request)
-    key = f"{request.url.path}:{ip}"
-    
-    if not _rate_limiter.is_allowed(key, max_requests, window_seconds):
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many requests"
-        )
-
-
-def rate_limit(max_requests: int = 5, window_seconds: int = 60):
-    """Декоратор для rate limiting - использует dependency injection"""
-    def decorator(func: Callable):
-        # Создаем dependency функцию
-        rate_limit_dep = functools.partial(check_rate_limit, max_requests=max_requests, window_seconds=window_seconds)
-        
-        # Сохраняем оригинальную функцию
-        original_func = func
-        
-        # Создаем обертку, которая добавляет dependency
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Если Request уже в kwargs, проверяем rate limit
-            request = kwargs.get('request')
-            if request and isinstance(request, Request):
-                ip = get_client_ip(request)
-                key = f"{original_func.__name__}:{ip}"
-                if not _rate_limiter.is_allowed(key, max_requests, window_seconds):
-                    raise HTTPException(
-                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                        detail="Too many requests"
-                    )
-            return await original_func(*args, **kwargs)
-        
-        # Добавляем dependency к функции через __annotations__
-        if not hasattr(wrapper, '__annotations__'):
-            wrapper.__annotations__ = {}
-        
-        return wrapper
-    return decorator
+def rate_limit(name: str, limit: int, period_seconds: float, burst: Optional[int] = None) -> Callable:
+    """Dependency для FastAPI: не больше limit запросов за period_seconds с одного IP.
+    Использование: dependencies=[Depends(rate_limit("login", 10, 300))]"""
+    policy = RatePolicy(limit, period_seconds, burst)
+
+    def check_rate_limit(request: Request) -> None:
+        decision = _rate_limiter.hit(f"{name}:{get_client_ip(request)}", policy)
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(decision.retry_after))}
+            )
+
+    return check_rate_limit
@@ -1,22 +1,30 @@
+import uuid
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Optional
 from jose import JWTError, jwt
-import bcrypt
+from libs.shared.shared.security.jwks import JWKSKeySet
 from libs.shared.shared.security.roles import Role
+from libs.shared.shared.security.verifier import ClaimsVerifier
 from apps.auth_service.app.core.config import settings
+from apps.auth_service.app.core.hashing import password_hasher
+from apps.auth_service.app.core.keys import SigningKeys
+
+signing_keys = SigningKeys(Path(settings.jwt_keys_dir), settings.jwt_active_kid, settings.jwt_key_activation_seconds)
+# Сам auth_service проверяет токены тем же кодом, что и остальные сервисы, только JWKS берет локально
+verification_keys = JWKSKeySet(signing_keys.jwks, min_refresh_seconds=1.0, max_age_seconds=60.0)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    password_bytes = plain_password.encode('utf-8')
-    hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    return password_hasher.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+    return password_hasher.hash(password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return password_hasher.needs_rehash(hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -26,22 +34,49 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
     to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
+    return signing_keys.sign(to_encode)
 
 
 def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
     to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc), "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
+    # jti - ключ поиска токена в базе; заодно два токена, выданных в одну секунду, не совпадают
+    to_encode.setdefault("jti", new_token_id())
+    return signing_keys.sign(to_encode)
+
+
+def new_token_id() -> str:
+    return uuid.uuid4().hex
 
 
 def decode_token(token: str) -> dict:
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    return verification_keys.decode(token)
+
+
+claims_verifier = ClaimsVerifier(decode_token, maxsize=settings.claims_cache_size)
+
+
+def decode_refresh_token(token: str) -> dict:
+    payload = decode_token(token)
+    if payload or not settings.jwt_accept_legacy_hs256:
         return payload
+    # Refresh-токен, подписанный secret_key до перехода на RS256: без kid и с типом refresh.
+    # Подделка с secret_key ничего не дает - токен должен найтись в refresh_tokens
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError:
+        return {}
+    if header.get("alg") != settings.algorithm or header.get("kid"):
+        return {}
+    payload = decode_internal_token(token)
+    return payload if payload.get("type") == "refresh" else {}
+
+
+# Токены из писем проверяет только auth_service: они подписаны secret_key и другими сервисами не принимаются
+def decode_internal_token(token: str) -> dict:
+    try:
+        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
     except JWTError:
         return {}
 
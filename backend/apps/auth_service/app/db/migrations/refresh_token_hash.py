@@ -0,0 +1,53 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from apps.auth_service.app.db.models.refresh_token import RefreshToken
+
+BATCH_SIZE = 5000
+
+
+def upgrade(conn: Connection) -> None:
+    """Переводит refresh_tokens с хранения токена целиком на jti и sha256 токена.
+    SQLite не удаляет UNIQUE-колонку, поэтому таблица пересоздается; переносятся только неотозванные
+    токены, их jti - тот же хэш (в старых токенах нет jti). Истекшие удалит очистка"""
+    columns = {column["name"] for column in inspect(conn).get_columns("refresh_tokens")}
+    if "token" not in columns:
+        return
+    
+    conn.exec_driver_sql("ALTER TABLE refresh_tokens RENAME TO refresh_tokens_legacy")
+    # Индексы переименованной таблицы сохраняют имена и помешали бы создать новые
+    for index in inspect(conn).get_indexes("refresh_tokens_legacy"):
+        conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{index["name"]}"')
+    RefreshToken.__table__.create(conn)
+    _copy(conn)
+    conn.exec_driver_sql("DROP TABLE refresh_tokens_legacy")
+
+
+def _copy(conn: Connection) -> None:
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text(
+                "SELECT id, user_id, token, expires_at, created_at FROM refresh_tokens_legacy "
+                "WHERE id > :last_id AND is_revoked = 0 ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            return
+        conn.execute(
+            text(
+                "INSERT INTO refresh_tokens (id, user_id, jti, token_hash, is_revoked, expires_at, created_at) "
+                "VALUES (:id, :user_id, :token_hash, :token_hash, 0, :expires_at, :created_at)"
+            ),
+            [
+                {
+                    "id": token_id,
+                    "user_id": user_id,
+                    "token_hash": RefreshToken.hash(token),
+                    "expires_at": expires_at,
+                    "created_at": created_at
+                }
+                for token_id, user_id, token, expires_at, created_at in rows
+            ]
+        )
+        last_id = rows[-1][0]
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+import hashlib
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from apps.auth_service.app.db.base import Base
@@ -9,9 +10,20 @@ class RefreshToken(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    token = Column(String(500), unique=True, nullable=False, index=True)
+    # Поиск при обновлении - по jti из проверенного токена; сам токен не хранится, только его sha256
+    jti = Column(String(64), unique=True, nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False, index=True)
     is_revoked = Column(Boolean, default=False, nullable=False)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     
     user = relationship("User", back_populates="refresh_tokens")
+    
+    __table_args__ = (
+        # Очистка находит отозванные токены по маленькому частичному индексу, а не просмотром таблицы
+        Index("ix_refresh_tokens_revoked", "id", sqlite_where=text("is_revoked = 1")),
+    )
+    
+    @staticmethod
+    def hash(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
@@ -2,6 +2,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from apps.auth_service.app.core.config import settings
 from apps.auth_service.app.db.base import Base
+from apps.auth_service.app.db.migrations import refresh_token_hash
 from apps.auth_service.app.db.models import User, RefreshToken, AuditLog
 import os
 from pathlib import Path
@@ -22,6 +23,9 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    
+    with engine.begin() as conn:
+        refresh_token_hash.upgrade(conn)
 
 
 def get_db():
@@ -1,11 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from apps.auth_service.app.core.config import settings
+from apps.auth_service.app.core.hashing import password_hasher
+from apps.auth_service.app.core.security import signing_keys
 from apps.auth_service.app.core.errors import app_exception_handler, validation_exception_handler
 from apps.auth_service.app.db.session import init_db
+from apps.auth_service.app.services.token_purger import token_purger
 from libs.shared.shared.errors.exceptions import AppException
 from pydantic import ValidationError
 from apps.auth_service.app.api.v1.routes import auth, profile
+from libs.shared.shared.utils.concurrency import configure_threadpool
 
 app = FastAPI(title=settings.app_name, version="1.0.0")
 
@@ -26,7 +31,25 @@ app.include_router(profile.router, prefix="/api/v1")
 
 @app.on_event("startup")
 async def startup_event():
+    configure_threadpool(settings.threadpool_size)
     init_db()
+    # Ключи подписи читаются (или создаются при первом запуске) до первого логина;
+    # неверный JWT_ACTIVE_KID останавливает запуск
+    signing_keys.validate()
+    password_hasher.start()
+    token_purger.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    token_purger.stop()
+    password_hasher.shutdown()
+
+
+@app.get("/.well-known/jwks.json")
+def jwks():
+    # Кэш посредников заметно короче jwt_key_activation_seconds: новый ключ виден раньше, чем им подписывают
+    return JSONResponse(signing_keys.jwks(), headers={"Cache-Control": "public, max-age=60"})
 
 
 @app.get("/health")
@@ -1,39 +1,66 @@
 from typing import Optional
+from sqlalchemy import delete, select, true, update
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from apps.auth_service.app.db.models.refresh_token import RefreshToken
 
 
 class TokenRepository:
+    """Методы не делают commit: обновление токенов (отзыв старого и выдача нового) - одна транзакция сервиса"""
+    
     def __init__(self, db: Session):
         self.db = db
     
-    def create(self, user_id: int, token: str, expires_at: datetime) -> RefreshToken:
+    def create(self, user_id: int, jti: str, token: str, expires_at: datetime) -> RefreshToken:
         refresh_token = RefreshToken(
             user_id=user_id,
-            token=token,
+            jti=jti,
+            token_hash=RefreshToken.hash(token),
             expires_at=expires_at
         )
         self.db.add(refresh_token)
-        self.db.commit()
-        self.db.refresh(refresh_token)
         return refresh_token
     
-    def get_by_token(self, token: str) -> Optional[RefreshToken]:
+    def get_active(self, jti: str, token: str) -> Optional[RefreshToken]:
         return self.db.query(RefreshToken).filter(
-            RefreshToken.token == token,
+            RefreshToken.jti == jti,
+            RefreshToken.token_hash == RefreshToken.hash(token),
             RefreshToken.is_revoked == False,
             RefreshToken.expires_at > datetime.now(timezone.utc)
         ).first()
     
+    def revoke(self, token_id: int) -> bool:
+        """Отзывает токен, если он еще не отозван. False - его уже отозвал параллельный запрос"""
+        result = self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == token_id, RefreshToken.is_revoked == False)
+            .values(is_revoked=True)
+        )
+        return result.rowcount == 1
+    
     def revoke_token(self, token: str) -> None:
-        refresh_token = self.db.query(RefreshToken).filter(RefreshToken.token == token).first()
-        if refresh_token:
-            refresh_token.is_revoked = True
-            self.db.commit()
+        self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.token_hash == RefreshToken.hash(token))
+            .values(is_revoked=True)
+        )
     
     def revoke_all_user_tokens(self, user_id: int) -> None:
         self.db.query(RefreshToken).filter(RefreshToken.user_id == user_id).update(
             {"is_revoked": True}
         )
-        self.db.commit()
+    
+    def delete_expired(self, now: datetime, limit: int) -> int:
+        return self._delete_batch(RefreshToken.expires_at <= now, limit)
+    
+    def delete_revoked(self, limit: int) -> int:
+        # "is_revoked = 1" литералом: так условие совпадает с частичным индексом ix_refresh_tokens_revoked
+        return self._delete_batch(RefreshToken.is_revoked == true(), limit)
+    
+    def _delete_batch(self, criterion, limit: int) -> int:
+        ids = select(RefreshToken.id).where(criterion).limit(limit)
+        result = self.db.execute(
+            delete(RefreshToken).where(RefreshToken.id.in_(ids)),
+            execution_options={"synchronize_session": False}
+        )
+        return result.rowcount
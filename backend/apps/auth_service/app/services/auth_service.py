@@ -5,13 +5,18 @@ from apps.auth_service.app.repositories.token_repo import TokenRepository
 from apps.auth_service.app.core.security import (
     verify_password,
     get_password_hash,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
-    decode_token,
+    new_token_id,
+    decode_refresh_token,
+    decode_internal_token,
     create_email_verification_token,
     create_password_reset_token
 )
 from apps.auth_service.app.core.config import settings
+from apps.auth_service.app.db.models.refresh_token import RefreshToken
+from apps.auth_service.app.db.models.user import User
 from libs.shared.shared.errors.exceptions import ConflictError, UnauthorizedError, NotFoundError
 from apps.auth_service.app.schemas.auth import (
     RegisterRequest,
@@ -46,16 +51,18 @@ class AuthService:
         if not user or not verify_password(data.password, user.password_hash):
             raise UnauthorizedError("Invalid email or password")
         
+        # Пароль известен только сейчас: хэш со старой стоимостью заменяется на новый
+        if password_needs_rehash(user.password_hash):
+            self.user_repo.update(user, password_hash=get_password_hash(data.password))
+        
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
         access_token = create_access_token(
             data={"sub": str(user.id), "role": user.role},
             expires_delta=access_token_expires
         )
         
-        refresh_token = create_refresh_token(data={"sub": str(user.id), "role": user.role})
-        refresh_expires = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
-        
-        self.token_repo.create(user.id, refresh_token, refresh_expires)
+        refresh_token = self._issue_refresh_token(user)
+        self.db.commit()
         
         tokens = TokenPair(
             access_token=access_token,
@@ -66,11 +73,14 @@ class AuthService:
         return UserPublic.model_validate(user), tokens
     
     def refresh_tokens(self, refresh_token: str) -> TokenPair:
-        token_data = decode_token(refresh_token)
+        token_data = decode_refresh_token(refresh_token)
         if not token_data or token_data.get("type") != "refresh":
             raise UnauthorizedError("Invalid refresh token")
         
-        stored_token = self.token_repo.get_by_token(refresh_token)
+        # В токенах HS256, выданных до перехода на RS256, jti нет: миграция refresh_token_hash
+        # перенесла их строки с хэшем в качестве jti
+        jti = token_data.get("jti") or RefreshToken.hash(refresh_token)
+        stored_token = self.token_repo.get_active(jti, refresh_token)
         if not stored_token:
             raise UnauthorizedError("Refresh token not found or expired")
         
@@ -84,11 +94,13 @@ class AuthService:
             expires_delta=access_token_expires
         )
         
-        new_refresh_token = create_refresh_token(data={"sub": str(user.id), "role": user.role})
-        refresh_expires = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
-        
-        self.token_repo.revoke_token(refresh_token)
-        self.token_repo.create(user.id, new_refresh_token, refresh_expires)
+        # Отзыв старого и выдача нового токена - одна транзакция. Отзыв условный: из двух одновременных
+        # обновлений одним токеном новый токен получает только первое
+        if not self.token_repo.revoke(stored_token.id):
+            self.db.rollback()
+            raise UnauthorizedError("Refresh token not found or expired")
+        new_refresh_token = self._issue_refresh_token(user)
+        self.db.commit()
         
         return TokenPair(
             access_token=new_access_token,
@@ -98,12 +110,20 @@ class AuthService:
     
     def logout(self, refresh_token: str) -> None:
         self.token_repo.revoke_token(refresh_token)
+        self.db.commit()
+    
+    def _issue_refresh_token(self, user: User) -> str:
+        jti = new_token_id()
+        refresh_token = create_refresh_token(data={"sub": str(user.id), "role": user.role, "jti": jti})
+        refresh_expires = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+        self.token_repo.create(user.id, jti, refresh_token, refresh_expires)
+        return refresh_token
     
     def create_email_verification_token(self, user_id: int) -> str:
         return create_email_verification_token(user_id)
     
     def verify_email(self, token: str) -> UserPublic:
-        token_data = decode_token(token)
+        token_data = decode_internal_token(token)
         if not token_data or token_data.get("type") != "email_verification":
             raise UnauthorizedError("Invalid verification token")
         
@@ -126,7 +146,7 @@ class AuthService:
         return create_password_reset_token(user.id)
     
     def reset_password(self, token: str, new_password: str) -> None:
-        token_data = decode_token(token)
+        token_data = decode_internal_token(token)
         if not token_data or token_data.get("type") != "password_reset":
             raise UnauthorizedError("Invalid reset token")
         
@@ -0,0 +1,76 @@
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+from apps.auth_service.app.core.config import settings
+from apps.auth_service.app.db.session import SessionLocal
+from apps.auth_service.app.repositories.token_repo import TokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TokenPurger:
+    """Раз в interval_seconds удаляет истекшие и отозванные refresh-токены пачками по batch_size:
+    каждая пачка - своя короткая транзакция, логины и обновления токенов не ждут всю очистку"""
+
+    def __init__(self, session_factory: Callable[[], Session], interval_seconds: float, batch_size: int):
+        self._session_factory = session_factory
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.deleted = 0
+        self.runs = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="auth-token-purger", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def purge(self) -> int:
+        now = datetime.now(timezone.utc)
+        deleted = 0
+        db = self._session_factory()
+        try:
+            repo = TokenRepository(db)
+            for delete_batch in (lambda: repo.delete_expired(now, self._batch_size), lambda: repo.delete_revoked(self._batch_size)):
+                while not self._stop_event.is_set():
+                    count = delete_batch()
+                    db.commit()
+                    deleted += count
+                    if count < self._batch_size:
+                        break
+            self.runs += 1
+        except Exception:
+            db.rollback()
+            self.failed += 1
+            logger.exception("Failed to purge refresh tokens")
+        finally:
+            db.close()
+        self.deleted += deleted
+        return deleted
+
+    def stats(self) -> dict:
+        return {"deleted": self.deleted, "runs": self.runs, "failed": self.failed}
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.purge()
+            self._stop_event.wait(self._interval)
+
+
+token_purger = TokenPurger(
+    session_factory=SessionLocal,
+    interval_seconds=settings.refresh_token_purge_interval_seconds,
+    batch_size=settings.refresh_token_purge_batch_size
+)
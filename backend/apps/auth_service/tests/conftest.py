@@ -0,0 +1,26 @@
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Ключи подписи тестов - во временном каталоге, до импорта настроек сервиса
+os.environ.setdefault("JWT_KEYS_DIR", tempfile.mkdtemp(prefix="auth_tests_keys_"))
+
+import pytest
+from jose import jwt
+from apps.auth_service.app.core.config import settings
+
+
+@pytest.fixture
+def legacy_token():
+    """Токен, как его подписывал auth_service до перехода на RS256"""
+    def make(token_type: str = "refresh", sub: str = "1") -> str:
+        payload = {
+            "sub": sub,
+            "role": "user",
+            "type": token_type,
+            "exp": datetime.now(timezone.utc) + timedelta(days=1),
+            "iat": datetime.now(timezone.utc)
+        }
+        return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+
+    return make
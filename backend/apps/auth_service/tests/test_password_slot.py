@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import bcrypt
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from apps.auth_service.app.core import hashing, security
+from apps.auth_service.app.core.hashing import PasswordHasher
+from apps.auth_service.app.db.base import Base
+from apps.auth_service.app.db.models import User
+from apps.auth_service.app.db.session import get_db
+from apps.auth_service.app.main import app
+from libs.shared.shared.utils.concurrency import configure_threadpool
+
+LOGIN = {"email": "ann@example.com", "password": "password123"}
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    # Маршруты и security.py берут модульный password_hasher
+    hasher = PasswordHasher(0, max_pending=2)
+    monkeypatch.setattr(hashing, "password_hasher", hasher)
+    monkeypatch.setattr(security, "password_hasher", hasher)
+    return hasher
+
+
+@pytest.fixture
+def auth_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'auth.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    password_hash = bcrypt.hashpw(LOGIN["password"].encode("utf-8"), bcrypt.gensalt(4)).decode("utf-8")
+    db.add(User(name="Ann", email=LOGIN["email"], password_hash=password_hash))
+    db.commit()
+    db.close()
+
+    def override():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override
+    yield
+    app.dependency_overrides.pop(get_db, None)
+    engine.dispose()
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/api/v1/auth/login", LOGIN),
+    ("/api/v1/auth/register", {"name": "Ann", "password": "password123", "email": "new@example.com"}),
+])
+def test_saturated_hasher_returns_503(hasher, path, body):
+    hasher.acquire()
+    hasher.acquire()
+    response = TestClient(app).post(path, json=body)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["error_code"] == "SERVICE_UNAVAILABLE"
+
+
+def test_slot_is_taken_before_the_threadpool(hasher, auth_db, monkeypatch):
+    """Пул потоков из одного потока занят логином: второй логин занимает последний слот
+    и ждет поток, третий сразу получает 503, а не встает в очередь пула"""
+    release = threading.Event()
+    verify = hasher.verify
+
+    def blocking_verify(password, hashed):
+        release.wait(5)
+        return verify(password, hashed)
+
+    monkeypatch.setattr(hasher, "verify", blocking_verify)
+
+    async def scenario():
+        configure_threadpool(1)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.post("/api/v1/auth/login", json=LOGIN))
+            second = asyncio.create_task(client.post("/api/v1/auth/login", json=LOGIN))
+            await asyncio.sleep(0.2)
+            third = await asyncio.wait_for(client.post("/api/v1/auth/login", json=LOGIN), 2)
+            release.set()
+            return await first, await second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert third.status_code == 503
+    assert third.headers["Retry-After"] == "1"
+    assert first.status_code == 200
+    assert second.status_code == 200
+    # Слоты освобождены после ответа
+    hasher.acquire()
+    hasher.acquire()
@@ -0,0 +1,53 @@
+from apps.auth_service.app.core.rate_limit import MemoryBackend, RatePolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_long_lived_key_does_not_block_expiry():
+    clock = FakeClock()
+    backend = MemoryBackend(max_keys=100000, clock=clock)
+    # Первый ключ живет сутки и остается самым давним по времени обновления
+    backend.hit("reset:10.0.0.1", RatePolicy(1, 86400))
+    for i in range(1000):
+        backend.hit(f"login:10.0.{i >> 8}.{i & 255}", RatePolicy(10, 300))
+
+    clock.now += 60
+    backend.hit("login:10.1.0.1", RatePolicy(10, 300))
+
+    assert backend.stats()["keys"] == 2
+    assert backend.evicted == 1000
+
+
+def test_key_churn_does_not_reset_a_limited_key():
+    clock = FakeClock()
+    backend = MemoryBackend(max_keys=100, clock=clock)
+    policy = RatePolicy(5, 300)
+    for _ in range(5):
+        assert backend.hit("login:attacker", policy).allowed
+    assert not backend.hit("login:attacker", policy).allowed
+
+    # Поток новых ключей упирается в max_keys: вытесняются они, а не ключ у предела
+    for i in range(10000):
+        backend.hit(f"login:churn-{i}", policy)
+        clock.now += 0.001
+
+    assert backend.stats()["keys"] <= 101
+    assert not backend.hit("login:attacker", policy).allowed
+
+
+def test_evict_expired_removes_all_expired_keys():
+    clock = FakeClock()
+    backend = MemoryBackend(max_keys=100000, clock=clock)
+    for i in range(50):
+        backend.hit(f"k{i}", RatePolicy(10, 300))
+    backend.hit("long", RatePolicy(1, 86400))
+
+    clock.now += 31
+    assert backend.evict_expired() == 50
+    assert backend.stats()["keys"] == 1
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+import bcrypt
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from apps.auth_service.app.db.base import Base
+from apps.auth_service.app.db.migrations import refresh_token_hash
+from apps.auth_service.app.db.models import RefreshToken, User
+from apps.auth_service.app.schemas.auth import LoginRequest
+from apps.auth_service.app.services.auth_service import AuthService
+from apps.auth_service.app.services.token_purger import TokenPurger
+from libs.shared.shared.errors.exceptions import UnauthorizedError
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """База с refresh_tokens в прежней схеме: токен целиком в уникальной колонке"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'auth.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE refresh_tokens (
+                id INTEGER NOT NULL PRIMARY KEY, user_id INTEGER NOT NULL, token VARCHAR(500) NOT NULL,
+                is_revoked BOOLEAN NOT NULL, expires_at DATETIME NOT NULL, created_at DATETIME
+            )
+        """)
+        conn.exec_driver_sql("CREATE UNIQUE INDEX ix_refresh_tokens_token ON refresh_tokens (token)")
+        conn.exec_driver_sql("CREATE INDEX ix_refresh_tokens_id ON refresh_tokens (id)")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def add_legacy_row(engine, token: str, is_revoked: bool = False, expires_in: timedelta = timedelta(days=1)) -> None:
+    expires_at = (datetime.now(timezone.utc) + expires_in).strftime("%Y-%m-%d %H:%M:%S.%f")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO refresh_tokens (user_id, token, is_revoked, expires_at) VALUES (1, ?, ?, ?)",
+            (token, is_revoked, expires_at)
+        )
+
+
+def test_legacy_token_refreshes_after_migration(legacy_db, legacy_token):
+    session_factory = sessionmaker(bind=legacy_db)
+    db = session_factory()
+    db.add(User(id=1, name="Ann", email="ann@example.com", password_hash="-"))
+    db.commit()
+    token = legacy_token()
+    add_legacy_row(legacy_db, token)
+    add_legacy_row(legacy_db, legacy_token(sub="2"), is_revoked=True)
+
+    with legacy_db.begin() as conn:
+        refresh_token_hash.upgrade(conn)
+    # Отозванные строки не переносятся
+    assert db.query(RefreshToken).count() == 1
+
+    tokens = AuthService(db).refresh_tokens(token)
+    assert tokens.refresh_token != token
+    with pytest.raises(UnauthorizedError):
+        AuthService(db).refresh_tokens(token)
+    # Новая пара выдана уже с jti и проходит обычный путь
+    assert AuthService(db).refresh_tokens(tokens.refresh_token).refresh_token
+    db.close()
+
+
+def test_purge_keeps_live_migrated_tokens(legacy_db, legacy_token):
+    session_factory = sessionmaker(bind=legacy_db)
+    db = session_factory()
+    db.add(User(id=1, name="Ann", email="ann@example.com", password_hash="-"))
+    db.commit()
+    token = legacy_token()
+    add_legacy_row(legacy_db, token)
+    for i in range(5):
+        add_legacy_row(legacy_db, f"expired-{i}", expires_in=timedelta(seconds=-i - 1))
+    with legacy_db.begin() as conn:
+        refresh_token_hash.upgrade(conn)
+
+    # Пачки меньше числа строк: очистка идет в несколько транзакций
+    assert TokenPurger(session_factory, 0, batch_size=2).purge() == 5
+    tokens = AuthService(db).refresh_tokens(token)
+    # Отозванный при обновлении токен удаляется следующей очисткой, новый остается
+    assert TokenPurger(session_factory, 0, batch_size=2).purge() == 1
+    db.expire_all()
+    assert db.query(RefreshToken).count() == 1
+    assert AuthService(db).refresh_tokens(tokens.refresh_token).refresh_token
+    db.close()
+
+
+def test_reused_refresh_token_is_rejected(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'auth.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    password_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt(4)).decode("utf-8")
+    db.add(User(name="Ann", email="ann@example.com", password_hash=password_hash))
+    db.commit()
+    _, tokens = AuthService(db).login(LoginRequest(email="ann@example.com", password="password123"))
+
+    refreshed = AuthService(db).refresh_tokens(tokens.refresh_token)
+    with pytest.raises(UnauthorizedError):
+        AuthService(db).refresh_tokens(tokens.refresh_token)
+    assert AuthService(db).refresh_tokens(refreshed.refresh_token).refresh_token
+    db.close()
+    engine.dispose()
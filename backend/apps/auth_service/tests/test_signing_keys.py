@@ -0,0 +1,31 @@
+import pytest
+from apps.auth_service.app.core import security
+from apps.auth_service.app.core.config import settings
+from apps.auth_service.app.core.keys import SigningKeys
+
+
+def test_missing_active_kid_fails_validation(tmp_path):
+    keys = SigningKeys(tmp_path, active_kid="missing")
+    keys.generate()
+
+    with pytest.raises(RuntimeError, match="JWT_ACTIVE_KID=missing"):
+        keys.validate()
+
+
+def test_empty_keys_dir_gets_a_key(tmp_path):
+    keys = SigningKeys(tmp_path / "keys")
+    keys.validate()
+
+    assert len(keys.jwks()["keys"]) == 1
+
+
+def test_legacy_hs256_refresh_token_is_accepted(monkeypatch, legacy_token):
+    token = legacy_token()
+
+    assert security.decode_token(token) == {}
+    assert security.decode_refresh_token(token)["sub"] == "1"
+    # Токены из писем подписаны тем же ключом, но обновить ими пару нельзя
+    assert security.decode_refresh_token(legacy_token("password_reset")) == {}
+
+    monkeypatch.setattr(settings, "jwt_accept_legacy_hs256", False)
+    assert security.decode_refresh_token(token) == {}
@@ -1,36 +1,20 @@
 from typing import Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from apps.dictionary_service.app.db.session import get_db
-from apps.auth_service.app.core.security import decode_token
-from apps.auth_service.app.repositories.user_repo import UserRepository
-from apps.auth_service.app.core.config import settings
+from fastapi import Depends
+from apps.dictionary_service.app.core.security import claims_verifier
+from libs.shared.shared.security.jwt_claims import TokenClaims
+from libs.shared.shared.security.verifier import verified_claims
 
-security = HTTPBearer()
+# Токен проверяется один раз за запрос, id и роль берутся из одних claims
+get_current_claims = verified_claims(claims_verifier)
 
 
 def get_current_user_id(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+    claims: Optional[TokenClaims] = Depends(get_current_claims)
 ) -> Optional[int]:
-    if not credentials:
-        return None
-    
-    payload = decode_token(credentials.credentials)
-    if not payload or "sub" not in payload:
-        return None
-    
-    return int(payload["sub"])
+    return claims.user_id if claims else None
 
 
 def get_current_user_role(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+    claims: Optional[TokenClaims] = Depends(get_current_claims)
 ) -> Optional[str]:
-    if not credentials:
-        return None
-    
-    payload = decode_token(credentials.credentials)
-    if not payload:
-        return None
-    
-    return payload.get("role", "user")
+    return claims.role if claims else None
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 
 
 @router.get("", response_model=list[CategoryOut])
-async def get_categories(
+def get_categories(
     lang: Lang = Query(default=Lang.ru),
     db: Session = Depends(get_db)
 ):
@@ -31,7 +31,7 @@ async def get_categories(
 
 
 @router.get("/{category_id}", response_model=CategoryOut)
-async def get_category(
+def get_category(
     category_id: int,
     lang: Lang = Query(default=Lang.ru),
     db: Session = Depends(get_db)
@@ -41,7 +41,7 @@ async def get_category(
 
 
 @router.post("", response_model=CategoryOut, status_code=201)
-async def create_category(
+def create_category(
     data: CategoryCreateRequest,
     db: Session = Depends(get_db)
 ):
@@ -50,7 +50,7 @@ async def create_category(
 
 
 @router.put("/{category_id}", response_model=CategoryOut)
-async def update_category(
+def update_category(
     category_id: int,
     data: CategoryUpdateRequest,
     lang: Lang = Query(default=Lang.ru),
@@ -61,7 +61,7 @@ async def update_category(
 
 
 @router.delete("/{category_id}", status_code=204)
-async def delete_category(
+def delete_category(
     category_id: int,
     db: Session = Depends(get_db)
 ):
@@ -10,7 +10,7 @@ router = APIRouter(prefix="/favorites", tags=["favorites"])
 
 
 @router.get("", response_model=List[FavoriteOut])
-async def get_favorites(
+def get_favorites(
     db: Session = Depends(get_db),
     user_id: Optional[int] = Depends(get_current_user_id),
     limit: int = Query(default=100, ge=1, le=100),
@@ -28,7 +28,7 @@ async def get_favorites(
 
 
 @router.post("/{term_id}", status_code=201)
-async def add_favorite(
+def add_favorite(
     term_id: int,
     db: Session = Depends(get_db),
     user_id: Optional[int] = Depends(get_current_user_id)
@@ -42,7 +42,7 @@ async def add_favorite(
 
 
 @router.delete("/{term_id}", status_code=204)
-async def remove_favorite(
+def remove_favorite(
     term_id: int,
     db: Session = Depends(get_db),
     user_id: Optional[int] = Depends(get_current_user_id)
@@ -12,7 +12,7 @@ router = APIRouter(prefix="/terms", tags=["moderation"])
 
 
 @router.post("/{term_id}/approve")
-async def approve_term(
+def approve_term(
     term_id: int,
     db: Session = Depends(get_db),
     user_role: Optional[str] = Depends(get_current_user_role)
@@ -29,7 +29,7 @@ async def approve_term(
 
 
 @router.post("/{term_id}/reject")
-async def reject_term(
+def reject_term(
     term_id: int,
     data: RejectRequest,
     db: Session = Depends(get_db),
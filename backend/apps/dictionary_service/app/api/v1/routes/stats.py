@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from apps.dictionary_service.app.services.outbox_purger import outbox_purger
+from apps.dictionary_service.app.services.term_cache import term_cache
+from apps.dictionary_service.app.services.term_service import letter_counts_cache
+from apps.dictionary_service.app.services.view_counter import view_counter
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("")
+def get_stats():
+    return {
+        "term_cache": term_cache.stats(),
+        "letter_counts": letter_counts_cache.stats(),
+        "views": view_counter.stats(),
+        "outbox_purge": outbox_purger.stats()
+    }
@@ -16,7 +16,7 @@ router = APIRouter(prefix="/suggestions", tags=["suggestions"])
 
 
 @router.post("", status_code=201)
-async def create_suggestion(
+def create_suggestion(
     data: SuggestionCreateRequest,
     db: Session = Depends(get_db),
     user_id: Optional[int] = Depends(get_current_user_id)
@@ -30,7 +30,7 @@ async def create_suggestion(
 
 
 @router.get("", response_model=list[SuggestionOut])
-async def get_suggestions(
+def get_suggestions(
     db: Session = Depends(get_db),
     user_role: Optional[str] = Depends(get_current_user_role)
 ):
@@ -45,7 +45,7 @@ async def get_suggestions(
 
 
 @router.post("/{suggestion_id}/approve")
-async def approve_suggestion(
+def approve_suggestion(
     suggestion_id: int,
     db: Session = Depends(get_db),
     user_role: Optional[str] = Depends(get_current_user_role)
@@ -61,7 +61,7 @@ async def approve_suggestion(
 
 
 @router.post("/{suggestion_id}/reject")
-async def reject_suggestion(
+def reject_suggestion(
     suggestion_id: int,
     data: RejectRequest,
     db: Session = Depends(get_db),
@@ -1,13 +1,17 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query
 from sqlalchemy.orm import Session
+from apps.dictionary_service.app.core.config import settings
 from apps.dictionary_service.app.db.session import get_db
 from apps.dictionary_service.app.services.term_service import TermService
+from apps.dictionary_service.app.services.view_counter import view_counter
 from apps.dictionary_service.app.schemas.term import (
     TermCreateRequest,
     TermUpdateRequest,
     TermOut,
-    TermOutFull
+    TermOutFull,
+    TermBulkCreateResponse,
+    LetterCount
 )
 from apps.dictionary_service.app.api.v1.deps import get_current_user_id, get_current_user_role
 from libs.shared.shared.dto.language import Lang
@@ -18,57 +22,52 @@ router = APIRouter(prefix="/terms", tags=["terms"])
 
 
 @router.get("", response_model=list[TermOut])
-async def get_terms(
+def get_terms(
     lang: Lang = Query(default=Lang.ru),
     category_id: Optional[int] = Query(default=None),
     letter: Optional[str] = Query(default=None),
-    status: Optional[str] = Query(default=None),
+    status: Optional[TermStatus] = Query(default=None),
     page: int = Query(default=1, ge=1),
     size: int = Query(default=20, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
     service = TermService(db)
-    term_status = TermStatus(status) if status else None
-    offset = (page - 1) * size
-    
-    terms = service.term_repo.get_all(
+    return service.list_terms(
+        lang=lang,
         category_id=category_id,
-        status=term_status,
-        language=lang.value if letter else None,
+        status=status,
         letter=letter,
         limit=size,
-        offset=offset
+        offset=(page - 1) * size
     )
-    
-    print(f"DEBUG: Found {len(terms)} terms in repo")
-    
-    result = []
-    for term in terms:
-        try:
-            term_out = service.get_term(term.id, lang)
-            result.append(term_out)
-        except Exception as e:
-            import traceback
-            print(f"Error getting term {term.id}: {e}")
-            traceback.print_exc()
-    return result
+
+
+@router.get("/letters", response_model=list[LetterCount])
+def get_letters(
+    lang: Lang = Query(default=Lang.ru),
+    status: Optional[TermStatus] = Query(default=None),
+    db: Session = Depends(get_db)
+):
+    service = TermService(db)
+    return service.get_letter_counts(lang, status)
 
 
 @router.get("/{term_id}", response_model=TermOut)
-async def get_term(
+def get_term(
     term_id: int,
     lang: Lang = Query(default=Lang.ru),
     db: Session = Depends(get_db),
     user_id: Optional[int] = Depends(get_current_user_id)
 ):
     service = TermService(db)
+    term = service.get_term(term_id, lang)
     if user_id is None:
-        service.term_repo.increment_views(term_id)
-    return service.get_term(term_id, lang)
+        view_counter.hit(term_id)
+    return term
 
 
 @router.post("", response_model=TermOut, status_code=201)
-async def create_term(
+def create_term(
     data: TermCreateRequest,
     db: Session = Depends(get_db),
     user_id: Optional[int] = Depends(get_current_user_id),
@@ -89,8 +88,29 @@ async def create_term(
     return service.create_term(data, user_id, initial_status)
 
 
+@router.post("/bulk", response_model=TermBulkCreateResponse)
+def create_terms_bulk(
+    data: list[TermCreateRequest] = Body(..., min_length=1, max_length=settings.bulk_create_max_terms),
+    db: Session = Depends(get_db),
+    user_id: Optional[int] = Depends(get_current_user_id),
+    user_role: Optional[str] = Depends(get_current_user_role)
+):
+    if not user_id:
+        from fastapi import HTTPException, status
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    
+    from libs.shared.shared.security.roles import Role
+    from apps.dictionary_service.app.core.rbac import check_role
+    
+    # Статус как у POST /terms: от редакторов сразу одобренные, от остальных черновики
+    initial_status = TermStatus.approved if user_role and check_role(user_role, [Role.admin, Role.editor, Role.moderator]) else TermStatus.draft
+    
+    service = TermService(db)
+    return service.create_terms_bulk(data, user_id, initial_status)
+
+
 @router.put("/{term_id}", response_model=TermOut)
-async def update_term(
+def update_term(
     term_id: int,
     data: TermUpdateRequest,
     lang: Lang = Query(default=Lang.ru),
@@ -106,7 +126,7 @@ async def update_term(
 
 
 @router.delete("/{term_id}", status_code=204)
-async def delete_term(
+def delete_term(
     term_id: int,
     db: Session = Depends(get_db),
     user_id: Optional[int] = Depends(get_current_user_id)
@@ -116,15 +136,11 @@ async def delete_term(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
     
     service = TermService(db)
-    term = service.term_repo.get_by_id(term_id)
-    if not term:
-        from libs.shared.shared.errors.exceptions import NotFoundError
-        raise NotFoundError("Term", str(term_id))
-    service.term_repo.soft_delete(term)
+    service.delete_term(term_id)
 
 
 @router.post("/{term_id}/submit", response_model=TermOut)
-async def submit_term(
+def submit_term(
     term_id: int,
     db: Session = Depends(get_db),
     user_id: Optional[int] = Depends(get_current_user_id)
@@ -7,6 +7,28 @@ class Settings(BaseSettings):
     app_name: str = "Dictionary Service"
     # Путь относительно директории, где запускается сервер (apps/dictionary_service/)
     database_url: str = "sqlite:///./dictionary_service.db"
+    # Потоки для синхронных обработчиков (запросы к БД блокирующие и не выполняются в event loop)
+    threadpool_size: int = 40
+    # Открытые ключи auth_service для проверки токенов на месте; проверенные токены кэшируются до exp
+    auth_jwks_url: str = "http://localhost:8001/.well-known/jwks.json"
+    claims_cache_size: int = 4096
+    # Кэш карточек терминов (GET /terms/{id}): memory - в процессе, redis - общий для воркеров, off - выключен
+    term_cache_backend: str = "memory"
+    term_cache_size: int = 10000
+    term_cache_ttl_seconds: float = 300.0
+    term_cache_redis_url: str = "redis://localhost:6379/0"
+    # Просмотры пишутся пачкой раз в интервал или раньше, если накопилось max_pending несохраненных
+    views_flush_interval_ms: int = 5000
+    views_max_pending: int = 10000
+    # Сколько живет закэшированный алфавитный указатель (GET /terms/letters)
+    letter_counts_ttl_seconds: float = 300.0
+    # Максимум терминов в одном POST /terms/bulk
+    bulk_create_max_terms: int = 10000
+    # Срок хранения событий search_outbox: потребитель, отставший сильнее, переиндексирует словарь целиком.
+    # Очистка идет в фоне раз в интервал (0 - выключена) пачками по batch_size
+    search_outbox_retention_hours: float = 168.0
+    search_outbox_purge_interval_seconds: float = 3600.0
+    search_outbox_purge_batch_size: int = 1000
     
     class Config:
         env_file = ".env"
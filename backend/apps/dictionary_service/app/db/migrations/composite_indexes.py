@@ -0,0 +1,20 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from apps.dictionary_service.app.db.base import Base
+
+
+def upgrade(conn: Connection) -> None:
+    """Создает объявленные в моделях индексы, которых нет в базе: create_all не добавляет
+    индексы в уже существующие таблицы. Повторный запуск ничего не делает"""
+    inspector = inspect(conn)
+    created = False
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)
+                created = True
+    
+    if created:
+        # Статистика для планировщика по новым индексам
+        conn.exec_driver_sql("ANALYZE")
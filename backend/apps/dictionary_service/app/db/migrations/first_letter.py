@@ -0,0 +1,31 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from libs.shared.shared.utils.letters import first_letter
+
+BATCH_SIZE = 5000
+
+
+def upgrade(conn: Connection) -> None:
+    """Добавляет term_translations.first_letter и заполняет ее для существующих переводов.
+    Индекс LIKE-поиска по title больше не используется и удаляется"""
+    columns = {column["name"] for column in inspect(conn).get_columns("term_translations")}
+    if "first_letter" not in columns:
+        conn.exec_driver_sql("ALTER TABLE term_translations ADD COLUMN first_letter VARCHAR(4)")
+        _backfill(conn)
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_term_translations_language_title")
+
+
+def _backfill(conn: Connection) -> None:
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text("SELECT id, language, title FROM term_translations WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            return
+        conn.execute(
+            text("UPDATE term_translations SET first_letter = :first_letter WHERE id = :id"),
+            [{"first_letter": first_letter(title, language), "id": translation_id} for translation_id, language, title in rows]
+        )
+        last_id = rows[-1][0]
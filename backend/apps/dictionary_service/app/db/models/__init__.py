@@ -7,6 +7,7 @@ from apps.dictionary_service.app.db.models.term_tag import TermTag
 from apps.dictionary_service.app.db.models.favorite import Favorite
 from apps.dictionary_service.app.db.models.term_revision import TermRevision
 from apps.dictionary_service.app.db.models.term_suggestion import TermSuggestion
+from apps.dictionary_service.app.db.models.search_outbox import SearchOutbox, SearchOutboxState
 
 __all__ = [
     "Category",
@@ -17,5 +18,7 @@ __all__ = [
     "TermTag",
     "Favorite",
     "TermRevision",
-    "TermSuggestion"
+    "TermSuggestion",
+    "SearchOutbox",
+    "SearchOutboxState"
 ]
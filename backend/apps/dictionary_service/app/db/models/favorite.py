@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from apps.dictionary_service.app.db.base import Base
@@ -14,4 +14,8 @@ class Favorite(Base):
     
     term = relationship("Term", back_populates="favorites")
     
-    __table_args__ = (UniqueConstraint("user_id", "term_id", name="uq_user_term"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "term_id", name="uq_user_term"),
+        # Избранное пользователя от новых к старым без сортировки
+        Index("ix_favorites_user_created", "user_id", "created_at"),
+    )
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime, timezone
+from apps.dictionary_service.app.db.base import Base
+
+
+class SearchOutbox(Base):
+    """Журнал изменений терминов для search_service, пишется в одной транзакции с изменением.
+    Потребители хранят свою позицию у себя; события старше срока хранения удаляет OutboxPurger"""
+    __tablename__ = "search_outbox"
+    # AUTOINCREMENT: номер не переиспользуется после очистки журнала, потребитель не пропустит события
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    seq = Column(Integer, primary_key=True)
+    term_id = Column(Integer, nullable=False, index=True)
+    op = Column(String(20), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class SearchOutboxState(Base):
+    """Наибольший номер, удаленный очисткой: потребитель с позицией ниже него пропустил события"""
+    __tablename__ = "search_outbox_state"
+    
+    name = Column(String(50), primary_key=True)
+    purged_seq = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from apps.dictionary_service.app.db.base import Base
@@ -31,3 +31,9 @@ class Term(Base):
     tags = relationship("Tag", secondary="term_tags", back_populates="terms")
     favorites = relationship("Favorite", back_populates="term", cascade="all, delete-orphan")
     revisions = relationship("TermRevision", back_populates="term", cascade="all, delete-orphan")
+    
+    # Списки терминов: фильтр по is_deleted, статусу и категории с сортировкой по id
+    __table_args__ = (
+        Index("ix_terms_live_status_category", "is_deleted", "status", "category_id", "id"),
+        Index("ix_terms_live_category", "is_deleted", "category_id", "id"),
+    )
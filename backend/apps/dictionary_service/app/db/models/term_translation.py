@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from apps.dictionary_service.app.db.base import Base
 
@@ -15,7 +15,13 @@ class TermTranslation(Base):
     examples = Column(Text, nullable=True)
     synonyms = Column(Text, nullable=True)
     antonyms = Column(Text, nullable=True)
+    # Буква алфавитного указателя (libs.shared.shared.utils.letters.first_letter), считается при записи перевода
+    first_letter = Column(String(4), nullable=True)
     
     term = relationship("Term", back_populates="translations")
     
-    __table_args__ = (UniqueConstraint("term_id", "language", name="uq_term_language"),)
+    __table_args__ = (
+        UniqueConstraint("term_id", "language", name="uq_term_language"),
+        # Просмотр по букве: равенство по (language, first_letter), порядок по title прямо из индекса
+        Index("ix_term_translations_language_letter", "language", "first_letter", "title", "term_id"),
+    )
@@ -2,6 +2,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from apps.dictionary_service.app.core.config import settings
 from apps.dictionary_service.app.db.base import Base
+from apps.dictionary_service.app.db.migrations import composite_indexes, first_letter
 from apps.dictionary_service.app.db.models import (
     Category,
     CategoryTranslation,
@@ -11,7 +12,9 @@ from apps.dictionary_service.app.db.models import (
     TermTag,
     Favorite,
     TermRevision,
-    TermSuggestion
+    TermSuggestion,
+    SearchOutbox,
+    SearchOutboxState
 )
 
 engine = create_engine(
@@ -24,6 +27,10 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    
+    with engine.begin() as conn:
+        first_letter.upgrade(conn)
+        composite_indexes.upgrade(conn)
 
 
 def get_db():
@@ -1,10 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from apps.dictionary_service.app.core.config import settings
+from apps.dictionary_service.app.core.security import jwks
 from apps.dictionary_service.app.core.errors import app_exception_handler
 from apps.dictionary_service.app.db.session import init_db
+from apps.dictionary_service.app.services.outbox_purger import outbox_purger
+from apps.dictionary_service.app.services.view_counter import view_counter
 from libs.shared.shared.errors.exceptions import AppException
-from apps.dictionary_service.app.api.v1.routes import categories, terms, moderation, favorites, suggestions
+from apps.dictionary_service.app.api.v1.routes import categories, terms, moderation, favorites, suggestions, stats
+from libs.shared.shared.utils.concurrency import configure_threadpool
 
 app = FastAPI(title=settings.app_name, version="1.0.0")
 
@@ -23,11 +27,23 @@ app.include_router(terms.router, prefix="/api/v1")
 app.include_router(moderation.router, prefix="/api/v1")
 app.include_router(favorites.router, prefix="/api/v1")
 app.include_router(suggestions.router, prefix="/api/v1")
+app.include_router(stats.router, prefix="/api/v1")
 
 
 @app.on_event("startup")
 async def startup_event():
+    configure_threadpool(settings.threadpool_size)
     init_db()
+    # Если auth_service еще не поднялся, ключи загрузятся с первым токеном
+    jwks.try_load()
+    view_counter.start()
+    outbox_purger.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    outbox_purger.stop()
+    view_counter.stop()
 
 
 @app.get("/health")
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Set
 from sqlalchemy.orm import Session
 from apps.dictionary_service.app.db.models.category import Category
 from apps.dictionary_service.app.db.models.category_translation import CategoryTranslation
@@ -24,6 +24,9 @@ class CategoryRepository:
     def get_all(self) -> List[Category]:
         return self.db.query(Category).all()
     
+    def get_existing_ids(self, category_ids: List[int]) -> Set[int]:
+        return {category_id for category_id, in self.db.query(Category.id).filter(Category.id.in_(category_ids)).all()}
+    
     def get_children(self, parent_id: int) -> List[Category]:
         return self.db.query(Category).filter(Category.parent_id == parent_id).all()
     
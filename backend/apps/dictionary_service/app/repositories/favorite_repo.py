@@ -24,7 +24,7 @@ class FavoriteRepository:
     def get_user_favorites(self, user_id: int, limit: int = 20, offset: int = 0) -> List[Favorite]:
         return self.db.query(Favorite).filter(
             Favorite.user_id == user_id
-        ).offset(offset).limit(limit).all()
+        ).order_by(Favorite.created_at.desc(), Favorite.id.desc()).offset(offset).limit(limit).all()
     
     def count_user_favorites(self, user_id: int) -> int:
         return self.db.query(Favorite).filter(Favorite.user_id == user_id).count()
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+from typing import List
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+from apps.dictionary_service.app.db.models.search_outbox import SearchOutbox, SearchOutboxState
+# Операции журнала - общий контракт с потребителями, сервисы берут их отсюда
+from libs.shared.shared.feed.outbox import OP_DELETE, OP_UPSERT, OP_VIEWS, OUTBOX_STATE_NAME
+
+
+class OutboxRepository:
+    """Запись журнала search_outbox. Читают его потребители через libs.shared.shared.feed.outbox.OutboxReader"""
+
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def add(self, term_id: int, op: str = OP_UPSERT) -> SearchOutbox:
+        # Без commit: событие фиксируется вместе с изменением термина
+        event = SearchOutbox(term_id=term_id, op=op)
+        self.db.add(event)
+        return event
+    
+    def add_many(self, term_ids: List[int], op: str = OP_UPSERT) -> None:
+        self.db.execute(insert(SearchOutbox), [{"term_id": term_id, "op": op} for term_id in term_ids])
+    
+    def set_views(self, term_ids: List[int], chunk_size: int = 500) -> None:
+        """Событие просмотров ставится в конец журнала, прежнее событие просмотров термина удаляется:
+        потребитель читает текущее число просмотров, поэтому в журнале достаточно одного события на термин"""
+        for start in range(0, len(term_ids), chunk_size):
+            chunk = term_ids[start:start + chunk_size]
+            self.db.execute(
+                delete(SearchOutbox).where(SearchOutbox.term_id.in_(chunk), SearchOutbox.op == OP_VIEWS),
+                execution_options={"synchronize_session": False}
+            )
+        self.add_many(term_ids, OP_VIEWS)
+    
+    def delete_expired(self, created_before: datetime, limit: int) -> int:
+        """Удаляет самые старые события, записанные раньше created_before, не больше limit за вызов,
+        и запоминает наибольший удаленный номер; без commit"""
+        oldest = self.db.query(SearchOutbox.seq, SearchOutbox.created_at).order_by(SearchOutbox.seq).limit(limit).all()
+        # Номера растут со временем записи: удаляется начало журнала до первого события в сроке хранения
+        expired = 0
+        for seq, created_at in oldest:
+            if created_at is not None and created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            if created_at is not None and created_at >= created_before:
+                break
+            expired = seq
+        if not expired:
+            return 0
+        
+        result = self.db.execute(
+            delete(SearchOutbox).where(SearchOutbox.seq <= expired),
+            execution_options={"synchronize_session": False}
+        )
+        state = self.db.get(SearchOutboxState, OUTBOX_STATE_NAME)
+        if state is None:
+            self.db.add(SearchOutboxState(name=OUTBOX_STATE_NAME, purged_seq=expired))
+        else:
+            state.purged_seq = max(state.purged_seq, expired)
+        return result.rowcount
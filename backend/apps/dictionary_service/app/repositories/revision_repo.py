@@ -15,8 +15,6 @@ class RevisionRepository:
             old_data_json=json.dumps(old_data)
         )
         self.db.add(revision)
-        self.db.commit()
-        self.db.refresh(revision)
         return revision
     
     def get_by_term(self, term_id: int) -> List[TermRevision]:
@@ -1,6 +1,8 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from apps.dictionary_service.app.db.models.tag import Tag
+from apps.dictionary_service.app.repositories.term_repo import IN_CHUNK
 
 
 class TagRepository:
@@ -10,8 +12,7 @@ class TagRepository:
     def create(self, slug: str) -> Tag:
         tag = Tag(slug=slug)
         self.db.add(tag)
-        self.db.commit()
-        self.db.refresh(tag)
+        self.db.flush()
         return tag
     
     def get_by_id(self, tag_id: int) -> Optional[Tag]:
@@ -23,8 +24,36 @@ class TagRepository:
     def get_all(self) -> List[Tag]:
         return self.db.query(Tag).all()
     
-    def get_or_create(self, slug: str) -> Tag:
-        tag = self.get_by_slug(slug)
-        if not tag:
-            tag = self.create(slug)
-        return tag
+    def get_or_create_many(self, slugs: List[str]) -> List[Tag]:
+        """Теги по списку slug в исходном порядке: существующие через SELECT ... IN (по IN_CHUNK за запрос),
+        недостающие добавляются в сессию и вставляются при flush вместе с термином"""
+        slugs = list(dict.fromkeys(slugs))
+        if not slugs:
+            return []
+        
+        tags = {}
+        for start in range(0, len(slugs), IN_CHUNK):
+            chunk = slugs[start:start + IN_CHUNK]
+            tags.update((tag.slug, tag) for tag in self.db.query(Tag).filter(Tag.slug.in_(chunk)).all())
+        missing = [Tag(slug=slug) for slug in slugs if slug not in tags]
+        if missing:
+            self.db.add_all(missing)
+            tags.update((tag.slug, tag) for tag in missing)
+        return [tags[slug] for slug in slugs]
+    
+    def get_or_create_ids(self, slugs: List[str]) -> Dict[str, int]:
+        """id тегов по slug для массовых вставок: недостающие вставляются одним executemany"""
+        slugs = list(dict.fromkeys(slugs))
+        ids = self._get_ids(slugs)
+        missing = [slug for slug in slugs if slug not in ids]
+        if missing:
+            self.db.execute(insert(Tag), [{"slug": slug} for slug in missing])
+            ids.update(self._get_ids(missing))
+        return ids
+    
+    def _get_ids(self, slugs: List[str]) -> Dict[str, int]:
+        ids = {}
+        for start in range(0, len(slugs), IN_CHUNK):
+            chunk = slugs[start:start + IN_CHUNK]
+            ids.update(self.db.query(Tag.slug, Tag.id).filter(Tag.slug.in_(chunk)).all())
+        return ids
@@ -1,11 +1,23 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from typing import Dict, Optional, List, Set
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, bindparam, func, insert, or_, update
 from apps.dictionary_service.app.db.models.term import Term, TermStatus
 from apps.dictionary_service.app.db.models.term_translation import TermTranslation
+from apps.dictionary_service.app.db.models.tag import Tag
+from apps.dictionary_service.app.db.models.term_tag import TermTag
+from libs.shared.shared.utils.letters import first_letter
+
+# Размер пачки для IN (...): держимся далеко от лимита SQLite на число параметров
+IN_CHUNK = 500
+
+
+def _with_first_letter(row: dict) -> dict:
+    return {**row, "first_letter": first_letter(row["title"], row["language"])}
 
 
 class TermRepository:
+    """Методы записи не делают commit: изменения термина фиксирует сервис одной транзакцией"""
+    
     def __init__(self, db: Session):
         self.db = db
     
@@ -14,17 +26,21 @@ class TermRepository:
         slug: str,
         category_id: int,
         author_id: int,
-        status: TermStatus = TermStatus.draft
+        status: TermStatus = TermStatus.draft,
+        translations: Optional[List[dict]] = None,
+        tags: Optional[List[Tag]] = None
     ) -> Term:
+        # Термин, переводы и связи с тегами уходят в базу одним flush; commit делает сервис
         term = Term(
             slug=slug,
             category_id=category_id,
             author_id=author_id,
-            status=status
+            status=status,
+            translations=[TermTranslation(**_with_first_letter(translation)) for translation in translations or []],
+            tags=list(tags or [])
         )
         self.db.add(term)
-        self.db.commit()
-        self.db.refresh(term)
+        self.db.flush()
         return term
     
     def get_by_id(self, term_id: int) -> Optional[Term]:
@@ -39,15 +55,13 @@ class TermRepository:
             Term.is_deleted == False
         ).first()
     
-    def get_all(
+    def _filtered(
         self,
         category_id: Optional[int] = None,
         status: Optional[TermStatus] = None,
         language: Optional[str] = None,
-        letter: Optional[str] = None,
-        limit: int = 20,
-        offset: int = 0
-    ) -> List[Term]:
+        letter: Optional[str] = None
+    ):
         query = self.db.query(Term).filter(Term.is_deleted == False)
         
         if category_id:
@@ -57,13 +71,72 @@ class TermRepository:
             query = query.filter(Term.status == status)
         
         if language and letter:
+            # letter уже нормализован first_letter: сравнение на равенство идет по индексу
             query = query.join(TermTranslation).filter(
                 TermTranslation.language == language,
-                TermTranslation.title.like(f"{letter}%")
+                TermTranslation.first_letter == letter
             )
         
+        return query
+    
+    def get_all(
+        self,
+        category_id: Optional[int] = None,
+        status: Optional[TermStatus] = None,
+        language: Optional[str] = None,
+        letter: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Term]:
+        return self._filtered(category_id, status, language, letter).offset(offset).limit(limit).all()
+    
+    def get_existing_slugs(self, slugs: List[str]) -> Set[str]:
+        # Включая удаленные: уникальность slug в таблице распространяется и на них
+        existing = set()
+        for start in range(0, len(slugs), IN_CHUNK):
+            chunk = slugs[start:start + IN_CHUNK]
+            existing.update(slug for slug, in self.db.query(Term.slug).filter(Term.slug.in_(chunk)).all())
+        return existing
+    
+    def get_page(
+        self,
+        category_id: Optional[int] = None,
+        status: Optional[TermStatus] = None,
+        language: Optional[str] = None,
+        letter: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Term]:
+        # Страница списка вместе с тегами: один запрос на термины и один на теги всей страницы
+        query = self._filtered(category_id, status, language, letter).options(selectinload(Term.tags))
+        if language and letter:
+            # По букве - в алфавитном порядке: идем по индексу (language, first_letter, title) и
+            # останавливаемся на LIMIT, а не сортируем все термины на эту букву
+            query = query.order_by(TermTranslation.title, TermTranslation.term_id)
+        else:
+            query = query.order_by(Term.id)
         return query.offset(offset).limit(limit).all()
     
+    def count_by_letter(self, language: str, status: Optional[TermStatus] = None) -> Dict[str, int]:
+        """Число терминов на каждую букву указателя для языка"""
+        query = self.db.query(TermTranslation.first_letter, func.count()).join(Term).filter(
+            TermTranslation.language == language,
+            TermTranslation.first_letter.isnot(None),
+            Term.is_deleted == False
+        )
+        if status:
+            query = query.filter(Term.status == status)
+        return dict(query.group_by(TermTranslation.first_letter).all())
+    
+    def get_translations_for(self, term_ids: List[int], languages: List[str]) -> List[TermTranslation]:
+        """Переводы нескольких терминов на заданные языки одним запросом"""
+        if not term_ids:
+            return []
+        return self.db.query(TermTranslation).filter(
+            TermTranslation.term_id.in_(term_ids),
+            TermTranslation.language.in_(languages)
+        ).all()
+    
     def count(self, category_id: Optional[int] = None, status: Optional[TermStatus] = None) -> int:
         query = self.db.query(Term).filter(Term.is_deleted == False)
         
@@ -79,19 +152,42 @@ class TermRepository:
         for key, value in kwargs.items():
             if hasattr(term, key):
                 setattr(term, key, value)
-        self.db.commit()
-        self.db.refresh(term)
         return term
     
     def soft_delete(self, term: Term) -> None:
         term.is_deleted = True
-        self.db.commit()
     
-    def increment_views(self, term_id: int) -> None:
-        term = self.get_by_id(term_id)
-        if term:
-            term.views += 1
-            self.db.commit()
+    def bulk_create(self, rows: List[dict]) -> Dict[str, int]:
+        """Вставка терминов одним executemany, возвращает id по slug.
+        Без RETURNING: SQLite не гарантирует его порядок, и SQLAlchemy вставлял бы по строке"""
+        if not rows:
+            return {}
+        self.db.execute(insert(Term), rows)
+        slugs = [row["slug"] for row in rows]
+        ids = {}
+        for start in range(0, len(slugs), IN_CHUNK):
+            chunk = slugs[start:start + IN_CHUNK]
+            ids.update(self.db.query(Term.slug, Term.id).filter(Term.slug.in_(chunk)).all())
+        return ids
+    
+    def bulk_add_translations(self, rows: List[dict]) -> None:
+        if rows:
+            self.db.execute(insert(TermTranslation), [_with_first_letter(row) for row in rows])
+    
+    def bulk_add_tags(self, rows: List[dict]) -> None:
+        if rows:
+            self.db.execute(insert(TermTag), rows)
+    
+    def add_views(self, deltas: Dict[int, int]) -> None:
+        # Один UPDATE с executemany на всю пачку, без загрузки строк; commit делает вызывающий
+        terms = Term.__table__
+        self.db.execute(
+            update(terms).where(terms.c.id == bindparam("term_id")).values(views=terms.c.views + bindparam("delta")),
+            [{"term_id": term_id, "delta": delta} for term_id, delta in deltas.items()]
+        )
+    
+    def get_views(self, term_ids: List[int]) -> Dict[int, int]:
+        return dict(self.db.query(Term.id, Term.views).filter(Term.id.in_(term_ids)).all())
     
     def add_translation(
         self,
@@ -112,13 +208,18 @@ class TermRepository:
             short_definition=short_definition,
             examples=examples,
             synonyms=synonyms,
-            antonyms=antonyms
+            antonyms=antonyms,
+            first_letter=first_letter(title, language)
         )
         self.db.add(translation)
-        self.db.commit()
-        self.db.refresh(translation)
         return translation
     
+    def get_translations(self, term_id: int) -> Dict[str, TermTranslation]:
+        return {
+            translation.language: translation
+            for translation in self.db.query(TermTranslation).filter(TermTranslation.term_id == term_id).all()
+        }
+    
     def get_translation(self, term_id: int, language: str) -> Optional[TermTranslation]:
         return self.db.query(TermTranslation).filter(
             TermTranslation.term_id == term_id,
@@ -129,6 +230,6 @@ class TermRepository:
         for key, value in kwargs.items():
             if hasattr(translation, key):
                 setattr(translation, key, value)
-        self.db.commit()
-        self.db.refresh(translation)
+        if "title" in kwargs:
+            translation.first_letter = first_letter(translation.title, translation.language)
         return translation
@@ -28,6 +28,24 @@ class TermUpdateRequest(BaseModel):
     tag_slugs: Optional[list[str]] = None
 
 
+class TermBulkItemResult(BaseModel):
+    index: int
+    slug: str
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class TermBulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[TermBulkItemResult]
+
+
+class LetterCount(BaseModel):
+    letter: str
+    count: int
+
+
 class TermTranslationOut(BaseModel):
     language: Lang
     title: str
@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
 from apps.dictionary_service.app.repositories.term_repo import TermRepository
+from apps.dictionary_service.app.repositories.outbox_repo import OutboxRepository
+from apps.dictionary_service.app.services.term_cache import term_cache
+from apps.dictionary_service.app.services.term_service import letter_counts_cache
 from apps.dictionary_service.app.db.models.term import TermStatus
 from libs.shared.shared.errors.exceptions import NotFoundError, ConflictError
 
@@ -7,6 +10,7 @@ from libs.shared.shared.errors.exceptions import NotFoundError, ConflictError
 class ModerationService:
     def __init__(self, db: Session):
         self.term_repo = TermRepository(db)
+        self.outbox_repo = OutboxRepository(db)
         self.db = db
     
     def approve_term(self, term_id: int) -> None:
@@ -17,7 +21,11 @@ class ModerationService:
         if term.status != TermStatus.pending:
             raise ConflictError("Only pending terms can be approved")
         
+        self.outbox_repo.add(term_id)
         self.term_repo.update(term, status=TermStatus.approved)
+        self.db.commit()
+        term_cache.invalidate([term_id])
+        letter_counts_cache.clear()
     
     def reject_term(self, term_id: int, reason: str) -> None:
         term = self.term_repo.get_by_id(term_id)
@@ -27,4 +35,8 @@ class ModerationService:
         if term.status != TermStatus.pending:
             raise ConflictError("Only pending terms can be rejected")
         
+        self.outbox_repo.add(term_id)
         self.term_repo.update(term, status=TermStatus.rejected)
+        self.db.commit()
+        term_cache.invalidate([term_id])
+        letter_counts_cache.clear()
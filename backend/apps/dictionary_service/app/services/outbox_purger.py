@@ -0,0 +1,85 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+from apps.dictionary_service.app.core.config import settings
+from apps.dictionary_service.app.db.session import SessionLocal
+from apps.dictionary_service.app.repositories.outbox_repo import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxPurger:
+    """Раз в interval_seconds удаляет события search_outbox старше retention_hours пачками по batch_size.
+    Потребители журнала ничего в нем не удаляют: каждый хранит свою позицию, а срок хранения
+    с запасом покрывает их отставание и перезапуски"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        retention_hours: float,
+        interval_seconds: float,
+        batch_size: int
+    ):
+        self._session_factory = session_factory
+        self._retention = timedelta(hours=retention_hours)
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.deleted = 0
+        self.runs = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="dictionary-outbox-purger", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def purge(self) -> int:
+        created_before = datetime.now(timezone.utc) - self._retention
+        deleted = 0
+        db = self._session_factory()
+        try:
+            repo = OutboxRepository(db)
+            # Каждая пачка - своя короткая транзакция: запись терминов не ждет всю очистку
+            while not self._stop_event.is_set():
+                count = repo.delete_expired(created_before, self._batch_size)
+                db.commit()
+                deleted += count
+                if count < self._batch_size:
+                    break
+            self.runs += 1
+        except Exception:
+            db.rollback()
+            self.failed += 1
+            logger.exception("Failed to purge search outbox")
+        finally:
+            db.close()
+        self.deleted += deleted
+        return deleted
+
+    def stats(self) -> dict:
+        return {"deleted": self.deleted, "runs": self.runs, "failed": self.failed}
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.purge()
+            self._stop_event.wait(self._interval)
+
+
+outbox_purger = OutboxPurger(
+    session_factory=SessionLocal,
+    retention_hours=settings.search_outbox_retention_hours,
+    interval_seconds=settings.search_outbox_purge_interval_seconds,
+    batch_size=settings.search_outbox_purge_batch_size
+)
@@ -0,0 +1,165 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from apps.dictionary_service.app.core.config import settings
+from apps.dictionary_service.app.schemas.term import TermOut
+from libs.shared.shared.dto.language import Lang
+from libs.shared.shared.utils.cache import TTLCache
+
+
+class InProcessBackend:
+    """Кэш в памяти процесса: у каждого воркера свой, инвалидация видна только ему"""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        # Поколения не вытесняются: сброс счетчика вернул бы в оборот ключи старых карточек
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, term_id: int) -> int:
+        return self._generations.get(term_id, 0)
+
+    def bump(self, term_ids: List[int]) -> Dict[int, int]:
+        """Увеличивает поколения терминов, возвращает прежние"""
+        with self._lock:
+            previous = {term_id: self._generations.get(term_id, 0) for term_id in term_ids}
+            for term_id, generation in previous.items():
+                self._generations[term_id] = generation + 1
+        return previous
+
+    def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self._cache.set(key, value)
+
+    def delete(self, keys: List[str]) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+class RedisBackend:
+    """Кэш в Redis (или совместимом сервере): общий для всех воркеров, LRU задается maxmemory-policy сервера"""
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl_seconds: float, prefix: str = "dictionary:term:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("TERM_CACHE_BACKEND=redis requires the 'redis' package") from e
+        self._client = redis.Redis.from_url(url)
+        self._ttl_ms = int(ttl_seconds * 1000)
+        self._prefix = prefix
+
+    def generation(self, term_id: int) -> int:
+        value = self._client.get(f"{self._prefix}gen:{term_id}")
+        return int(value) if value is not None else 0
+
+    def bump(self, term_ids: List[int]) -> Dict[int, int]:
+        pipeline = self._client.pipeline()
+        for term_id in term_ids:
+            pipeline.incr(f"{self._prefix}gen:{term_id}")
+        return {term_id: generation - 1 for term_id, generation in zip(term_ids, pipeline.execute())}
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(self._prefix + key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str) -> None:
+        self._client.set(self._prefix + key, value, px=self._ttl_ms)
+
+    def delete(self, keys: List[str]) -> None:
+        if keys:
+            self._client.delete(*(self._prefix + key for key in keys))
+
+    def stats(self) -> dict:
+        return {"ttl_seconds": self._ttl_ms / 1000}
+
+
+class TermCache:
+    """Сериализованные TermOut по (term_id, поколение, lang): читается в get_term, сбрасывается после
+    каждой записи термина. Запись увеличивает поколение термина, поэтому карточка, собранная читателем
+    до записи и положенная в кэш после сброса, остается под старым ключом и больше не читается.
+    Количество просмотров в закэшированной карточке может отставать на TTL"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @staticmethod
+    def _key(term_id: int, generation: int, lang: Lang) -> str:
+        return f"{term_id}:{generation}:{lang.value}"
+
+    def get(self, term_id: int, lang: Lang) -> Tuple[Optional[TermOut], Optional[int]]:
+        """Карточка из кэша и поколение, которое нужно передать в set. Поколение читается
+        до запроса к базе: запись термина после этого момента сделает карточку недоступной"""
+        if self.backend is None:
+            return None, None
+        try:
+            generation = self.backend.generation(term_id)
+            value = self.backend.get(self._key(term_id, generation, lang))
+        except Exception:
+            # Недоступный кэш не должен ломать чтение: идем в базу и не кэшируем результат
+            generation, value = None, None
+            self._count("errors")
+        self._count("hits" if value is not None else "misses")
+        return (TermOut.model_validate_json(value) if value is not None else None), generation
+
+    def set(self, term_id: int, lang: Lang, term: TermOut, generation: Optional[int]) -> None:
+        if self.backend is None or generation is None:
+            return
+        try:
+            self.backend.set(self._key(term_id, generation, lang), term.model_dump_json())
+        except Exception:
+            self._count("errors")
+
+    def invalidate(self, term_ids: Iterable[int]) -> None:
+        if self.backend is None:
+            return
+        term_ids = list(term_ids)
+        try:
+            previous = self.backend.bump(term_ids)
+            # Карточка кэшируется под запрошенным языком, а не языком перевода: удаляем все языки
+            self.backend.delete([
+                self._key(term_id, generation, lang) for term_id, generation in previous.items() for lang in Lang
+            ])
+        except Exception:
+            self._count("errors")
+        self._count("invalidations")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend.name if self.backend is not None else "off",
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+                "storage": self.backend.stats() if self.backend is not None else {}
+            }
+
+
+def _create_backend():
+    if settings.term_cache_backend == "memory":
+        return InProcessBackend(settings.term_cache_size, settings.term_cache_ttl_seconds)
+    if settings.term_cache_backend == "redis":
+        return RedisBackend(settings.term_cache_redis_url, settings.term_cache_ttl_seconds)
+    return None
+
+
+term_cache = TermCache(_create_backend())
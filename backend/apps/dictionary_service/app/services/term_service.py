@@ -1,69 +1,203 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from apps.dictionary_service.app.repositories.term_repo import TermRepository
 from apps.dictionary_service.app.repositories.tag_repo import TagRepository
 from apps.dictionary_service.app.repositories.revision_repo import RevisionRepository
+from apps.dictionary_service.app.repositories.category_repo import CategoryRepository
+from apps.dictionary_service.app.repositories.outbox_repo import OutboxRepository, OP_DELETE
+from apps.dictionary_service.app.core.config import settings
+from apps.dictionary_service.app.services.term_cache import term_cache
 from apps.dictionary_service.app.db.models.term import Term, TermStatus
+from apps.dictionary_service.app.db.models.term_translation import TermTranslation
 from apps.dictionary_service.app.schemas.term import (
     TermCreateRequest,
     TermUpdateRequest,
     TermOut,
-    TermOutFull
+    TermOutFull,
+    TermBulkItemResult,
+    TermBulkCreateResponse,
+    LetterCount
 )
+from apps.dictionary_service.app.schemas.tag import TagOut
 from libs.shared.shared.errors.exceptions import NotFoundError, ConflictError
 from libs.shared.shared.dto.language import Lang
+from libs.shared.shared.utils.cache import TTLCache
+from libs.shared.shared.utils.letters import first_letter, sort_letters
 import json
 
+# Порядок языков, если перевода на запрошенный нет
+FALLBACK_LANGS = [Lang.ru, Lang.en, Lang.kz]
+
+# Алфавитный указатель (язык, статус) -> список букв с числом терминов. Сбрасывается после записи
+# терминов в этом процессе, TTL ограничивает отставание от записей других воркеров
+letter_counts_cache = TTLCache(maxsize=32, ttl_seconds=settings.letter_counts_ttl_seconds)
+
 
 class TermService:
     def __init__(self, db: Session):
         self.term_repo = TermRepository(db)
         self.tag_repo = TagRepository(db)
         self.revision_repo = RevisionRepository(db)
+        self.outbox_repo = OutboxRepository(db)
+        self.category_repo = CategoryRepository(db)
         self.db = db
     
     def create_term(self, data: TermCreateRequest, author_id: int, initial_status: Optional[TermStatus] = None) -> TermOut:
+        """Термин, переводы, теги и событие outbox записываются одной транзакцией"""
         existing = self.term_repo.get_by_slug(data.slug)
         if existing:
             raise ConflictError(f"Term with slug '{data.slug}' already exists")
         
         status = initial_status if initial_status else TermStatus.draft
-        term = self.term_repo.create(data.slug, data.category_id, author_id, status)
-        
-        for trans in data.translations:
-            self.term_repo.add_translation(
-                term.id,
-                trans.language.value,
-                trans.title,
-                trans.definition,
-                trans.short_definition,
-                trans.examples,
-                trans.synonyms,
-                trans.antonyms
-            )
-        
-        for tag_slug in data.tag_slugs:
-            tag = self.tag_repo.get_or_create(tag_slug)
-            term.tags.append(tag)
-        
+        term = self.term_repo.create(
+            data.slug,
+            data.category_id,
+            author_id,
+            status,
+            translations=[
+                {**trans.model_dump(exclude={"language"}), "language": trans.language.value}
+                for trans in data.translations
+            ],
+            tags=self.tag_repo.get_or_create_many(data.tag_slugs)
+        )
+        self.outbox_repo.add(term.id)
         self.db.commit()
+        letter_counts_cache.clear()
         
         return self.get_term(term.id, data.translations[0].language)
     
+    def create_terms_bulk(
+        self,
+        items: List[TermCreateRequest],
+        author_id: int,
+        initial_status: Optional[TermStatus] = None
+    ) -> TermBulkCreateResponse:
+        """Массовое создание: slug и категории проверяются для всего списка сразу, вставка через executemany
+        и один commit. Ошибочные элементы пропускаются и возвращаются с описанием ошибки"""
+        status = initial_status if initial_status else TermStatus.draft
+        existing_slugs = self.term_repo.get_existing_slugs(list({item.slug for item in items}))
+        categories = self.category_repo.get_existing_ids(list({item.category_id for item in items}))
+        
+        results = []
+        valid = []
+        seen_slugs = set()
+        for index, item in enumerate(items):
+            languages = [trans.language for trans in item.translations]
+            if not languages:
+                error = "At least one translation is required"
+            elif len(set(languages)) != len(languages):
+                error = "Duplicate translation language"
+            elif item.slug in existing_slugs:
+                error = f"Term with slug '{item.slug}' already exists"
+            elif item.slug in seen_slugs:
+                error = f"Duplicate slug '{item.slug}' in request"
+            elif item.category_id not in categories:
+                error = f"Category {item.category_id} not found"
+            else:
+                error = None
+                valid.append((index, item))
+            seen_slugs.add(item.slug)
+            results.append(TermBulkItemResult(index=index, slug=item.slug, error=error))
+        
+        if valid:
+            term_ids = self.term_repo.bulk_create([
+                {"slug": item.slug, "category_id": item.category_id, "author_id": author_id, "status": status}
+                for _, item in valid
+            ])
+            tag_ids = self.tag_repo.get_or_create_ids([tag_slug for _, item in valid for tag_slug in item.tag_slugs])
+            
+            translation_rows, tag_rows = [], []
+            for index, item in valid:
+                term_id = results[index].id = term_ids[item.slug]
+                for trans in item.translations:
+                    translation_rows.append({**trans.model_dump(), "language": trans.language.value, "term_id": term_id})
+                for tag_slug in dict.fromkeys(item.tag_slugs):
+                    tag_rows.append({"term_id": term_id, "tag_id": tag_ids[tag_slug]})
+            
+            self.term_repo.bulk_add_translations(translation_rows)
+            self.term_repo.bulk_add_tags(tag_rows)
+            self.outbox_repo.add_many(list(term_ids.values()))
+            self.db.commit()
+            letter_counts_cache.clear()
+        
+        return TermBulkCreateResponse(created=len(valid), failed=len(items) - len(valid), results=results)
+    
     def get_term(self, term_id: int, lang: Lang) -> TermOut:
+        cached, generation = term_cache.get(term_id, lang)
+        if cached is not None:
+            return cached
+        
         term = self.term_repo.get_by_id(term_id)
         if not term:
             raise NotFoundError("Term", str(term_id))
         
         translation = self.term_repo.get_translation(term_id, lang.value)
         if not translation:
-            for fallback_lang in [Lang.ru, Lang.en, Lang.kz]:
+            for fallback_lang in FALLBACK_LANGS:
                 translation = self.term_repo.get_translation(term_id, fallback_lang.value)
                 if translation:
                     break
         
+        result = self._to_out(term, translation, lang)
+        term_cache.set(term_id, lang, result, generation)
+        return result
+    
+    def list_terms(
+        self,
+        lang: Lang,
+        category_id: Optional[int] = None,
+        status: Optional[TermStatus] = None,
+        letter: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[TermOut]:
+        """Страница терминов за постоянное число запросов: термины, теги страницы и переводы
+        на запрошенный и резервные языки; выбор перевода как в get_term, но в памяти"""
+        letter = first_letter(letter, lang.value)
+        terms = self.term_repo.get_page(
+            category_id=category_id,
+            status=status,
+            language=lang.value if letter else None,
+            letter=letter,
+            limit=limit,
+            offset=offset
+        )
+        
+        languages = [lang] + [fallback for fallback in FALLBACK_LANGS if fallback != lang]
+        by_term: Dict[int, Dict[str, TermTranslation]] = {}
+        for translation in self.term_repo.get_translations_for(
+            [term.id for term in terms],
+            [language.value for language in languages]
+        ):
+            by_term.setdefault(translation.term_id, {})[translation.language] = translation
+        
+        result = []
+        for term in terms:
+            available = by_term.get(term.id, {})
+            translation = next(
+                (available[language.value] for language in languages if language.value in available),
+                None
+            )
+            result.append(self._to_out(term, translation, lang))
+        return result
+    
+    def get_letter_counts(self, lang: Lang, status: Optional[TermStatus] = None) -> List[LetterCount]:
+        """Буквы указателя с числом терминов в порядке алфавита языка"""
+        key = (lang, status)
+        cached = letter_counts_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        counts = self.term_repo.count_by_letter(lang.value, status)
+        result = [LetterCount(letter=letter, count=counts[letter]) for letter in sort_letters(counts, lang.value)]
+        letter_counts_cache.set(key, result)
+        return result
+    
+    @staticmethod
+    def _to_out(term: Term, translation: Optional[TermTranslation], lang: Lang) -> TermOut:
+        tags = [TagOut(id=tag.id, slug=tag.slug) for tag in term.tags]
+        
         if not translation:
-            from apps.dictionary_service.app.schemas.tag import TagOut
             return TermOut(
                 id=term.id,
                 slug=term.slug,
@@ -79,11 +213,9 @@ class TermService:
                 examples=None,
                 synonyms=None,
                 antonyms=None,
-                tags=[TagOut(id=tag.id, slug=tag.slug) for tag in term.tags]
+                tags=tags
             )
         
-        from apps.dictionary_service.app.schemas.tag import TagOut
-        
         return TermOut(
             id=term.id,
             slug=term.slug,
@@ -99,10 +231,11 @@ class TermService:
             examples=translation.examples,
             synonyms=translation.synonyms,
             antonyms=translation.antonyms,
-            tags=[TagOut(id=tag.id, slug=tag.slug) for tag in term.tags]
+            tags=tags
         )
     
     def update_term(self, term_id: int, data: TermUpdateRequest, lang: Lang) -> TermOut:
+        """Все изменения термина, ревизия и событие outbox фиксируются одним commit"""
         term = self.term_repo.get_by_id(term_id)
         if not term:
             raise NotFoundError("Term", str(term_id))
@@ -128,8 +261,10 @@ class TermService:
             self.revision_repo.create(term_id, term.author_id, old_data)
         
         if data.translations:
+            # Все переводы термина одним запросом вместо get_translation на каждый язык
+            existing_translations = self.term_repo.get_translations(term_id)
             for trans in data.translations:
-                existing_trans = self.term_repo.get_translation(term_id, trans.language.value)
+                existing_trans = existing_translations.get(trans.language.value)
                 if existing_trans:
                     self.term_repo.update_translation(
                         existing_trans,
@@ -141,7 +276,7 @@ class TermService:
                         antonyms=trans.antonyms
                     )
                 else:
-                    self.term_repo.add_translation(
+                    existing_translations[trans.language.value] = self.term_repo.add_translation(
                         term_id,
                         trans.language.value,
                         trans.title,
@@ -153,11 +288,13 @@ class TermService:
                     )
         
         if data.tag_slugs is not None:
-            term.tags.clear()
-            for tag_slug in data.tag_slugs:
-                tag = self.tag_repo.get_or_create(tag_slug)
-                term.tags.append(tag)
-            self.db.commit()
+            term.tags = self.tag_repo.get_or_create_many(data.tag_slugs)
+        
+        self.outbox_repo.add(term_id)
+        self.db.commit()
+        # Сбрасываем после commit: иначе параллельное чтение успело бы закэшировать старую версию
+        term_cache.invalidate([term_id])
+        letter_counts_cache.clear()
         
         return self.get_term(term_id, lang)
     
@@ -169,5 +306,20 @@ class TermService:
         if term.status != TermStatus.draft:
             raise ConflictError("Only draft terms can be submitted")
         
+        self.outbox_repo.add(term_id)
         self.term_repo.update(term, status=TermStatus.pending)
+        self.db.commit()
+        term_cache.invalidate([term_id])
+        letter_counts_cache.clear()
         return self.get_term(term_id, Lang.ru)
+    
+    def delete_term(self, term_id: int) -> None:
+        term = self.term_repo.get_by_id(term_id)
+        if not term:
+            raise NotFoundError("Term", str(term_id))
+        
+        self.outbox_repo.add(term_id, OP_DELETE)
+        self.term_repo.soft_delete(term)
+        self.db.commit()
+        term_cache.invalidate([term_id])
+        letter_counts_cache.clear()
@@ -0,0 +1,117 @@
+import logging
+import threading
+from typing import Callable, Dict, Optional
+from sqlalchemy.orm import Session
+from apps.dictionary_service.app.core.config import settings
+from apps.dictionary_service.app.db.session import SessionLocal
+from apps.dictionary_service.app.repositories.term_repo import TermRepository
+from apps.dictionary_service.app.repositories.outbox_repo import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """Просмотры копятся в памяти и записываются пачкой: запрос только увеличивает счетчик в словаре"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        flush_interval_ms: int,
+        max_pending: int
+    ):
+        self._session_factory = session_factory
+        self._flush_interval = flush_interval_ms / 1000
+        self._max_pending = max_pending
+        self._pending: Dict[int, int] = {}
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        # Сериализует сбросы: фоновый поток и stop() не пишут одну пачку дважды
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="dictionary-view-counter", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        # Записываем то, что накопилось с последнего сброса
+        self.flush()
+
+    def hit(self, term_id: int) -> None:
+        with self._lock:
+            self._pending[term_id] = self._pending.get(term_id, 0) + 1
+            self._pending_total += 1
+            self.hits += 1
+            overflow = self._pending_total >= self._max_pending
+        if overflow:
+            # Ограничиваем число несохраненных просмотров: сбрасываем раньше интервала
+            self._wake.set()
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._pending = self._pending, {}
+                total, self._pending_total = self._pending_total, 0
+            if not deltas:
+                return 0
+
+            db = self._session_factory()
+            try:
+                TermRepository(db).add_views(deltas)
+                OutboxRepository(db).set_views(list(deltas))
+                db.commit()
+                with self._lock:
+                    self.written += total
+                    self.batches += 1
+                return total
+            except Exception:
+                db.rollback()
+                # Возвращаем приращения обратно, следующий сброс попробует снова
+                with self._lock:
+                    for term_id, delta in deltas.items():
+                        self._pending[term_id] = self._pending.get(term_id, 0) + delta
+                    self._pending_total += total
+                    self.failed += 1
+                logger.exception("Failed to flush views for %d terms", len(deltas))
+                return 0
+            finally:
+                db.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending_terms": len(self._pending),
+                "pending_views": self._pending_total,
+                "max_pending": self._max_pending,
+                "hits": self.hits,
+                "written": self.written,
+                "batches": self.batches,
+                "failed_flushes": self.failed
+            }
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+view_counter = ViewCounter(
+    session_factory=SessionLocal,
+    flush_interval_ms=settings.views_flush_interval_ms,
+    max_pending=settings.views_max_pending
+)
@@ -0,0 +1,68 @@
+import random
+import pytest
+from sqlalchemy import create_engine, insert
+from apps.dictionary_service.app.db.base import Base
+from apps.dictionary_service.app.db.models import Category, Favorite, Tag, Term, TermTag, TermTranslation
+from apps.dictionary_service.app.db.models.term import TermStatus
+from apps.dictionary_service.app.services import term_service as term_service_module
+from apps.dictionary_service.app.services.term_cache import TermCache
+from libs.shared.shared.utils.letters import first_letter
+
+LANGUAGES = ["ru", "kz", "en"]
+STATUSES = [TermStatus.approved, TermStatus.pending, TermStatus.draft, TermStatus.rejected]
+WORDS = ["насилие", "защита", "право", "семья", "помощь", "жертва", "угроза", "контроль", "зорлық", "отбасы", "көмек"]
+TERMS = 3000
+USERS = 200
+
+
+@pytest.fixture(scope="module")
+def seeded_engine(tmp_path_factory):
+    """Синтетический словарь: термины в разных статусах и категориях, переводы не на всех языках,
+    теги и избранное. Статистика планировщика собрана, как после миграции"""
+    rnd = random.Random(42)
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('dictionary') / 'dictionary.db'}")
+    Base.metadata.create_all(engine)
+
+    terms, translations, tags = [], [], []
+    for term_id in range(1, TERMS + 1):
+        terms.append({
+            "id": term_id,
+            "slug": f"term-{term_id}",
+            "category_id": rnd.randint(1, 20),
+            "status": rnd.choices(STATUSES, weights=[85, 5, 8, 2])[0],
+            "author_id": 1,
+            "is_deleted": rnd.random() < 0.02
+        })
+        for language in rnd.sample(LANGUAGES, rnd.randint(1, 3)):
+            title = " ".join(rnd.sample(WORDS, 2)) + f" {term_id}"
+            translations.append({
+                "term_id": term_id,
+                "language": language,
+                "title": title,
+                "first_letter": first_letter(title, language),
+                "definition": " ".join(rnd.choices(WORDS, k=10)),
+                "short_definition": title
+            })
+        for tag_id in rnd.sample(range(1, 31), rnd.randint(0, 4)):
+            tags.append({"term_id": term_id, "tag_id": tag_id})
+
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [{"id": i, "slug": f"category-{i}"} for i in range(1, 21)])
+        conn.execute(insert(Tag), [{"id": i, "slug": f"tag-{i}"} for i in range(1, 31)])
+        conn.execute(insert(Term), terms)
+        conn.execute(insert(TermTranslation), translations)
+        conn.execute(insert(TermTag), tags)
+        conn.execute(insert(Favorite), [
+            {"user_id": user_id, "term_id": term_id}
+            for user_id in range(1, USERS + 1)
+            for term_id in rnd.sample(range(1, TERMS + 1), 30)
+        ])
+        conn.exec_driver_sql("ANALYZE")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def no_term_cache(monkeypatch):
+    # get_term строит карточку из базы при каждом вызове
+    monkeypatch.setattr(term_service_module, "term_cache", TermCache(None))
@@ -0,0 +1,105 @@
+import pytest
+from sqlalchemy import event, func
+from sqlalchemy.orm import sessionmaker
+from apps.dictionary_service.app.db.models import Term, TermTranslation
+from apps.dictionary_service.app.db.models.term import TermStatus
+from apps.dictionary_service.app.repositories.favorite_repo import FavoriteRepository
+from apps.dictionary_service.app.repositories.term_repo import TermRepository
+from apps.dictionary_service.app.services.term_service import TermService, letter_counts_cache
+from libs.shared.shared.dto.language import Lang
+from libs.shared.shared.utils.letters import first_letter
+from .conftest import USERS
+
+# Сценарий: вызов и индекс, который должен быть в плане его основного запроса
+SCENARIOS = {
+    "list status+category": (
+        lambda db: TermService(db).list_terms(Lang.ru, category_id=7, status=TermStatus.approved, offset=20),
+        "ix_terms_live_status_category"
+    ),
+    # Только статус: одноколоночный индекс уже упорядочен по rowid, отдельный составной не нужен
+    "list status": (lambda db: TermService(db).list_terms(Lang.ru, status=TermStatus.pending, offset=20), "ix_terms_status"),
+    "list category": (lambda db: TermService(db).list_terms(Lang.ru, category_id=7, offset=20), "ix_terms_live_category"),
+    "count status+category": (
+        lambda db: TermRepository(db).count(category_id=7, status=TermStatus.approved),
+        "ix_terms_live_status_category"
+    ),
+    "browse letter": (lambda db: TermService(db).list_terms(Lang.ru, letter="з", offset=20), "ix_term_translations_language_letter"),
+    # Буква, на которую нет слов: без индекса просматривается весь словарь
+    "browse rare letter": (lambda db: TermService(db).list_terms(Lang.kz, letter="ө"), "ix_term_translations_language_letter"),
+    "letter counts": (lambda db: TermService(db).get_letter_counts(Lang.kz), "ix_term_translations_language_letter"),
+    "favorites page": (
+        lambda db: FavoriteRepository(db).get_user_favorites(USERS // 2, limit=20, offset=20),
+        "ix_favorites_user_created"
+    ),
+}
+
+
+def first_select_plan(engine, fn) -> str:
+    """EXPLAIN QUERY PLAN первого SELECT, выполненного fn"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    db = sessionmaker(bind=engine)()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        fn(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+        db.close()
+    statement, parameters = statements[0]
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return " | ".join(row[3] for row in rows)
+
+
+@pytest.mark.parametrize("name", SCENARIOS)
+def test_query_uses_its_index(seeded_engine, no_term_cache, name):
+    fn, index = SCENARIOS[name]
+    letter_counts_cache.clear()
+    plan = first_select_plan(seeded_engine, fn)
+
+    assert index in plan, plan
+    assert "USE TEMP B-TREE" not in plan, plan
+
+
+def test_letter_counts_add_up(seeded_engine, no_term_cache):
+    db = sessionmaker(bind=seeded_engine)()
+    letter_counts_cache.clear()
+    counts = TermService(db).get_letter_counts(Lang.kz)
+    total = db.query(func.count(TermTranslation.id)).join(Term).filter(
+        TermTranslation.language == "kz",
+        Term.is_deleted == False
+    ).scalar()
+    db.close()
+
+    assert sum(c.count for c in counts) == total
+
+
+def test_browse_returns_one_letter_in_order(seeded_engine, no_term_cache):
+    db = sessionmaker(bind=seeded_engine)()
+    letter_counts_cache.clear()
+    service = TermService(db)
+    letter = service.get_letter_counts(Lang.kz)[0].letter
+    page = service.list_terms(Lang.kz, letter=letter.lower(), limit=50)
+    db.close()
+
+    assert page
+    assert all(first_letter(term.title, "kz") == letter for term in page)
+    assert [term.title for term in page] == sorted(term.title for term in page)
+
+
+@pytest.mark.parametrize("title, language, letter", [
+    ("«әділет»", "kz", "Ә"),
+    ("ұл", "kz", "Ұ"),
+    ("iлiм", "kz", "І"),
+    ("Cистема", "ru", "С"),
+    ("CRM", "ru", "C"),
+    ("ёлка", "ru", "Е"),
+    ("1-й этап", "ru", "#"),
+    ("Index", "ru", "I"),
+])
+def test_first_letter(title, language, letter):
+    assert first_letter(title, language) == letter
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from apps.dictionary_service.app.services.term_service import TermService
+from libs.shared.shared.dto.language import Lang
+
+
+def count_statements(engine, fn):
+    """Результат fn и число SQL-запросов, выполненных за его вызов"""
+    statements = []
+
+    def on_execute(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        return fn(), len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+
+@pytest.mark.parametrize("lang", [Lang.ru, Lang.kz])
+def test_page_costs_the_same_number_of_queries(seeded_engine, no_term_cache, lang):
+    queries = {}
+    for size in (20, 100):
+        db = sessionmaker(bind=seeded_engine)()
+        page, queries[size] = count_statements(seeded_engine, lambda: TermService(db).list_terms(lang, limit=size, offset=500))
+        db.close()
+        assert len(page) == size
+    # Термины, теги страницы и переводы
+    assert queries == {20: 3, 100: 3}
+
+
+@pytest.mark.parametrize("lang", [Lang.ru, Lang.kz, Lang.en])
+def test_page_matches_get_term(seeded_engine, no_term_cache, lang):
+    db = sessionmaker(bind=seeded_engine)()
+    service = TermService(db)
+    page = service.list_terms(lang, limit=100, offset=500)
+    expected = [service.get_term(term.id, lang) for term in service.term_repo.get_all(limit=100, offset=500)]
+    db.close()
+
+    assert [term.model_dump() for term in page] == [term.model_dump() for term in expected]
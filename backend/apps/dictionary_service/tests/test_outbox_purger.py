@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from apps.dictionary_service.app.db.base import Base
+from apps.dictionary_service.app.db.models import SearchOutbox
+from apps.dictionary_service.app.repositories.outbox_repo import OutboxRepository
+from apps.dictionary_service.app.services.outbox_purger import OutboxPurger
+from libs.shared.shared.feed.outbox import OP_UPSERT, OutboxReader
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dictionary.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def add_events(session_factory, term_ids, age_hours: float = 0):
+    db = session_factory()
+    OutboxRepository(db).add_many(term_ids, OP_UPSERT)
+    if age_hours:
+        # Новые события пишутся в конец журнала: сдвигаем время только у них
+        head = OutboxReader(db).get_head_seq()
+        db.execute(
+            update(SearchOutbox).where(SearchOutbox.seq > head - len(term_ids)).values(
+                created_at=datetime.now(timezone.utc) - timedelta(hours=age_hours)
+            )
+        )
+    db.commit()
+    db.close()
+
+
+def outbox_state(session_factory):
+    db = session_factory()
+    try:
+        reader = OutboxReader(db)
+        seqs = [event.seq for event in reader.get_after(0, 1000)]
+        return seqs, reader.get_purged_seq(), reader.get_head_seq()
+    finally:
+        db.close()
+
+
+def test_purge_keeps_events_in_retention(sessions):
+    add_events(sessions, [1, 2, 3], age_hours=10)
+    add_events(sessions, [4, 5])
+    purger = OutboxPurger(sessions, retention_hours=5, interval_seconds=0, batch_size=100)
+
+    assert purger.purge() == 3
+    assert outbox_state(sessions) == ([4, 5], 3, 5)
+    assert purger.purge() == 0
+    assert purger.stats() == {"deleted": 3, "runs": 2, "failed": 0}
+
+
+def test_purge_in_batches_moves_watermark(sessions):
+    add_events(sessions, list(range(1, 8)), age_hours=10)
+    purger = OutboxPurger(sessions, retention_hours=5, interval_seconds=0, batch_size=3)
+
+    assert purger.purge() == 7
+    # Номера не переиспользуются и голова журнала известна и после полной очистки
+    assert outbox_state(sessions) == ([], 7, 7)
+
+    add_events(sessions, [8], age_hours=10)
+    assert purger.purge() == 1
+    assert outbox_state(sessions) == ([], 8, 8)
+
+
+def test_purge_stops_at_first_event_in_retention(sessions):
+    add_events(sessions, [1], age_hours=10)
+    add_events(sessions, [2])
+    # Более старое время у более позднего номера (часы сдвинулись): журнал режется только с начала
+    add_events(sessions, [3], age_hours=10)
+    purger = OutboxPurger(sessions, retention_hours=5, interval_seconds=0, batch_size=100)
+
+    assert purger.purge() == 1
+    assert outbox_state(sessions) == ([2, 3], 1, 3)
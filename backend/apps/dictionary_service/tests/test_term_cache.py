@@ -0,0 +1,131 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from apps.dictionary_service.app.db.base import Base
+from apps.dictionary_service.app.db.models import Category
+from apps.dictionary_service.app.db.models.term import TermStatus
+from apps.dictionary_service.app.repositories.term_repo import TermRepository
+from apps.dictionary_service.app.schemas.term import TermUpdateRequest
+from apps.dictionary_service.app.services import moderation_service as moderation_service_module
+from apps.dictionary_service.app.services import term_service as term_service_module
+from apps.dictionary_service.app.services.moderation_service import ModerationService
+from apps.dictionary_service.app.services.term_cache import InProcessBackend, TermCache
+from apps.dictionary_service.app.services.term_service import TermService
+from libs.shared.shared.dto.language import Lang
+from libs.shared.shared.errors.exceptions import NotFoundError
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dictionary.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = TermCache(InProcessBackend(maxsize=100, ttl_seconds=300.0))
+    # Сервисы импортируют синглтон term_cache по имени
+    monkeypatch.setattr(term_service_module, "term_cache", cache)
+    monkeypatch.setattr(moderation_service_module, "term_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def term_id(session_factory):
+    db = session_factory()
+    category = Category(slug="general")
+    db.add(category)
+    db.flush()
+    term = TermRepository(db).create(
+        "old-slug",
+        category.id,
+        author_id=1,
+        translations=[{"language": "ru", "title": "Термин", "definition": "Определение"}]
+    )
+    db.commit()
+    term_id = term.id
+    db.close()
+    return term_id
+
+
+def test_stale_read_is_not_cached_after_concurrent_update(session_factory, cache, term_id, monkeypatch):
+    get_translation = TermRepository.get_translation
+    interleaved = []
+
+    def update_during_read(repo, *args, **kwargs):
+        # Читатель уже загрузил термин; запись завершается и сбрасывает кэш раньше, чем он положит карточку
+        if not interleaved:
+            interleaved.append(True)
+            writer = session_factory()
+            TermService(writer).update_term(term_id, TermUpdateRequest(slug="new-slug"), Lang.ru)
+            writer.close()
+        return get_translation(repo, *args, **kwargs)
+
+    monkeypatch.setattr(TermRepository, "get_translation", update_during_read)
+    reader = session_factory()
+    assert TermService(reader).get_term(term_id, Lang.ru).slug == "old-slug"
+    reader.close()
+    monkeypatch.setattr(TermRepository, "get_translation", get_translation)
+
+    db = session_factory()
+    assert TermService(db).get_term(term_id, Lang.ru).slug == "new-slug"
+    # Свежая карточка закэширована и отдается без базы
+    assert cache.get(term_id, Lang.ru)[0].slug == "new-slug"
+    db.close()
+
+
+def test_unavailable_cache_is_not_filled(cache, term_id, session_factory):
+    class BrokenBackend(InProcessBackend):
+        def generation(self, term_id):
+            raise ConnectionError("cache is down")
+
+    cache.backend = BrokenBackend(maxsize=100, ttl_seconds=300.0)
+    db = session_factory()
+    assert TermService(db).get_term(term_id, Lang.ru).slug == "old-slug"
+    db.close()
+    assert cache.errors == 1
+
+
+def read(session_factory, term_id):
+    db = session_factory()
+    try:
+        return TermService(db).get_term(term_id, Lang.ru)
+    finally:
+        db.close()
+
+
+def write(session_factory, fn):
+    db = session_factory()
+    try:
+        fn(db)
+    finally:
+        db.close()
+
+
+def test_update_is_not_served_stale(session_factory, cache, term_id):
+    assert read(session_factory, term_id).slug == "old-slug"
+    write(session_factory, lambda db: TermService(db).update_term(term_id, TermUpdateRequest(slug="new-slug"), Lang.ru))
+
+    assert read(session_factory, term_id).slug == "new-slug"
+
+
+@pytest.mark.parametrize("moderate, status", [
+    (lambda db, term_id: ModerationService(db).approve_term(term_id), TermStatus.approved),
+    (lambda db, term_id: ModerationService(db).reject_term(term_id, "duplicate"), TermStatus.rejected),
+], ids=["approve", "reject"])
+def test_moderation_is_not_served_stale(session_factory, cache, term_id, moderate, status):
+    write(session_factory, lambda db: TermService(db).submit_term(term_id))
+    assert read(session_factory, term_id).status == TermStatus.pending.value
+    write(session_factory, lambda db: moderate(db, term_id))
+
+    assert read(session_factory, term_id).status == status.value
+
+
+def test_deleted_term_is_not_served_from_cache(session_factory, cache, term_id):
+    assert read(session_factory, term_id)
+    write(session_factory, lambda db: TermService(db).delete_term(term_id))
+
+    with pytest.raises(NotFoundError):
+        read(session_factory, term_id)
@@ -0,0 +1,44 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from apps.dictionary_service.app.api.v1.routes import terms
+from apps.dictionary_service.app.db.models.term import TermStatus
+from apps.dictionary_service.app.db.session import get_db
+from apps.dictionary_service.app.services.term_service import TermService
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(terms.router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = lambda: None
+    return TestClient(app)
+
+
+def test_unknown_status_is_rejected():
+    response = make_client().get("/api/v1/terms/letters", params={"status": "bogus"})
+
+    assert response.status_code == 422
+
+
+def test_status_is_passed_as_enum(monkeypatch):
+    calls = []
+    monkeypatch.setattr(TermService, "get_letter_counts", lambda self, lang, status: calls.append(status) or [])
+
+    response = make_client().get("/api/v1/terms/letters", params={"status": "approved"})
+
+    assert response.status_code == 200
+    assert calls == [TermStatus.approved]
+
+
+def test_unknown_list_status_is_rejected():
+    response = make_client().get("/api/v1/terms", params={"status": "foo"})
+
+    assert response.status_code == 422
+
+
+def test_list_status_is_passed_as_enum(monkeypatch):
+    calls = []
+    monkeypatch.setattr(TermService, "list_terms", lambda self, **kwargs: calls.append(kwargs["status"]) or [])
+
+    assert make_client().get("/api/v1/terms", params={"status": "pending"}).status_code == 200
+    assert make_client().get("/api/v1/terms").status_code == 200
+    assert calls == [TermStatus.pending, None]
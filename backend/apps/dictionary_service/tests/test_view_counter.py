@@ -0,0 +1,112 @@
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from apps.dictionary_service.app.db.base import Base
+from apps.dictionary_service.app.db.models import Category, SearchOutbox, Term
+from apps.dictionary_service.app.repositories.term_repo import TermRepository
+from apps.dictionary_service.app.repositories.outbox_repo import OutboxRepository, OP_UPSERT, OP_VIEWS
+from apps.dictionary_service.app.services.view_counter import ViewCounter
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dictionary.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def outbox(session_factory):
+    db = session_factory()
+    try:
+        return [(event.term_id, event.op) for event in db.query(SearchOutbox).order_by(SearchOutbox.seq)]
+    finally:
+        db.close()
+
+
+def test_flushes_keep_one_views_event_per_term(session_factory):
+    counter = ViewCounter(session_factory, flush_interval_ms=1000, max_pending=1000)
+    for _ in range(5):
+        counter.hit(1)
+        counter.hit(2)
+        counter.flush()
+
+    assert outbox(session_factory) == [(1, OP_VIEWS), (2, OP_VIEWS)]
+
+
+def test_views_event_moves_behind_other_changes(session_factory):
+    counter = ViewCounter(session_factory, flush_interval_ms=1000, max_pending=1000)
+    counter.hit(1)
+    counter.flush()
+    db = session_factory()
+    OutboxRepository(db).add(1, OP_UPSERT)
+    db.commit()
+    db.close()
+    counter.hit(1)
+    counter.flush()
+
+    # Изменения термина остаются, событие просмотров одно и стоит последним
+    assert outbox(session_factory) == [(1, OP_UPSERT), (1, OP_VIEWS)]
+
+
+def add_terms(session_factory, count: int) -> None:
+    db = session_factory()
+    db.execute(insert(Category), [{"id": 1, "slug": "general"}])
+    db.execute(insert(Term), [
+        {"id": term_id, "slug": f"term-{term_id}", "category_id": 1, "author_id": 1}
+        for term_id in range(1, count + 1)
+    ])
+    db.commit()
+    db.close()
+
+
+def stored_views(session_factory) -> dict:
+    db = session_factory()
+    try:
+        return {term_id: views for term_id, views in db.query(Term.id, Term.views) if views}
+    finally:
+        db.close()
+
+
+def test_concurrent_hits_are_not_lost(session_factory):
+    add_terms(session_factory, 50)
+    rnd = random.Random(4)
+    views = rnd.choices(range(1, 51), weights=[1 / rank for rank in range(1, 51)], k=4000)
+    # Короткий интервал и маленький предел: сбросы идут одновременно с hit
+    counter = ViewCounter(session_factory, flush_interval_ms=5, max_pending=100)
+    counter.start()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(counter.hit, views))
+    counter.stop()
+
+    assert stored_views(session_factory) == dict(Counter(views))
+    assert counter.stats()["batches"] > 1
+
+
+def test_failed_flush_keeps_views(session_factory, monkeypatch):
+    add_terms(session_factory, 2)
+    add_views = TermRepository.add_views
+    failures = []
+
+    def locked_once(repo, deltas):
+        if not failures:
+            failures.append(True)
+            raise OperationalError("UPDATE terms", {}, Exception("database is locked"))
+        return add_views(repo, deltas)
+
+    monkeypatch.setattr(TermRepository, "add_views", locked_once)
+    counter = ViewCounter(session_factory, flush_interval_ms=1000, max_pending=1000)
+    counter.hit(1)
+    counter.hit(2)
+    counter.hit(1)
+    assert counter.flush() == 0
+    counter.hit(2)
+
+    # Приращения неудачного сброса вернулись в буфер и записаны следующим
+    assert counter.flush() == 4
+    assert stored_views(session_factory) == {1: 2, 2: 2}
+    assert counter.stats()["failed_flushes"] == 1
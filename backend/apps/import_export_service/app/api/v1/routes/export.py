@@ -13,7 +13,7 @@ router = APIRouter(prefix="/export", tags=["export"])
 
 
 @router.get("")
-async def export_data(
+def export_data(
     format: str = Query(..., pattern="^(csv|json)$"),
     lang: Optional[str] = Query(default=None),
     category_id: Optional[int] = Query(default=None),
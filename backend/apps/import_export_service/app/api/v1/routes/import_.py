@@ -12,7 +12,7 @@ router = APIRouter(prefix="/import", tags=["import"])
 
 
 @router.post("", response_model=ImportStartResponse, status_code=201)
-async def import_data(
+def import_data(
     file: UploadFile = File(...),
     format: str = Form(...),
     mode: str = Form(default="tolerant"),
@@ -25,7 +25,7 @@ async def import_data(
     if format not in ["csv", "json", "xlsx"]:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported format")
     
-    content = await file.read()
+    content = file.file.read()
     service = ImportService(db)
     job_id = service.start_import(user_id, content, format, mode)
     
@@ -33,7 +33,7 @@ async def import_data(
 
 
 @router.get("/{job_id}", response_model=ImportStatusResponse)
-async def get_import_status(
+def get_import_status(
     job_id: str,
     db: Session = Depends(get_db)
 ):
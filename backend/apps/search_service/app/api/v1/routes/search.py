@@ -1,23 +1,24 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, HTTPException, status as http_status
 from sqlalchemy.orm import Session
-from apps.search_service.app.db.session import get_db
+from apps.search_service.app.db.session import get_read_db
 from apps.search_service.app.services.search_service import SearchService
 from apps.search_service.app.services.autocomplete_service import AutocompleteService
+from apps.search_service.app.core.pagination import InvalidCursorError
 from apps.search_service.app.schemas.search import (
     SearchRequestParams,
     SearchFilters,
+    SearchPageResponse,
     AutocompleteHit
 )
 from libs.shared.shared.dto.language import Lang
 from libs.shared.shared.dto.filters import TermSort
-from libs.shared.shared.dto.pagination import PageResponse
 
 router = APIRouter(prefix="/search", tags=["search"])
 
 
-@router.get("", response_model=PageResponse)
-async def search(
+@router.get("", response_model=SearchPageResponse)
+def search(
     q: str = Query(..., min_length=1, max_length=200),
     lang: Lang = Query(default=Lang.ru),
     category_id: Optional[int] = Query(default=None),
@@ -26,7 +27,8 @@ async def search(
     sort: TermSort = Query(default=TermSort.popularity),
     page: int = Query(default=1, ge=1),
     size: int = Query(default=20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(default=None, max_length=512),
+    db: Session = Depends(get_read_db),
     user_id: Optional[int] = None
 ):
     params = SearchRequestParams(
@@ -39,19 +41,23 @@ async def search(
         ),
         sort=sort,
         page=page,
-        size=size
+        size=size,
+        cursor=cursor
     )
     
     service = SearchService(db)
-    return service.search(params, user_id)
+    try:
+        return service.search(params, user_id)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/autocomplete", response_model=list[AutocompleteHit])
-async def autocomplete(
+def autocomplete(
     q: str = Query(..., min_length=1),
     lang: Lang = Query(default=Lang.ru),
     limit: int = Query(default=10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     service = AutocompleteService(db)
     return service.autocomplete(q, lang, limit)
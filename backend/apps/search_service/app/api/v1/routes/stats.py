@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from apps.search_service.app.services.history_writer import history_writer
+from apps.search_service.app.services.autocomplete_index import autocomplete_index
+from apps.search_service.app.services.change_feed import change_feed_consumer
+from apps.search_service.app.services.search_service import cache_stats
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("")
+def get_stats():
+    return {
+        "history": history_writer.stats(),
+        "autocomplete": autocomplete_index.stats(),
+        "change_feed": change_feed_consumer.stats(),
+        "cache": cache_stats()
+    }
@@ -1,9 +1,48 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     app_name: str = "Search Service"
     database_url: str = "sqlite:///./search_service.db"
+    # SQLite в режиме WAL: поисковые запросы идут через отдельный пул соединений только для чтения
+    # и не ждут записи истории и индексации; кэш страниц и mmap у каждого соединения свои
+    sqlite_busy_timeout_ms: int = 5000
+    read_pool_size: int = 8
+    read_pool_max_overflow: int = 8
+    read_cache_size_kib: int = 65536
+    read_mmap_size: int = 268435456
+    # Потоки для синхронных обработчиков; больше, чем соединений в пуле чтения, держать незачем
+    threadpool_size: int = 16
+    # Кэш точного количества результатов: глубокая пагинация не пересчитывает COUNT на каждой странице
+    search_count_cache_size: int = 10000
+    search_count_cache_ttl_seconds: float = 60.0
+    # Поиск также по нормализованным колонкам (стемминг ru/kz, ё -> е)
+    search_morphology: bool = True
+    # Предел слов в MATCH-выражении: стоимость запроса ограничена независимо от ввода
+    search_max_query_terms: int = 8
+    # Нечеткий поиск по триграммам, если FTS ничего не нашел; число прочитанных позиций индекса
+    # и кандидатов ограничено, поэтому стоимость не зависит от размера словаря
+    search_fuzzy_fallback: bool = True
+    search_fuzzy_candidate_cap: int = 200
+    search_fuzzy_max_trigrams: int = 8
+    search_fuzzy_max_postings: int = 20000
+    # Кэш страниц результатов для частых запросов; сбрасывается сменой поколения индекса
+    search_result_cache_size: int = 5000
+    search_result_cache_ttl_seconds: float = 300.0
+    # История поиска пишется фоновым потоком пачками, вне пути запроса
+    history_queue_size: int = 10000
+    history_batch_size: int = 500
+    history_flush_interval_ms: int = 200
+    # Автодополнение из префиксного дерева в памяти (top_k >= максимального limit эндпоинта)
+    autocomplete_in_memory: bool = True
+    autocomplete_top_k: int = 50
+    autocomplete_max_depth: int = 12
+    # Инкрементальная индексация из журнала search_outbox базы dictionary_service (выключена, если URL не задан).
+    # Журнал и термины только читаются; позиция хранится в базе поиска, срок хранения журнала задает dictionary_service
+    dictionary_database_url: Optional[str] = None
+    change_feed_batch_size: int = 500
+    change_feed_poll_interval_ms: int = 500
     
     class Config:
         env_file = ".env"
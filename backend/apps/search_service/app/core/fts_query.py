@@ -0,0 +1,129 @@
+import re
+from typing import List, Optional, Tuple
+from apps.search_service.app.core.morphology import normalize_tokens
+
+# Поля, которые пользователь может указать как "поле:слово", и соответствующие колонки fts_terms:
+# исходные колонки для точной формы и нормализованные для ветки по основам
+FIELDS = {
+    "title": (("title",), ("title_norm",)),
+    "definition": (("definition", "short_definition"), ("body_norm",)),
+    "examples": (("examples",), ("body_norm",)),
+    "synonyms": (("synonyms",), ("title_norm",)),
+    "tags": (("tags_text",), ("body_norm",)),
+    "category": (("category_text",), ("body_norm",)),
+}
+NORM_COLUMNS = ("title_norm", "body_norm")
+
+# Префиксы короче двух символов раскрываются в слишком большое число термов индекса
+MIN_PREFIX_LENGTH = 2
+
+_TOKEN_RE = re.compile(
+    r'(?:(?P<field>\w+):)?'
+    r'(?:"(?P<phrase>[^"]*)"?|(?P<word>\w+)(?P<star>\*)?)'
+)
+_WORD_RE = re.compile(r"\w+")
+
+
+class _Term:
+    __slots__ = ("words", "prefix", "field")
+
+    def __init__(self, words: List[str], prefix: bool, field: Optional[str]):
+        self.words = words
+        self.prefix = prefix
+        self.field = field
+
+
+def parse_query(raw: str, max_terms: int) -> List[_Term]:
+    """Разбирает ввод пользователя на слова, фразы в кавычках, префиксы "слово*" и фильтры "поле:слово".
+    Весь синтаксис FTS5 (операторы, скобки, NEAR, ^, -) считается обычным текстом."""
+    terms: List[_Term] = []
+    budget = max_terms
+
+    for match in _TOKEN_RE.finditer(raw):
+        field = match.group("field")
+        if field is not None and field.lower() not in FIELDS:
+            # Неизвестное поле - это просто еще одно слово запроса
+            terms.append(_Term([field], False, None))
+            field = None
+        field = field.lower() if field else None
+
+        if match.group("phrase") is not None:
+            words = _WORD_RE.findall(match.group("phrase"))
+            prefix = False
+        else:
+            words = [match.group("word")]
+            prefix = bool(match.group("star"))
+        if not words:
+            continue
+        terms.append(_Term(words, prefix, field))
+
+    # Ограничение стоимости: не больше max_terms слов суммарно во всех термах
+    bounded: List[_Term] = []
+    for term in terms:
+        if budget <= 0:
+            break
+        words = term.words[:budget]
+        budget -= len(words)
+        bounded.append(_Term(words, term.prefix and len(words) == len(term.words), term.field))
+    return bounded
+
+
+def _quote(words: List[str], prefix: bool) -> str:
+    # Слова содержат только \w, поэтому кавычки внутри исключены; в кавычках FTS5 не видит операторов
+    phrase = '"' + " ".join(words) + '"'
+    if prefix and len(words[-1]) >= MIN_PREFIX_LENGTH:
+        phrase += "*"
+    return phrase
+
+
+def _with_columns(expression: str, columns: Tuple[str, ...]) -> str:
+    return "{" + " ".join(columns) + "} : " + expression
+
+
+def compile_match(
+    raw: str,
+    language: str,
+    max_terms: int,
+    morphology: bool = True,
+    prefix_last: bool = True
+) -> Optional[str]:
+    """Безопасное MATCH-выражение FTS5 для пользовательского запроса или None, если искать нечего.
+
+    Все термы объединяются через AND, последнее голое слово ищется как префикс (поиск по мере ввода).
+    С морфологией добавляется ветка OR, где те же термы сведены к основам и ищутся в нормализованных колонках."""
+    terms = parse_query(raw, max_terms)
+    if not terms:
+        return None
+    if prefix_last and terms[-1].field is None and len(terms[-1].words) == 1:
+        terms[-1].prefix = True
+
+    exact_parts = []
+    stem_parts = []
+    for term in terms:
+        words = [word.casefold() for word in term.words]
+        exact = _quote(words, term.prefix)
+        stems = [stem for word in words for stem in normalize_tokens(word, language) if stem] or words
+        stemmed = _quote(stems, term.prefix)
+
+        if term.field:
+            exact_columns, norm_columns = FIELDS[term.field]
+            exact = _with_columns(exact, exact_columns)
+            stemmed = _with_columns(stemmed, norm_columns)
+        else:
+            stemmed = _with_columns(stemmed, NORM_COLUMNS)
+        exact_parts.append(exact)
+        stem_parts.append(stemmed)
+
+    expression = " AND ".join(exact_parts)
+    if morphology:
+        expression = f"({expression}) OR ({' AND '.join(stem_parts)})"
+    return expression
+
+
+def compile_title_prefix(raw: str, max_terms: int) -> Optional[str]:
+    """Выражение автодополнения: все слова в заголовке, последнее как префикс"""
+    words = [word.casefold() for word in _WORD_RE.findall(raw)][:max_terms]
+    if not words:
+        return None
+    terms = [_quote([word], False) for word in words[:-1]] + [_quote(words[-1:], True)]
+    return _with_columns(" AND ".join(terms), ("title",))
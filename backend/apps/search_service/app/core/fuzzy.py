@@ -0,0 +1,70 @@
+import re
+from typing import List, Optional
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize(value: Optional[str]) -> str:
+    """Текст для триграммного индекса и сравнения: нижний регистр, ё -> е, слова через один пробел"""
+    if not value:
+        return ""
+    return " ".join(_WORD_RE.findall(value.casefold().replace("ё", "е")))
+
+
+def trigrams(value: str) -> List[str]:
+    """Уникальные триграммы нормализованной строки в порядке появления (как их режет токенайзер trigram)"""
+    return list(dict.fromkeys(value[i:i + 3] for i in range(len(value) - 2)))
+
+
+def max_distance(length: int) -> int:
+    # Допустимое число опечаток растет с длиной слова: 1 до 4 символов, 2 до 8, дальше 3
+    if length <= 4:
+        return 1
+    if length <= 8:
+        return 2
+    return 3
+
+
+def levenshtein(a: str, b: str, limit: int) -> int:
+    """Расстояние Левенштейна с отсечкой: при превышении limit возвращает limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) < len(b):
+        a, b = b, a
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            value = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+def best_distance(query: str, text: str, limit: int) -> int:
+    """Минимальное расстояние от запроса до окна из стольких же подряд идущих слов текста"""
+    words = text.split(" ")
+    width = max(len(query.split(" ")), 1)
+    best = limit + 1
+    for start in range(max(len(words) - width + 1, 1)):
+        best = min(best, levenshtein(query, " ".join(words[start:start + width]), limit))
+        if best == 0:
+            break
+    return best
+
+
+def overlap(query_trigrams: List[str], text: str) -> float:
+    """Доля триграмм запроса, встречающихся в тексте"""
+    if not query_trigrams:
+        return 0.0
+    text_trigrams = set(trigrams(text))
+    return sum(1 for trigram in query_trigrams if trigram in text_trigrams) / len(query_trigrams)
@@ -0,0 +1,208 @@
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+
+# ---------------------------------------------------------------------------
+# Русский: порт алгоритма Snowball (snowballstem.org/algorithms/russian)
+# ---------------------------------------------------------------------------
+
+_RU_VOWELS = set("аеиоуыэюя")
+
+_PERFECTIVE_GERUND_1 = ("в", "вши", "вшись")
+_PERFECTIVE_GERUND_2 = ("ив", "ивши", "ившись", "ыв", "ывши", "ывшись")
+_ADJECTIVE = (
+    "ее", "ие", "ые", "ое", "ими", "ыми", "ей", "ий", "ый", "ой", "ем", "им", "ым", "ом",
+    "его", "ого", "ему", "ому", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею"
+)
+_PARTICIPLE_1 = ("ем", "нн", "вш", "ющ", "щ")
+_PARTICIPLE_2 = ("ивш", "ывш", "ующ")
+_REFLEXIVE = ("ся", "сь")
+_VERB_1 = (
+    "ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет", "ют", "ны",
+    "ть", "ешь", "нно"
+)
+_VERB_2 = (
+    "ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй", "ил", "ыл", "им",
+    "ым", "ен", "ило", "ыло", "ено", "ят", "ует", "уют", "ит", "ыт", "ены", "ить", "ыть",
+    "ишь", "ую", "ю"
+)
+_NOUN = (
+    "а", "ев", "ов", "ие", "ье", "е", "иями", "ями", "ами", "еи", "ии", "и", "ией", "ей",
+    "ой", "ий", "й", "иям", "ям", "ием", "ем", "ам", "ом", "о", "у", "ах", "иях", "ях",
+    "ы", "ь", "ию", "ью", "ю", "ия", "ья", "я"
+)
+_SUPERLATIVE = ("ейше", "ейш")
+_DERIVATIONAL = ("ость", "ост")
+
+
+def _ru_regions(word: str) -> Tuple[int, int]:
+    """Начало RV и R2"""
+    n = len(word)
+    rv = n
+    for i, ch in enumerate(word):
+        if ch in _RU_VOWELS:
+            rv = i + 1
+            break
+
+    def next_region(start: int) -> int:
+        for i in range(start + 1, n):
+            if word[i] not in _RU_VOWELS and word[i - 1] in _RU_VOWELS:
+                return i + 1
+        return n
+
+    r1 = next_region(0)
+    r2 = next_region(r1) if r1 < n else n
+    return rv, r2
+
+
+def _longest(word: str, start: int, *groups: Tuple[str, ...]) -> Tuple[Optional[str], int]:
+    """Самое длинное окончание из групп, целиком лежащее в регионе [start:]; вторым значением номер группы"""
+    best, best_group = None, -1
+    for index, endings in enumerate(groups):
+        for ending in endings:
+            if word.endswith(ending) and len(word) - len(ending) >= start:
+                if best is None or len(ending) > len(best):
+                    best, best_group = ending, index
+    return best, best_group
+
+
+def _strip_grouped(word: str, rv: int, group_1: Tuple[str, ...], group_2: Tuple[str, ...]) -> Optional[str]:
+    # Окончания первой группы снимаются, только если перед ними "а" или "я" (тоже внутри RV)
+    ending, group = _longest(word, rv, group_1, group_2)
+    if ending is None:
+        return None
+    stem = word[:-len(ending)]
+    if group == 0 and not (len(stem) > rv and stem[-1] in "ая"):
+        return None
+    return stem
+
+
+def stem_ru(word: str) -> str:
+    word = word.replace("ё", "е")
+    rv, r2 = _ru_regions(word)
+    if rv >= len(word):
+        return word
+
+    # Шаг 1
+    stem = _strip_grouped(word, rv, _PERFECTIVE_GERUND_1, _PERFECTIVE_GERUND_2)
+    if stem is None:
+        ending, _ = _longest(word, rv, _REFLEXIVE)
+        if ending:
+            word = word[:-len(ending)]
+
+        ending, _ = _longest(word, rv, _ADJECTIVE)
+        if ending:
+            stem = word[:-len(ending)]
+            participle = _strip_grouped(stem, rv, _PARTICIPLE_1, _PARTICIPLE_2)
+            if participle is not None:
+                stem = participle
+        else:
+            stem = _strip_grouped(word, rv, _VERB_1, _VERB_2)
+            if stem is None:
+                ending, _ = _longest(word, rv, _NOUN)
+                stem = word[:-len(ending)] if ending else word
+    word = stem
+
+    # Шаг 2
+    if word.endswith("и") and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    # Шаг 3
+    ending, _ = _longest(word, max(r2, rv), _DERIVATIONAL)
+    if ending:
+        word = word[:-len(ending)]
+
+    # Шаг 4
+    ending, _ = _longest(word, rv, _SUPERLATIVE)
+    if ending:
+        word = word[:-len(ending)]
+    if word.endswith("нн") and len(word) - 2 >= rv:
+        word = word[:-1]
+    elif word.endswith("ь") and len(word) - 1 >= rv:
+        word = word[:-1]
+    return word
+
+
+# ---------------------------------------------------------------------------
+# Казахский: облегченное отсечение словоизменительных аффиксов
+# (падеж -> притяжательность -> множественное число), словообразование не трогаем
+# ---------------------------------------------------------------------------
+
+_KZ_CASE = (
+    "дың", "дің", "тың", "тің", "ның", "нің",
+    "ға", "ге", "қа", "ке", "на", "не",
+    "ды", "ді", "ты", "ті", "ны", "ні",
+    "да", "де", "та", "те", "нда", "нде",
+    "дан", "ден", "тан", "тен", "нан", "нен",
+    "мен", "бен", "пен",
+    "ша", "ше",
+    "а", "е", "н"
+)
+_KZ_POSSESSIVE = (
+    "ымыз", "іміз", "мыз", "міз", "ыңыз", "іңіз", "ңыз", "ңіз",
+    "ым", "ім", "ың", "ің", "сы", "сі",
+    "м", "ң", "ы", "і"
+)
+_KZ_PLURAL = ("лар", "лер", "дар", "дер", "тар", "тер")
+# Чередование на стыке с аффиксом: орталығы -> орталық
+_KZ_MUTATION = {"ғ": "қ", "г": "к", "б": "п"}
+_KZ_MIN_STEM = 3
+
+
+def _kz_strip(word: str, endings: Tuple[str, ...]) -> str:
+    for ending in sorted(endings, key=len, reverse=True):
+        if word.endswith(ending):
+            stem = word[:-len(ending)]
+            # Однобуквенные аффиксы снимаем только с длинных слов, иначе режутся корни
+            min_stem = _KZ_MIN_STEM + (1 if len(ending) == 1 else 0)
+            if len(stem) >= min_stem:
+                return stem
+    return word
+
+
+def stem_kz(word: str) -> str:
+    stripped = word
+    for endings in (_KZ_CASE, _KZ_POSSESSIVE, _KZ_PLURAL):
+        stripped = _kz_strip(stripped, endings)
+    if stripped != word and stripped[-1] in _KZ_MUTATION:
+        stripped = stripped[:-1] + _KZ_MUTATION[stripped[-1]]
+    return stripped
+
+
+STEMMERS: Dict[str, Callable[[str], str]] = {
+    "ru": stem_ru,
+    "kz": stem_kz,
+}
+
+
+def normalize_tokens(value: Optional[str], language: str) -> List[str]:
+    """Токены в нижнем регистре, ё -> е, приведенные к основе стеммером языка (если он есть)"""
+    if not value:
+        return []
+    stemmer = STEMMERS.get(language)
+    tokens = _WORD_RE.findall(value.casefold().replace("ё", "е"))
+    if stemmer is None:
+        return tokens
+    return [stemmer(token) for token in tokens]
+
+
+def normalize_text(values: Iterable[Optional[str]], language: str) -> str:
+    return " ".join(token for value in values for token in normalize_tokens(value, language))
+
+
+def normalize_document(row: dict) -> Tuple[str, str]:
+    """Нормализованные колонки title_norm и body_norm для строки fts_terms"""
+    language = row["language"]
+    title_norm = normalize_text((row.get("title"), row.get("synonyms")), language)
+    body_norm = normalize_text(
+        (
+            row.get("definition"),
+            row.get("short_definition"),
+            row.get("examples"),
+            row.get("tags_text"),
+            row.get("category_text")
+        ),
+        language
+    )
+    return title_norm, body_norm
@@ -0,0 +1,21 @@
+import base64
+import json
+from typing import Tuple
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(rank: float, views: int, term_id: int) -> str:
+    raw = json.dumps([rank, views, term_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, views, term_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return float(rank), int(views), int(term_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursorError("Invalid search cursor")
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime, timezone
+from apps.search_service.app.db.base import Base
+
+
+class ChangeFeedState(Base):
+    __tablename__ = "change_feed_state"
+    
+    name = Column(String(50), primary_key=True)
+    last_seq = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
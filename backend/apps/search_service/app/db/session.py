@@ -1,46 +1,199 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from apps.search_service.app.core.config import settings
 from apps.search_service.app.db.base import Base
+from apps.search_service.app.core import fuzzy
+from apps.search_service.app.core.morphology import normalize_document
+from libs.shared.shared.utils.letters import first_letter
 
+_is_sqlite = "sqlite" in settings.database_url
+
+# Engine для записи: индексация, история поиска, журнал изменений
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    connect_args={"check_same_thread": False} if _is_sqlite else {}
 )
 
+
+def _read_only_url(url: str):
+    """URL того же файла SQLite, открытого только для чтения; None для базы в памяти"""
+    parsed = make_url(url)
+    if not parsed.database or parsed.database == ":memory:" or parsed.database.startswith("file:"):
+        return None
+    return parsed.set(database=f"file:{parsed.database}", query={"mode": "ro", "uri": "true"})
+
+
+_read_url = _read_only_url(settings.database_url) if _is_sqlite else None
+
+# Пул для поисковых запросов; без отдельного файла (память, не SQLite) чтение идет через engine записи
+read_engine = create_engine(
+    _read_url,
+    connect_args={"check_same_thread": False},
+    pool_size=settings.read_pool_size,
+    max_overflow=settings.read_pool_max_overflow
+) if _read_url is not None else engine
+
+
+def _register_functions(dbapi_connection) -> None:
+    # Буква указателя считается так же, как в dictionary_service при записи перевода
+    dbapi_connection.create_function("first_letter", 2, first_letter, deterministic=True)
+
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _configure_writer(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL: читатели не блокируют запись и не блокируются ею; режим сохраняется в файле базы
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.close()
+        _register_functions(dbapi_connection)
+
+
+if read_engine is not engine:
+    @event.listens_for(read_engine, "connect")
+    def _configure_reader(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.execute(f"PRAGMA cache_size=-{settings.read_cache_size_kib}")
+        cursor.execute(f"PRAGMA mmap_size={settings.read_mmap_size}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.close()
+        _register_functions(dbapi_connection)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+# Колонки fts_terms в порядке объявления (от него зависят веса bm25 в SearchRepository).
+# title_norm/body_norm хранят текст после морфологической нормализации, исходный текст отдается как есть
+FTS_COLUMNS = (
+    "term_id",
+    "language",
+    "title",
+    "definition",
+    "short_definition",
+    "examples",
+    "synonyms",
+    "tags_text",
+    "category_text",
+    "title_norm",
+    "body_norm"
+)
+FTS_UNINDEXED = ("term_id", "language")
+
+TRIGRAM_INSERT = """
+    INSERT INTO {table} (term_id, language, title, short_definition, text)
+    VALUES (:term_id, :language, :title, :short_definition, :text)
+"""
+
+
+def trigram_row(row: dict) -> dict:
+    return {
+        "term_id": row["term_id"],
+        "language": row["language"],
+        "title": row["title"],
+        "short_definition": row.get("short_definition") or "",
+        "text": fuzzy.normalize(f"{row['title']} {row.get('synonyms') or ''}")
+    }
+
+
+def create_fts_table(conn, table: str = "fts_terms") -> None:
+    columns = ",\n            ".join(
+        f"{column} UNINDEXED" if column in FTS_UNINDEXED else column for column in FTS_COLUMNS
+    )
+    conn.execute(text(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+            {columns},
+            prefix='2 3 4',
+            tokenize='unicode61'
+        )
+    """))
+
+
+def create_trigram_table(conn, table: str = "fts_trigrams") -> None:
+    # Триграммы заголовков и синонимов для нечеткого поиска при пустой выдаче FTS;
+    # title и short_definition хранятся рядом, чтобы не соединяться с fts_terms по неиндексированному term_id
+    conn.execute(text(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+            term_id UNINDEXED,
+            language UNINDEXED,
+            title UNINDEXED,
+            short_definition UNINDEXED,
+            text,
+            tokenize='trigram'
+        )
+    """))
+
+
+def _backfill_trigrams(conn) -> None:
+    # Индекс, построенный до появления fts_trigrams, дополняется триграммами из fts_terms
+    if conn.execute(text("SELECT 1 FROM fts_trigrams LIMIT 1")).first():
+        return
+    rows = [
+        trigram_row(dict(row._mapping))
+        for row in conn.execute(text("SELECT term_id, language, title, short_definition, synonyms FROM fts_terms"))
+    ]
+    if rows:
+        conn.execute(text(TRIGRAM_INSERT.format(table="fts_trigrams")), rows)
+
+
+def create_term_meta_table(conn, table: str = "term_meta") -> None:
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            term_id INTEGER PRIMARY KEY,
+            status TEXT NOT NULL,
+            category_id INTEGER,
+            is_deleted INTEGER DEFAULT 0,
+            views INTEGER DEFAULT 0,
+            created_at TEXT
+        )
+    """))
+
+
+def _migrate_fts_table(conn) -> None:
+    # Индекс в старой схеме переносится в текущую: недостающий текст категории остается пустым
+    # до следующей переиндексации, нормализованные колонки считаются при переносе
+    columns = [row[1] for row in conn.execute(text("PRAGMA table_info(fts_terms)"))]
+    if not columns or set(FTS_COLUMNS) <= set(columns):
+        return
+    
+    conn.execute(text("DROP TABLE IF EXISTS fts_terms_migrate"))
+    create_fts_table(conn, "fts_terms_migrate")
+    
+    rows = []
+    for row in conn.execute(text(f"SELECT {', '.join(columns)} FROM fts_terms")):
+        doc = {column: "" for column in FTS_COLUMNS}
+        doc.update({key: value for key, value in row._mapping.items() if value is not None})
+        doc["title_norm"], doc["body_norm"] = normalize_document(doc)
+        rows.append(doc)
+    
+    if rows:
+        conn.execute(
+            text(f"""
+                INSERT INTO fts_terms_migrate ({', '.join(FTS_COLUMNS)})
+                VALUES ({', '.join(':' + column for column in FTS_COLUMNS)})
+            """),
+            rows
+        )
+    conn.execute(text("DROP TABLE fts_terms"))
+    conn.execute(text("ALTER TABLE fts_terms_migrate RENAME TO fts_terms"))
 
 
 def init_db():
     Base.metadata.create_all(bind=engine)
     
     with engine.connect() as conn:
-        conn.execute(text("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS fts_terms USING fts5(
-                term_id UNINDEXED,
-                language UNINDEXED,
-                title,
-                definition,
-                short_definition,
-                examples,
-                synonyms,
-                tags_text,
-                prefix='2 3 4',
-                tokenize='unicode61'
-            )
-        """))
-        
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS term_meta (
-                term_id INTEGER PRIMARY KEY,
-                status TEXT NOT NULL,
-                category_id INTEGER,
-                is_deleted INTEGER DEFAULT 0,
-                views INTEGER DEFAULT 0,
-                created_at TEXT
-            )
-        """))
-        
+        _migrate_fts_table(conn)
+        create_fts_table(conn)
+        create_trigram_table(conn)
+        _backfill_trigrams(conn)
+        # Частоты триграмм: нечеткий поиск выбирает самые редкие триграммы запроса
+        conn.execute(text("CREATE VIRTUAL TABLE IF NOT EXISTS fts_trigrams_vocab USING fts5vocab(fts_trigrams, row)"))
+        create_term_meta_table(conn)
         conn.commit()
 
 
@@ -50,3 +203,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,8 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from apps.search_service.app.core.config import settings
-from apps.search_service.app.db.session import init_db
-from apps.search_service.app.api.v1.routes import search
+from apps.search_service.app.db.session import init_db, ReadSessionLocal
+from apps.search_service.app.services.history_writer import history_writer
+from apps.search_service.app.services.autocomplete_index import autocomplete_index
+from apps.search_service.app.services.change_feed import change_feed_consumer
+from apps.search_service.app.api.v1.routes import search, stats
+from libs.shared.shared.utils.concurrency import configure_threadpool
 
 app = FastAPI(title=settings.app_name, version="1.0.0")
 
@@ -15,11 +19,31 @@ app.add_middleware(
 )
 
 app.include_router(search.router, prefix="/api/v1")
+app.include_router(stats.router, prefix="/api/v1")
 
 
 @app.on_event("startup")
 async def startup_event():
+    configure_threadpool(settings.threadpool_size)
     init_db()
+    history_writer.start()
+    
+    # Позиция журнала берется до загрузки автодополнения: изменения после нее процесс применит сам
+    change_feed_consumer.mark_memory_position()
+    if settings.autocomplete_in_memory:
+        db = ReadSessionLocal()
+        try:
+            autocomplete_index.load(db)
+        finally:
+            db.close()
+    
+    change_feed_consumer.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    change_feed_consumer.stop()
+    history_writer.stop()
 
 
 @app.get("/health")
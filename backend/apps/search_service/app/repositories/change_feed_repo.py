@@ -0,0 +1,20 @@
+from sqlalchemy.orm import Session
+from apps.search_service.app.db.models.change_feed_state import ChangeFeedState
+
+
+class ChangeFeedRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_last_seq(self, name: str) -> int:
+        state = self.db.get(ChangeFeedState, name)
+        return state.last_seq if state else 0
+    
+    def set_last_seq(self, name: str, seq: int) -> None:
+        # Без commit: позиция фиксируется в одной транзакции с изменениями индекса.
+        # Не уменьшается: воркер с более старой пачкой не откатывает позицию, записанную другим
+        state = self.db.get(ChangeFeedState, name)
+        if state is None:
+            self.db.add(ChangeFeedState(name=name, last_seq=seq))
+        else:
+            state.last_seq = max(state.last_seq, seq)
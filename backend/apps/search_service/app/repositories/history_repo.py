@@ -1,4 +1,5 @@
 from typing import List, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from apps.search_service.app.db.models.search_history import SearchHistory
 import json
@@ -26,6 +27,14 @@ class HistoryRepository:
         self.db.refresh(history)
         return history
     
+    def create_many(self, rows: List[dict]) -> int:
+        if not rows:
+            return 0
+        # Один INSERT с executemany и один commit на всю пачку
+        self.db.execute(insert(SearchHistory), rows)
+        self.db.commit()
+        return len(rows)
+    
     def get_user_history(self, user_id: int, limit: int = 20) -> List[SearchHistory]:
         return self.db.query(SearchHistory).filter(
             SearchHistory.user_id == user_id
@@ -1,38 +1,69 @@
-from typing import List, Optional
+import json
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from apps.search_service.app.core.config import settings
+from apps.search_service.app.core.fts_query import compile_match, compile_title_prefix
+from apps.search_service.app.core.morphology import normalize_document
+from apps.search_service.app.core import fuzzy
+from libs.shared.shared.utils.letters import first_letter
+from apps.search_service.app.db.session import (
+    FTS_COLUMNS,
+    TRIGRAM_INSERT,
+    create_fts_table,
+    create_term_meta_table,
+    create_trigram_table,
+    trigram_row
+)
+
+# Веса bm25 по колонкам FTS_COLUMNS (term_id и language не индексируются):
+# совпадение в заголовке должно перевешивать совпадение в тегах или категории,
+# точная словоформа - совпадение только по основе
+BM25_RANK = "bm25(fts_terms, 0.0, 0.0, 10.0, 1.0, 2.0, 0.5, 4.0, 2.0, 1.0, 5.0, 0.5)"
+
+_FTS_INSERT = """
+    INSERT INTO {table} (%s)
+    VALUES (%s)
+""" % (", ".join(FTS_COLUMNS), ", ".join(":" + column for column in FTS_COLUMNS))
+
+
+def _with_norm(row: dict) -> dict:
+    row["title_norm"], row["body_norm"] = normalize_document(row)
+    return row
+
+
+def _trigram_table(fts_table: str) -> str:
+    # fts_terms -> fts_trigrams, fts_terms_shadow -> fts_trigrams_shadow
+    return fts_table.replace("fts_terms", "fts_trigrams", 1)
 
 
 class SearchRepository:
     def __init__(self, db: Session):
         self.db = db
     
-    def search(
+    def _build_filters(
         self,
         query: str,
         language: str,
         category_id: Optional[int] = None,
         letter: Optional[str] = None,
-        status: Optional[str] = None,
-        limit: int = 20,
-        offset: int = 0
-    ) -> List[dict]:
-        search_query = f'"{query}"* OR {query}'
+        status: Optional[str] = None
+    ) -> Optional[Tuple[str, dict]]:
+        search_query = compile_match(
+            query,
+            language,
+            max_terms=settings.search_max_query_terms,
+            morphology=settings.search_morphology
+        )
+        if search_query is None:
+            return None
         
         sql = """
-            SELECT 
-                fts.term_id,
-                fts.language,
-                fts.title,
-                fts.short_definition,
-                bm25(fts) as rank,
-                tm.category_id,
-                tm.status,
-                tm.views
             FROM fts_terms fts
             JOIN term_meta tm ON fts.term_id = tm.term_id
             WHERE fts.language = :language
-            AND fts MATCH :query
+            AND fts_terms MATCH :query
             AND tm.is_deleted = 0
         """
         
@@ -52,33 +83,94 @@ class SearchRepository:
             params["category_id"] = category_id
         
         if letter:
-            sql += " AND fts.title LIKE :letter"
-            params["letter"] = f"{letter}%"
+            # Фильтр применяется к уже найденным MATCH строкам, функция зарегистрирована в session
+            sql += " AND first_letter(fts.title, fts.language) = :letter"
+            params["letter"] = first_letter(letter, language)
+        
+        return sql, params
+    
+    def search(
+        self,
+        query: str,
+        language: str,
+        category_id: Optional[int] = None,
+        letter: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        after: Optional[Tuple[float, int, int]] = None
+    ) -> List[dict]:
+        filters = self._build_filters(query, language, category_id, letter, status)
+        if filters is None:
+            return []
+        filters_sql, params = filters
+        
+        sql = f"""
+            SELECT 
+                fts.term_id,
+                fts.language,
+                fts.title,
+                fts.short_definition,
+                {BM25_RANK} as rank,
+                tm.category_id,
+                tm.status,
+                tm.views
+        """ + filters_sql
+        
+        # Keyset-пагинация: продолжаем строго после последней строки предыдущей страницы,
+        # порядок совпадает с ORDER BY (bm25 меньше = релевантнее).
+        # В WHERE "rank" означает скрытую колонку FTS5 (bm25 без весов), а не псевдоним, поэтому выражение целиком
+        if after:
+            sql += f"""
+                AND (
+                    {BM25_RANK} > :after_rank
+                    OR ({BM25_RANK} = :after_rank AND tm.views < :after_views)
+                    OR ({BM25_RANK} = :after_rank AND tm.views = :after_views AND fts.term_id > :after_term_id)
+                )
+            """
+            params["after_rank"], params["after_views"], params["after_term_id"] = after
+            offset = 0
         
-        sql += " ORDER BY rank DESC, tm.views DESC LIMIT :limit OFFSET :offset"
+        sql += " ORDER BY rank, tm.views DESC, fts.term_id LIMIT :limit OFFSET :offset"
         params["limit"] = limit
         params["offset"] = offset
         
         result = self.db.execute(text(sql), params)
         return [dict(row._mapping) for row in result]
     
+    def count(
+        self,
+        query: str,
+        language: str,
+        category_id: Optional[int] = None,
+        letter: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> int:
+        # Те же условия, что и в search, но без bm25 и сортировки
+        filters = self._build_filters(query, language, category_id, letter, status)
+        if filters is None:
+            return 0
+        filters_sql, params = filters
+        return self.db.execute(text("SELECT COUNT(*) " + filters_sql), params).scalar() or 0
+    
     def autocomplete(
         self,
         query: str,
         language: str,
         limit: int = 10
     ) -> List[dict]:
-        search_query = f'"{query}"*'
+        search_query = compile_title_prefix(query, max_terms=settings.search_max_query_terms)
+        if search_query is None:
+            return []
         
         sql = """
             SELECT 
                 fts.term_id,
-                fts.title,
-                fts.slug
+                fts.title
             FROM fts_terms fts
             JOIN term_meta tm ON fts.term_id = tm.term_id
             WHERE fts.language = :language
-            AND fts.title MATCH :query
+            AND fts_terms MATCH :query
             AND tm.is_deleted = 0
             AND tm.status = 'approved'
             ORDER BY tm.views DESC
@@ -91,6 +183,97 @@ class SearchRepository:
         )
         return [dict(row._mapping) for row in result]
     
+    def fuzzy_search(
+        self,
+        query: str,
+        language: str,
+        category_id: Optional[int] = None,
+        letter: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 20,
+        candidate_cap: int = 200,
+        max_trigrams: int = 8,
+        max_postings: int = 20000
+    ) -> List[dict]:
+        normalized = fuzzy.normalize(query)
+        grams = fuzzy.trigrams(normalized)
+        if not grams:
+            return []
+        
+        # Опечатка портит до трех соседних триграмм, остальные остаются общими с нужным заголовком.
+        # Читаем списки документов самых редких триграмм запроса, пока не исчерпан бюджет позиций:
+        # ранжирование bm25 по OR всех триграмм на больших индексах сортирует сотни тысяч строк
+        frequencies = self.db.execute(
+            text("SELECT term, doc FROM fts_trigrams_vocab WHERE term IN (SELECT value FROM json_each(:grams))"),
+            {"grams": json.dumps(grams)}
+        ).fetchall()
+        
+        votes = Counter()
+        read = 0
+        for used, (gram, docs) in enumerate(sorted(frequencies, key=lambda row: row[1])):
+            if used >= max_trigrams or (used >= 2 and read + docs > max_postings):
+                break
+            rows = self.db.execute(
+                text("SELECT rowid FROM fts_trigrams WHERE fts_trigrams MATCH :gram"),
+                {"gram": '"' + gram.replace('"', '""') + '"'}
+            )
+            votes.update(rowid for rowid, in rows)
+            read += docs
+        if not votes:
+            return []
+        
+        sql = """
+            SELECT
+                tg.term_id,
+                tg.title,
+                tg.short_definition,
+                tg.text,
+                tm.category_id,
+                tm.views
+            FROM fts_trigrams tg
+            JOIN term_meta tm ON tg.term_id = tm.term_id
+            WHERE tg.rowid IN (SELECT value FROM json_each(:candidates))
+            AND tg.language = :language
+            AND tm.is_deleted = 0
+        """
+        params = {
+            "candidates": json.dumps([rowid for rowid, _ in votes.most_common(candidate_cap)]),
+            "language": language
+        }
+        
+        if status:
+            sql += " AND tm.status = :status"
+            params["status"] = status
+        else:
+            sql += " AND tm.status = 'approved'"
+        
+        if category_id:
+            sql += " AND tm.category_id = :category_id"
+            params["category_id"] = category_id
+        
+        if letter:
+            sql += " AND first_letter(tg.title, tg.language) = :letter"
+            params["letter"] = first_letter(letter, language)
+        
+        limit_distance = fuzzy.max_distance(len(normalized))
+        hits = []
+        for row in self.db.execute(text(sql), params):
+            distance = fuzzy.best_distance(normalized, row.text, limit_distance)
+            if distance > limit_distance:
+                continue
+            hits.append({
+                "term_id": row.term_id,
+                "title": row.title,
+                "short_definition": row.short_definition,
+                "rank": float(distance),
+                "category_id": row.category_id,
+                "views": row.views,
+                "overlap": fuzzy.overlap(grams, row.text)
+            })
+        
+        hits.sort(key=lambda hit: (hit["rank"], -hit["overlap"], -(hit["views"] or 0), hit["term_id"]))
+        return hits[:limit]
+    
     def index_term(
         self,
         term_id: int,
@@ -100,7 +283,8 @@ class SearchRepository:
         short_definition: Optional[str],
         examples: Optional[str],
         synonyms: Optional[str],
-        tags_text: Optional[str]
+        tags_text: Optional[str],
+        category_text: Optional[str] = None
     ) -> None:
         # FTS5 не поддерживает UPSERT, поэтому сначала удаляем, потом вставляем
         delete_sql = """
@@ -108,15 +292,12 @@ class SearchRepository:
             WHERE term_id = :term_id AND language = :language
         """
         self.db.execute(text(delete_sql), {"term_id": term_id, "language": language})
-        
-        insert_sql = """
-            INSERT INTO fts_terms (term_id, language, title, definition, short_definition, examples, synonyms, tags_text)
-            VALUES (:term_id, :language, :title, :definition, :short_definition, :examples, :synonyms, :tags_text)
-        """
-        
         self.db.execute(
-            text(insert_sql),
-            {
+            text("DELETE FROM fts_trigrams WHERE term_id = :term_id AND language = :language"),
+            {"term_id": term_id, "language": language}
+        )
+        
+        row = _with_norm({
                 "term_id": term_id,
                 "language": language,
                 "title": title,
@@ -124,13 +305,16 @@ class SearchRepository:
                 "short_definition": short_definition or "",
                 "examples": examples or "",
                 "synonyms": synonyms or "",
-                "tags_text": tags_text or ""
-            }
-        )
+                "tags_text": tags_text or "",
+                "category_text": category_text or ""
+            })
+        self.db.execute(text(_FTS_INSERT.format(table="fts_terms")), row)
+        self.db.execute(text(TRIGRAM_INSERT.format(table="fts_trigrams")), trigram_row(row))
         self.db.commit()
     
     def delete_term(self, term_id: int) -> None:
         self.db.execute(text("DELETE FROM fts_terms WHERE term_id = :term_id"), {"term_id": term_id})
+        self.db.execute(text("DELETE FROM fts_trigrams WHERE term_id = :term_id"), {"term_id": term_id})
         self.db.execute(text("DELETE FROM term_meta WHERE term_id = :term_id"), {"term_id": term_id})
         self.db.commit()
     
@@ -165,3 +349,101 @@ class SearchRepository:
             }
         )
         self.db.commit()
+    
+    # Пакетные методы переиндексации не коммитят: транзакцией управляет IndexingService
+    
+    def bulk_delete_translations(self, keys: List[Tuple[int, str]]) -> None:
+        # term_id в FTS5 не индексирован, и DELETE по нему сканирует всю таблицу:
+        # удаляем всю пачку одним проходом вместо прохода на каждый перевод
+        for table in ("fts_terms", "fts_trigrams"):
+            self.db.execute(
+                text(f"""
+                    DELETE FROM {table}
+                    WHERE (term_id, language) IN (
+                        SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]')
+                        FROM json_each(:keys)
+                    )
+                """),
+                {"keys": json.dumps(keys)}
+            )
+    
+    def bulk_delete_terms(self, term_ids: List[int]) -> None:
+        for table in ("fts_terms", "fts_trigrams"):
+            self.db.execute(
+                text(f"DELETE FROM {table} WHERE term_id IN (SELECT value FROM json_each(:term_ids))"),
+                {"term_ids": json.dumps(term_ids)}
+            )
+    
+    def bulk_delete_term_meta(self, term_ids: List[int]) -> None:
+        self.db.execute(
+            text("DELETE FROM term_meta WHERE term_id IN (SELECT value FROM json_each(:term_ids))"),
+            {"term_ids": json.dumps(term_ids)}
+        )
+    
+    def bulk_insert_fts(self, rows: List[dict], table: str = "fts_terms") -> None:
+        rows = [_with_norm(row) for row in rows]
+        self.db.execute(text(_FTS_INSERT.format(table=table)), rows)
+        self.db.execute(
+            text(TRIGRAM_INSERT.format(table=_trigram_table(table))),
+            [trigram_row(row) for row in rows]
+        )
+    
+    def bulk_upsert_term_meta(self, rows: List[dict], table: str = "term_meta") -> None:
+        self.db.execute(
+            text(f"""
+                INSERT INTO {table} (term_id, status, category_id, is_deleted, views, created_at)
+                VALUES (:term_id, :status, :category_id, :is_deleted, :views, :created_at)
+                ON CONFLICT(term_id) DO UPDATE SET
+                    status = excluded.status,
+                    category_id = excluded.category_id,
+                    is_deleted = excluded.is_deleted,
+                    views = excluded.views
+            """),
+            rows
+        )
+    
+    def bulk_update_views(self, views: Dict[int, int]) -> None:
+        self.db.execute(
+            text("UPDATE term_meta SET views = :views WHERE term_id = :term_id"),
+            [{"term_id": term_id, "views": count} for term_id, count in views.items()]
+        )
+    
+    def optimize_fts(self, table: str = "fts_terms") -> None:
+        # Сливает b-деревья сегментов FTS5 в одно: после массовой вставки ускоряет MATCH
+        self.db.execute(text(f"INSERT INTO {table}({table}) VALUES('optimize')"))
+    
+    def create_shadow_tables(self) -> None:
+        conn = self.db.connection()
+        conn.execute(text("DROP TABLE IF EXISTS fts_terms_shadow"))
+        conn.execute(text("DROP TABLE IF EXISTS fts_trigrams_shadow"))
+        conn.execute(text("DROP TABLE IF EXISTS term_meta_shadow"))
+        create_fts_table(conn, "fts_terms_shadow")
+        create_trigram_table(conn, "fts_trigrams_shadow")
+        create_term_meta_table(conn, "term_meta_shadow")
+        self.db.commit()
+    
+    def swap_shadow_tables(self) -> None:
+        # sqlite3 не открывает транзакцию перед DDL сам, поэтому BEGIN явный:
+        # читатели видят либо старый индекс целиком, либо новый
+        raw = self.db.get_bind().raw_connection()
+        try:
+            driver_conn = raw.driver_connection
+            isolation_level = driver_conn.isolation_level
+            driver_conn.isolation_level = None
+            cur = driver_conn.cursor()
+            try:
+                cur.execute("BEGIN IMMEDIATE")
+                cur.execute("DROP TABLE fts_terms")
+                cur.execute("ALTER TABLE fts_terms_shadow RENAME TO fts_terms")
+                cur.execute("DROP TABLE fts_trigrams")
+                cur.execute("ALTER TABLE fts_trigrams_shadow RENAME TO fts_trigrams")
+                cur.execute("DROP TABLE term_meta")
+                cur.execute("ALTER TABLE term_meta_shadow RENAME TO term_meta")
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            finally:
+                driver_conn.isolation_level = isolation_level
+        finally:
+            raw.close()
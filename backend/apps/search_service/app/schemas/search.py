@@ -2,6 +2,7 @@ from typing import Optional
 from pydantic import BaseModel, Field
 from libs.shared.shared.dto.language import Lang
 from libs.shared.shared.dto.filters import TermSort
+from libs.shared.shared.dto.pagination import PageMeta
 
 
 class SearchFilters(BaseModel):
@@ -18,6 +19,7 @@ class SearchRequestParams(BaseModel):
     sort: TermSort = TermSort.popularity
     page: int = Field(1, ge=1)
     size: int = Field(20, ge=1, le=100)
+    cursor: Optional[str] = Field(default=None, max_length=512)
 
 
 class SearchHit(BaseModel):
@@ -29,6 +31,17 @@ class SearchHit(BaseModel):
     rank: float
 
 
+class SearchPageMeta(PageMeta):
+    next_cursor: Optional[str] = None
+    # Выдача построена нечетким поиском по триграммам (точных совпадений нет), rank - число опечаток
+    fuzzy: bool = False
+
+
+class SearchPageResponse(BaseModel):
+    meta: SearchPageMeta
+    items: list[SearchHit]
+
+
 class AutocompleteHit(BaseModel):
     term_id: int
     slug: str
@@ -0,0 +1,248 @@
+import bisect
+import gc
+import heapq
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from apps.search_service.app.core.config import settings
+
+_WORD_RE = re.compile(r"\w+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prefix(value: str) -> str:
+    return _SPACE_RE.sub(" ", value.casefold()).strip()
+
+
+class _Node:
+    __slots__ = ("children", "top", "entries")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # top-k термов поддерева: отсортированный список (-views, term_id)
+        self.top: List[Tuple[int, int]] = []
+        # term_id -> ключи, которые заканчиваются в этом узле (или глубже max_depth)
+        self.entries: Dict[int, Set[str]] = {}
+
+
+class PrefixIndex:
+    """Префиксное дерево заголовков одного языка с заранее посчитанным top-k по просмотрам в каждом узле"""
+
+    def __init__(self, top_k: int, max_depth: int):
+        self.top_k = top_k
+        self.max_depth = max_depth
+        self._root = _Node()
+        self._terms: Dict[int, Tuple[str, int, List[str]]] = {}
+        self.nodes = 1
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def get(self, term_id: int) -> Optional[Tuple[str, int]]:
+        entry = self._terms.get(term_id)
+        return (entry[0], entry[1]) if entry is not None else None
+
+    def add(self, term_id: int, title: str, views: int) -> None:
+        if term_id in self._terms:
+            self.remove(term_id)
+        self._insert(term_id, title, views, append_only=False)
+
+    def bulk_add(self, rows: List[Tuple[int, str, int]]) -> None:
+        # Сборщик мусора на время загрузки выключен: миллионы новых узлов провоцируют
+        # частые полные проходы GC, которые удваивают время построения
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # При вставке по убыванию просмотров top каждого узла заполняется простым append
+            for term_id, title, views in sorted(rows, key=lambda r: (-r[2], r[0])):
+                if term_id in self._terms:
+                    self.add(term_id, title, views)
+                else:
+                    self._insert(term_id, title, views, append_only=True)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _insert(self, term_id: int, title: str, views: int, append_only: bool) -> None:
+        keys = self._keys_for(title)
+        self._terms[term_id] = (title, views, keys)
+        item = (-views, term_id)
+        top_k = self.top_k
+
+        for key in keys:
+            node = self._root
+            for char in key[:self.max_depth]:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _Node()
+                    self.nodes += 1
+                node = child
+                if not append_only:
+                    self._push_top(node, item)
+                elif len(node.top) < top_k and (not node.top or node.top[-1][1] != term_id):
+                    node.top.append(item)
+            node.entries.setdefault(term_id, set()).add(key)
+
+    def remove(self, term_id: int) -> None:
+        entry = self._terms.pop(term_id, None)
+        if entry is None:
+            return
+
+        # Собираем затронутые узлы, затем пересчитываем top снизу вверх из детей
+        touched: Dict[int, Tuple[int, _Node, _Node, str]] = {}
+        for key in entry[2]:
+            node = self._root
+            path = []
+            for char in key[:self.max_depth]:
+                parent, node = node, node.children[char]
+                path.append((parent, node, char))
+            keys = node.entries.get(term_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del node.entries[term_id]
+            for depth, (parent, child, char) in enumerate(path):
+                touched[id(child)] = (depth, parent, child, char)
+
+        for depth, parent, node, char in sorted(touched.values(), key=lambda t: -t[0]):
+            if not node.children and not node.entries:
+                if parent.children.get(char) is node:
+                    del parent.children[char]
+                    self.nodes -= 1
+                continue
+            if any(t == term_id for _, t in node.top):
+                self._recompute_top(node)
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[int, str]]:
+        key = normalize_prefix(prefix)
+        if not key:
+            return []
+
+        node = self._root
+        for char in key[:self.max_depth]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        if len(key) <= self.max_depth:
+            return [(term_id, self._terms[term_id][0]) for _, term_id in node.top[:limit]]
+
+        # Префикс длиннее глубины дерева: фильтруем кандидатов листа по полному ключу
+        matches = [
+            (-self._terms[term_id][1], term_id)
+            for term_id, keys in node.entries.items()
+            if any(k.startswith(key) for k in keys)
+        ]
+        return [(term_id, self._terms[term_id][0]) for _, term_id in heapq.nsmallest(limit, matches)]
+
+    def _push_top(self, node: _Node, item: Tuple[int, int]) -> None:
+        top = node.top
+        if len(top) >= self.top_k and item >= top[-1]:
+            return
+        if any(t == item[1] for _, t in top):
+            return
+        bisect.insort(top, item)
+        if len(top) > self.top_k:
+            top.pop()
+
+    def _recompute_top(self, node: _Node) -> None:
+        candidates: Dict[int, int] = {}
+        for child in node.children.values():
+            for neg_views, term_id in child.top:
+                candidates[term_id] = neg_views
+        for term_id in node.entries:
+            candidates[term_id] = -self._terms[term_id][1]
+        node.top = heapq.nsmallest(self.top_k, ((v, t) for t, v in candidates.items()))
+
+    @staticmethod
+    def _keys_for(title: str) -> List[str]:
+        # Как и FTS5-запрос "q"*, совпадение ищется с начала любого слова заголовка
+        normalized = normalize_prefix(title)
+        return list(dict.fromkeys(normalized[m.start():] for m in _WORD_RE.finditer(normalized)))
+
+
+class AutocompleteIndex:
+    def __init__(self, top_k: int, max_depth: int):
+        self.top_k = top_k
+        self.max_depth = max_depth
+        self._indexes: Dict[str, PrefixIndex] = {}
+        self._lock = threading.RLock()
+        self.loaded = False
+
+    def load(self, db: Session) -> int:
+        rows = db.execute(text("""
+            SELECT fts.term_id, fts.language, fts.title, tm.views
+            FROM fts_terms fts
+            JOIN term_meta tm ON fts.term_id = tm.term_id
+            WHERE tm.is_deleted = 0
+            AND tm.status = 'approved'
+        """))
+
+        by_language: Dict[str, List[Tuple[int, str, int]]] = {}
+        for term_id, language, title, views in rows:
+            by_language.setdefault(language, []).append((int(term_id), title, views or 0))
+
+        indexes: Dict[str, PrefixIndex] = {}
+        for language, items in by_language.items():
+            index = indexes[language] = PrefixIndex(self.top_k, self.max_depth)
+            index.bulk_add(items)
+        count = sum(len(items) for items in by_language.values())
+
+        with self._lock:
+            self._indexes = indexes
+            self.loaded = True
+        return count
+
+    def upsert(self, term_id: int, language: str, title: str, views: int, visible: bool) -> None:
+        if not self.loaded:
+            return
+        with self._lock:
+            index = self._indexes.get(language)
+            if not visible:
+                if index is not None:
+                    index.remove(term_id)
+                return
+            if index is None:
+                index = self._indexes[language] = PrefixIndex(self.top_k, self.max_depth)
+            index.add(term_id, title, views)
+
+    def update_views(self, term_id: int, views: int) -> None:
+        if not self.loaded:
+            return
+        with self._lock:
+            for index in self._indexes.values():
+                entry = index.get(term_id)
+                if entry is not None and entry[1] != views:
+                    index.add(term_id, entry[0], views)
+
+    def remove_term(self, term_id: int) -> None:
+        if not self.loaded:
+            return
+        with self._lock:
+            for index in self._indexes.values():
+                index.remove(term_id)
+
+    def search(self, query: str, language: str, limit: int) -> List[Tuple[int, str]]:
+        with self._lock:
+            index = self._indexes.get(language)
+            if index is None:
+                return []
+            return index.search(query, limit)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "languages": {
+                    language: {"terms": len(index), "nodes": index.nodes}
+                    for language, index in self._indexes.items()
+                }
+            }
+
+
+autocomplete_index = AutocompleteIndex(
+    top_k=settings.autocomplete_top_k,
+    max_depth=settings.autocomplete_max_depth
+)
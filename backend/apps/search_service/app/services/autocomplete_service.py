@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from apps.search_service.app.repositories.search_repo import SearchRepository
+from apps.search_service.app.services.autocomplete_index import autocomplete_index
 from apps.search_service.app.schemas.search import AutocompleteHit
 from libs.shared.shared.dto.language import Lang
 
@@ -10,6 +11,12 @@ class AutocompleteService:
         self.db = db
     
     def autocomplete(self, query: str, lang: Lang, limit: int = 10) -> list[AutocompleteHit]:
+        if autocomplete_index.loaded:
+            return [
+                AutocompleteHit(term_id=term_id, slug=str(term_id), title=title)
+                for term_id, title in autocomplete_index.search(query, lang.value, limit)
+            ]
+        
         results = self.search_repo.autocomplete(
             query=query,
             language=lang.value,
@@ -0,0 +1,212 @@
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from apps.search_service.app.core.config import settings
+from apps.search_service.app.db.session import SessionLocal
+from apps.search_service.app.repositories.change_feed_repo import ChangeFeedRepository
+from apps.search_service.app.services.autocomplete_index import autocomplete_index
+from apps.search_service.app.services.indexing_service import IndexingService, index_generation
+from libs.shared.shared.feed.outbox import OP_VIEWS, OutboxReader
+
+logger = logging.getLogger(__name__)
+
+FEED_NAME = "dictionary"
+
+
+class ChangeFeedConsumer:
+    """Читает search_outbox dictionary_service по номеру события и пачками применяет изменения к индексу.
+    Журнал только читается, его срок хранения задает dictionary_service. Позиция индекса хранится
+    в change_feed_state и общая для воркеров; своя позиция процесса (memory_seq) догоняет ее,
+    чтобы автодополнение и поколение кэша каждого воркера видели все события"""
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        source_url: Optional[str],
+        batch_size: int,
+        poll_interval_ms: int
+    ):
+        self._session_factory = session_factory
+        self._source_url = source_url
+        self._source_factory: Optional[Callable[[], Session]] = None
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval_ms / 1000
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.last_seq = 0
+        self.memory_seq: Optional[int] = None
+        self.head_seq = 0
+        self.purged_seq = 0
+        self.missed_events = False
+        self.lag_seconds = 0.0
+        self.last_batch_size = 0
+        self.batches = 0
+        self.events = 0
+        self.errors = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self._source_url)
+    
+    def start(self) -> None:
+        if not self.enabled or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="search-change-feed", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def mark_memory_position(self) -> None:
+        """Позиция индекса до загрузки состояния процесса из базы (startup): события после нее
+        процесс применит к своей памяти, даже если индекс в базе обновит другой воркер"""
+        if not self.enabled:
+            return
+        db = self._session_factory()
+        try:
+            seq = ChangeFeedRepository(db).get_last_seq(FEED_NAME)
+        finally:
+            db.close()
+        with self._lock:
+            self.memory_seq = seq
+    
+    def poll_once(self) -> int:
+        db = self._session_factory()
+        source = self._source_session()
+        try:
+            feed_repo = ChangeFeedRepository(db)
+            reader = OutboxReader(source)
+            index_seq = feed_repo.get_last_seq(FEED_NAME)
+            memory_seq = index_seq if self.memory_seq is None else min(self.memory_seq, index_seq)
+            purged_seq = reader.get_purged_seq()
+            if purged_seq > index_seq and not self.missed_events:
+                # События удалены по сроку хранения раньше, чем попали в индекс: догнать их по журналу нельзя
+                logger.error(
+                    "Search change feed is behind the outbox retention (position %d, purged up to %d), "
+                    "rebuild the index with scripts/index_terms.py",
+                    index_seq, purged_seq
+                )
+                with self._lock:
+                    self.missed_events = True
+            if memory_seq < index_seq and purged_seq > memory_seq:
+                memory_seq = self._reload_memory(db, index_seq)
+            
+            events = reader.get_after(memory_seq, self._batch_size)
+            if events:
+                # Событие только сообщает, какой термин изменился: состояние читается заново,
+                # поэтому повтор и схлопывание нескольких событий одного термина безопасны
+                term_ids = list(dict.fromkeys(event.term_id for event in events if event.op != OP_VIEWS))
+                # Термины, у которых изменились только просмотры, не переиндексируются
+                viewed = list(dict.fromkeys(
+                    event.term_id for event in events if event.op == OP_VIEWS and event.term_id not in term_ids
+                ))
+                docs, deleted = reader.get_documents(term_ids)
+                views = reader.get_views(viewed)
+                
+                batch_seq = events[-1].seq
+                indexing = IndexingService(db)
+                if batch_seq > index_seq:
+                    feed_repo.set_last_seq(FEED_NAME, batch_seq)
+                    if term_ids:
+                        indexing.apply_changes(docs, deleted)
+                    if views:
+                        indexing.apply_views(views)
+                    # Позиция фиксируется при любом составе пачки: apply_views без найденных терминов
+                    # ничего не коммитит, и те же события читались бы на каждом опросе
+                    db.commit()
+                    index_seq = batch_seq
+                else:
+                    # Индекс в базе уже обновил другой воркер: догоняем только память процесса
+                    indexing.sync_memory(docs, deleted, views)
+                memory_seq = batch_seq
+            
+            head_seq = reader.get_head_seq()
+            pending = reader.get_after(index_seq, 1)
+            lag_seconds = self._age_seconds(pending[0].created_at) if pending else 0.0
+            
+            with self._lock:
+                self.last_seq = index_seq
+                self.memory_seq = memory_seq
+                self.head_seq = head_seq
+                self.purged_seq = purged_seq
+                self.lag_seconds = lag_seconds
+                if events:
+                    self.last_batch_size = len(events)
+                    self.batches += 1
+                    self.events += len(events)
+            return len(events)
+        finally:
+            source.close()
+            db.close()
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "last_seq": self.last_seq,
+                "memory_seq": self.memory_seq,
+                "head_seq": self.head_seq,
+                "purged_seq": self.purged_seq,
+                "missed_events": self.missed_events,
+                "lag_events": max(self.head_seq - self.last_seq, 0),
+                "lag_seconds": round(self.lag_seconds, 3),
+                "last_batch_size": self.last_batch_size,
+                "batches": self.batches,
+                "events": self.events,
+                "errors": self.errors
+            }
+    
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                applied = self.poll_once()
+            except Exception:
+                applied = 0
+                with self._lock:
+                    self.errors += 1
+                logger.exception("Failed to apply search change feed batch")
+            # Полная пачка: журнал отстает, читаем следующую без паузы
+            if applied < self._batch_size:
+                self._stop_event.wait(self._poll_interval)
+    
+    @staticmethod
+    def _reload_memory(db: Session, index_seq: int) -> int:
+        """События, которые другие воркеры применили к индексу, удалены из журнала раньше, чем процесс
+        их прочитал: состояние процесса перечитывается из индекса целиком"""
+        if autocomplete_index.loaded:
+            autocomplete_index.load(db)
+        index_generation.bump()
+        return index_seq
+    
+    def _source_session(self) -> Session:
+        if self._source_factory is None:
+            engine = create_engine(
+                self._source_url,
+                connect_args={"check_same_thread": False} if "sqlite" in self._source_url else {}
+            )
+            self._source_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        return self._source_factory()
+    
+    @staticmethod
+    def _age_seconds(created_at: Optional[datetime]) -> float:
+        if created_at is None:
+            return 0.0
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return max((datetime.now(timezone.utc) - created_at).total_seconds(), 0.0)
+
+
+change_feed_consumer = ChangeFeedConsumer(
+    session_factory=SessionLocal,
+    source_url=settings.dictionary_database_url,
+    batch_size=settings.change_feed_batch_size,
+    poll_interval_ms=settings.change_feed_poll_interval_ms
+)
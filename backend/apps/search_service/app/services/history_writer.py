@@ -0,0 +1,141 @@
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from sqlalchemy.orm import Session
+from apps.search_service.app.core.config import settings
+from apps.search_service.app.db.session import SessionLocal
+from apps.search_service.app.repositories.history_repo import HistoryRepository
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryWriter:
+    """Фоновая пакетная запись истории поиска: запрос только кладет событие в очередь"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval_ms: int
+    ):
+        self._session_factory = session_factory
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_queue_size)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_ms / 1000
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="search-history-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        # Дописываем то, что осталось в очереди на момент остановки
+        self.flush()
+
+    def enqueue(
+        self,
+        user_id: Optional[int],
+        query: str,
+        lang: str,
+        filters: Optional[dict] = None
+    ) -> bool:
+        event = {
+            "user_id": user_id,
+            "query": query,
+            "lang": lang,
+            "filters_json": json.dumps(filters) if filters else None,
+            "created_at": datetime.now(timezone.utc)
+        }
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Очередь переполнена: теряем событие, но не блокируем поиск
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def flush(self) -> None:
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return
+            self._write(batch)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "written": self.written,
+                "batches": self.batches,
+                "failed": self.failed
+            }
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+
+    def _drain(self, block: bool) -> List[dict]:
+        batch = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=self._flush_interval))
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.monotonic()
+                if not block or timeout <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=timeout))
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, batch: List[dict]) -> None:
+        db = self._session_factory()
+        try:
+            HistoryRepository(db).create_many(batch)
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self.failed += len(batch)
+            logger.exception("Failed to write %d search history events", len(batch))
+        finally:
+            db.close()
+
+
+history_writer = HistoryWriter(
+    session_factory=SessionLocal,
+    max_queue_size=settings.history_queue_size,
+    batch_size=settings.history_batch_size,
+    flush_interval_ms=settings.history_flush_interval_ms
+)
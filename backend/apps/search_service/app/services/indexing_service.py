@@ -1,6 +1,28 @@
-from typing import Optional
+import threading
+from typing import Dict, Iterable, List, Optional
 from sqlalchemy.orm import Session
 from apps.search_service.app.repositories.search_repo import SearchRepository
+from apps.search_service.app.services.autocomplete_index import autocomplete_index
+
+
+class IndexGeneration:
+    """Монотонный номер версии индекса: любое изменение индекса в этом процессе его увеличивает"""
+    
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def current(self) -> int:
+        return self._value
+    
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+index_generation = IndexGeneration()
 
 
 class IndexingService:
@@ -22,7 +44,8 @@ class IndexingService:
         category_id: int,
         is_deleted: bool,
         views: int,
-        created_at: str
+        created_at: str,
+        category_text: Optional[str] = None
     ) -> None:
         self.search_repo.index_term(
             term_id=term_id,
@@ -32,7 +55,8 @@ class IndexingService:
             short_definition=short_definition,
             examples=examples,
             synonyms=synonyms,
-            tags_text=tags_text
+            tags_text=tags_text,
+            category_text=category_text
         )
         
         self.search_repo.update_term_meta(
@@ -43,6 +67,153 @@ class IndexingService:
             views=views,
             created_at=created_at
         )
+        
+        autocomplete_index.upsert(
+            term_id=term_id,
+            language=language,
+            title=title,
+            views=views,
+            visible=status == "approved" and not is_deleted
+        )
+        index_generation.bump()
     
     def delete_term(self, term_id: int) -> None:
         self.search_repo.delete_term(term_id)
+        autocomplete_index.remove_term(term_id)
+        index_generation.bump()
+    
+    def bulk_index_terms(self, docs: List[dict]) -> int:
+        """Обновляет пачку переводов на месте одной транзакцией"""
+        if not docs:
+            return 0
+        
+        fts_rows, meta_rows = self._split_docs(docs)
+        try:
+            self.search_repo.bulk_delete_translations([(row["term_id"], row["language"]) for row in fts_rows])
+            self.search_repo.bulk_insert_fts(fts_rows)
+            self.search_repo.bulk_upsert_term_meta(meta_rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        for doc in docs:
+            autocomplete_index.upsert(
+                term_id=doc["term_id"],
+                language=doc["language"],
+                title=doc["title"],
+                views=doc["views"],
+                visible=doc["status"] == "approved" and not doc["is_deleted"]
+            )
+        index_generation.bump()
+        return len(docs)
+    
+    def apply_changes(self, docs: List[dict], deleted_term_ids: List[int]) -> None:
+        """Применяет пачку изменений журнала: документы терминов заменяются целиком, удаленные убираются"""
+        fts_rows, meta_rows = self._split_docs(docs)
+        term_ids = list({row["term_id"] for row in meta_rows} | set(deleted_term_ids))
+        try:
+            if term_ids:
+                # Переводы термина заменяются целиком, поэтому старые документы удаляются по term_id
+                self.search_repo.bulk_delete_terms(term_ids)
+            if deleted_term_ids:
+                self.search_repo.bulk_delete_term_meta(deleted_term_ids)
+            if fts_rows:
+                self.search_repo.bulk_insert_fts(fts_rows)
+                self.search_repo.bulk_upsert_term_meta(meta_rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self.sync_memory(docs, deleted_term_ids, {})
+    
+    def apply_views(self, views: Dict[int, int]) -> None:
+        """Обновляет популярность терминов без переиндексации текста"""
+        if not views:
+            return
+        try:
+            self.search_repo.bulk_update_views(views)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self.sync_memory([], [], views)
+    
+    @staticmethod
+    def sync_memory(docs: List[dict], deleted_term_ids: List[int], views: Dict[int, int]) -> None:
+        """Состояние процесса (автодополнение, поколение кэша) по изменениям, которые уже есть в индексе:
+        у каждого воркера оно свое, а индекс в базе обновляет один из них"""
+        for term_id in deleted_term_ids:
+            autocomplete_index.remove_term(term_id)
+        for doc in docs:
+            autocomplete_index.upsert(
+                term_id=doc["term_id"],
+                language=doc["language"],
+                title=doc["title"],
+                views=doc["views"],
+                visible=doc["status"] == "approved" and not doc["is_deleted"]
+            )
+        for term_id, count in views.items():
+            autocomplete_index.update_views(term_id, count)
+        # Просмотры поколение не меняют: кэш страниц не сбрасывается от каждого сброса просмотров,
+        # порядок по популярности догоняет реальный в пределах TTL кэша
+        if docs or deleted_term_ids:
+            index_generation.bump()
+    
+    def rebuild_index(self, batches: Iterable[List[dict]]) -> int:
+        """Строит индекс заново в теневых таблицах и атомарно подменяет ими рабочие"""
+        self.search_repo.create_shadow_tables()
+        
+        indexed = 0
+        try:
+            for docs in batches:
+                if not docs:
+                    continue
+                fts_rows, meta_rows = self._split_docs(docs)
+                self.search_repo.bulk_insert_fts(fts_rows, table="fts_terms_shadow")
+                self.search_repo.bulk_upsert_term_meta(meta_rows, table="term_meta_shadow")
+                self.db.commit()
+                indexed += len(docs)
+            
+            self.search_repo.optimize_fts("fts_terms_shadow")
+            self.search_repo.optimize_fts("fts_trigrams_shadow")
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self.search_repo.swap_shadow_tables()
+        index_generation.bump()
+        
+        if autocomplete_index.loaded:
+            autocomplete_index.load(self.db)
+        return indexed
+    
+    @staticmethod
+    def _split_docs(docs: List[dict]):
+        fts_rows = []
+        meta_rows = {}
+        for doc in docs:
+            fts_rows.append({
+                "term_id": doc["term_id"],
+                "language": doc["language"],
+                "title": doc["title"],
+                "definition": doc["definition"],
+                "short_definition": doc.get("short_definition") or "",
+                "examples": doc.get("examples") or "",
+                "synonyms": doc.get("synonyms") or "",
+                "tags_text": doc.get("tags_text") or "",
+                "category_text": doc.get("category_text") or ""
+            })
+            # term_meta одна на термин, а документов по числу переводов
+            meta_rows[doc["term_id"]] = {
+                "term_id": doc["term_id"],
+                "status": doc["status"],
+                "category_id": doc["category_id"],
+                "is_deleted": 1 if doc["is_deleted"] else 0,
+                "views": doc["views"],
+                "created_at": doc["created_at"]
+            }
+        return fts_rows, list(meta_rows.values())
@@ -2,8 +2,47 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from apps.search_service.app.repositories.search_repo import SearchRepository
 from apps.search_service.app.repositories.history_repo import HistoryRepository
-from apps.search_service.app.schemas.search import SearchHit, SearchRequestParams
-from libs.shared.shared.dto.pagination import PageResponse, PageMeta
+from apps.search_service.app.services.history_writer import history_writer
+from apps.search_service.app.services.indexing_service import index_generation
+from apps.search_service.app.schemas.search import (
+    SearchHit,
+    SearchRequestParams,
+    SearchPageMeta,
+    SearchPageResponse
+)
+from apps.search_service.app.core.config import settings
+from apps.search_service.app.core.pagination import encode_cursor, decode_cursor
+from libs.shared.shared.utils.cache import TTLCache
+
+_count_cache = TTLCache(
+    maxsize=settings.search_count_cache_size,
+    ttl_seconds=settings.search_count_cache_ttl_seconds
+)
+_result_cache = TTLCache(
+    maxsize=settings.search_result_cache_size,
+    ttl_seconds=settings.search_result_cache_ttl_seconds
+)
+
+
+def _query_key(params: SearchRequestParams) -> tuple:
+    # unicode61 не различает регистр и лишние пробелы, поэтому такие варианты запроса делят одну запись.
+    # Поколение индекса в ключе: после любой переиндексации старые записи просто перестают находиться
+    return (
+        index_generation.current,
+        " ".join(params.q.casefold().split()),
+        params.lang.value,
+        params.filters.category_id,
+        params.filters.letter,
+        params.filters.status
+    )
+
+
+def cache_stats() -> dict:
+    return {
+        "generation": index_generation.current,
+        "results": _result_cache.stats(),
+        "counts": _count_cache.stats()
+    }
 
 
 class SearchService:
@@ -16,18 +55,30 @@ class SearchService:
         self,
         params: SearchRequestParams,
         user_id: Optional[int] = None
-    ) -> PageResponse:
-        offset = (params.page - 1) * params.size
+    ) -> SearchPageResponse:
+        after = decode_cursor(params.cursor) if params.cursor else None
+        offset = (params.page - 1) * params.size if after is None else None
         
-        results = self.search_repo.search(
-            query=params.q,
-            language=params.lang.value,
-            category_id=params.filters.category_id,
-            letter=params.filters.letter,
-            status=params.filters.status,
-            limit=params.size,
-            offset=offset
-        )
+        page_key = _query_key(params) + (params.size, offset, after)
+        cached = _result_cache.get(page_key)
+        if cached is None:
+            results = self.search_repo.search(
+                query=params.q,
+                language=params.lang.value,
+                category_id=params.filters.category_id,
+                letter=params.filters.letter,
+                status=params.filters.status,
+                limit=params.size,
+                offset=offset or 0,
+                after=after
+            )
+            fuzzy = False
+            if not results and after is None and offset == 0 and settings.search_fuzzy_fallback:
+                results = self._fuzzy(params)
+                fuzzy = bool(results)
+            _result_cache.set(page_key, (results, fuzzy))
+        else:
+            results, fuzzy = cached
         
         hits = [
             SearchHit(
@@ -41,22 +92,68 @@ class SearchService:
             for r in results
         ]
         
-        total = len(results)
+        if fuzzy:
+            # Нечеткая выдача - одна страница лучших кандидатов, продолжения у нее нет
+            total = len(results)
+        else:
+            total = self._count(params, offset, len(results))
         pages = (total + params.size - 1) // params.size if total > 0 else 0
         
-        self.history_repo.create(
+        next_cursor = None
+        if len(results) == params.size and not fuzzy:
+            last = results[-1]
+            next_cursor = encode_cursor(float(last["rank"]), int(last["views"] or 0), int(last["term_id"]))
+        
+        history_writer.enqueue(
             user_id=user_id,
             query=params.q,
             lang=params.lang.value,
             filters=params.filters.model_dump()
         )
         
-        return PageResponse(
-            meta=PageMeta(
+        return SearchPageResponse(
+            meta=SearchPageMeta(
                 page=params.page,
                 size=params.size,
                 total=total,
-                pages=pages
+                pages=pages,
+                next_cursor=next_cursor,
+                fuzzy=fuzzy
             ),
             items=hits
         )
+    
+    def _fuzzy(self, params: SearchRequestParams) -> list:
+        return self.search_repo.fuzzy_search(
+            query=params.q,
+            language=params.lang.value,
+            category_id=params.filters.category_id,
+            letter=params.filters.letter,
+            status=params.filters.status,
+            limit=params.size,
+            candidate_cap=settings.search_fuzzy_candidate_cap,
+            max_trigrams=settings.search_fuzzy_max_trigrams,
+            max_postings=settings.search_fuzzy_max_postings
+        )
+    
+    def _count(self, params: SearchRequestParams, offset: Optional[int], page_len: int) -> int:
+        key = _query_key(params)
+        
+        # Неполная страница сама определяет точное количество, COUNT не нужен
+        # (в режиме курсора смещение неизвестно, поэтому только через COUNT)
+        if offset is not None and page_len < params.size and (page_len > 0 or offset == 0):
+            total = offset + page_len
+            _count_cache.set(key, total)
+            return total
+        
+        total = _count_cache.get(key)
+        if total is None:
+            total = self.search_repo.count(
+                query=params.q,
+                language=params.lang.value,
+                category_id=params.filters.category_id,
+                letter=params.filters.letter,
+                status=params.filters.status
+            )
+            _count_cache.set(key, total)
+        return total
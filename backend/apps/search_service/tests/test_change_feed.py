@@ -0,0 +1,214 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+# Модели dictionary_service нужны только фикстурам: потребитель читает журнал через OutboxReader
+from apps.dictionary_service.app.db.base import Base as DictionaryBase
+from apps.dictionary_service.app.db.models import Category, SearchOutbox, Term, TermTranslation
+from apps.dictionary_service.app.repositories.outbox_repo import OutboxRepository
+from apps.search_service.app.db.base import Base as SearchBase
+from apps.search_service.app.db.session import create_fts_table, create_term_meta_table, create_trigram_table
+from apps.search_service.app.repositories.change_feed_repo import ChangeFeedRepository
+from apps.search_service.app.services.change_feed import FEED_NAME, ChangeFeedConsumer
+from apps.search_service.app.services.indexing_service import IndexingService, index_generation
+from libs.shared.shared.feed.outbox import OP_DELETE, OP_UPSERT, OP_VIEWS
+
+
+@pytest.fixture
+def source(tmp_path):
+    """База dictionary_service с журналом search_outbox"""
+    url = f"sqlite:///{tmp_path / 'dictionary.db'}"
+    engine = create_engine(url)
+    DictionaryBase.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [{"id": 1, "slug": "family_law"}])
+    yield url, sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def search_sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    SearchBase.metadata.create_all(engine)
+    with engine.connect() as conn:
+        create_fts_table(conn)
+        create_trigram_table(conn)
+        create_term_meta_table(conn)
+        conn.commit()
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def add_terms(session_factory, term_ids, **fields):
+    db = session_factory()
+    db.execute(insert(Term), [
+        {"id": term_id, "slug": f"term-{term_id}", "category_id": 1, "status": "approved", "author_id": 1, **fields}
+        for term_id in term_ids
+    ])
+    db.execute(insert(TermTranslation), [
+        {"term_id": term_id, "language": "ru", "title": f"термин {term_id}", "definition": "определение"}
+        for term_id in term_ids
+    ])
+    db.commit()
+    db.close()
+
+
+def add_events(session_factory, term_ids, op):
+    db = session_factory()
+    OutboxRepository(db).add_many(term_ids, op)
+    db.commit()
+    db.close()
+
+
+def purge(session_factory, created_before=None) -> int:
+    db = session_factory()
+    try:
+        deleted = OutboxRepository(db).delete_expired(created_before or datetime.now(timezone.utc) + timedelta(hours=1), 1000)
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+def feed_position(session_factory) -> int:
+    db = session_factory()
+    try:
+        return ChangeFeedRepository(db).get_last_seq(FEED_NAME)
+    finally:
+        db.close()
+
+
+def outbox_size(session_factory) -> int:
+    db = session_factory()
+    try:
+        return db.query(SearchOutbox).count()
+    finally:
+        db.close()
+
+
+def indexed_terms(session_factory) -> set:
+    db = session_factory()
+    try:
+        return set(db.execute(text("SELECT term_id FROM term_meta WHERE is_deleted = 0")).scalars())
+    finally:
+        db.close()
+
+
+def test_views_only_batch_commits_position(source, search_sessions):
+    url, source_factory = source
+    # Просмотры терминов, которых уже нет в словаре: apply_views получает пустой словарь
+    add_events(source_factory, [101, 102], OP_VIEWS)
+    consumer = ChangeFeedConsumer(search_sessions, url, batch_size=100, poll_interval_ms=10)
+
+    assert consumer.poll_once() == 2
+    assert feed_position(search_sessions) == 2
+    assert consumer.poll_once() == 0
+
+
+def test_consumer_does_not_delete_outbox(source, search_sessions):
+    url, source_factory = source
+    add_terms(source_factory, [201, 202, 203])
+    add_events(source_factory, [201, 202, 203], OP_UPSERT)
+    add_events(source_factory, [201], OP_VIEWS)
+    consumer = ChangeFeedConsumer(search_sessions, url, batch_size=2, poll_interval_ms=10)
+
+    assert consumer.poll_once() == 2
+    assert consumer.poll_once() == 2
+    assert consumer.poll_once() == 0
+    # Журнал чистит только dictionary_service по сроку хранения
+    assert outbox_size(source_factory) == 4
+    assert feed_position(search_sessions) == 4
+    assert indexed_terms(search_sessions) == {201, 202, 203}
+
+
+def test_deleted_terms_leave_index(source, search_sessions):
+    url, source_factory = source
+    add_terms(source_factory, [301, 302])
+    add_events(source_factory, [301, 302], OP_UPSERT)
+    consumer = ChangeFeedConsumer(search_sessions, url, batch_size=100, poll_interval_ms=10)
+    consumer.poll_once()
+
+    db = source_factory()
+    db.query(Term).filter(Term.id == 302).update({"is_deleted": True})
+    OutboxRepository(db).add(302, OP_DELETE)
+    db.commit()
+    db.close()
+
+    assert consumer.poll_once() == 1
+    assert indexed_terms(search_sessions) == {301}
+
+
+def test_second_worker_syncs_memory_only(source, search_sessions, monkeypatch):
+    url, source_factory = source
+    add_terms(source_factory, [401, 402])
+    first = ChangeFeedConsumer(search_sessions, url, batch_size=100, poll_interval_ms=10)
+    second = ChangeFeedConsumer(search_sessions, url, batch_size=100, poll_interval_ms=10)
+    first.mark_memory_position()
+    second.mark_memory_position()
+
+    add_events(source_factory, [401, 402], OP_UPSERT)
+    assert first.poll_once() == 2
+
+    applied = []
+    monkeypatch.setattr(IndexingService, "apply_changes", lambda self, *args: applied.append(args))
+    generation = index_generation.current
+    # Индекс в базе уже обновлен: второй воркер не пишет его повторно, но догоняет свою память
+    assert second.poll_once() == 2
+    assert applied == []
+    assert index_generation.current > generation
+    assert second.stats()["memory_seq"] == 2
+    assert second.stats()["last_seq"] == 2
+    assert second.poll_once() == 0
+    assert feed_position(search_sessions) == 2
+
+
+def test_cursor_never_moves_back(search_sessions):
+    db = search_sessions()
+    repo = ChangeFeedRepository(db)
+    repo.set_last_seq(FEED_NAME, 10)
+    db.commit()
+    # Воркер, прочитавший более старую пачку, не возвращает позицию назад
+    repo.set_last_seq(FEED_NAME, 7)
+    db.commit()
+    db.close()
+    assert feed_position(search_sessions) == 10
+
+
+def test_purged_events_are_reported(source, search_sessions):
+    url, source_factory = source
+    add_terms(source_factory, [601, 602])
+    add_events(source_factory, [601], OP_UPSERT)
+    purge(source_factory)
+    add_events(source_factory, [602], OP_UPSERT)
+    consumer = ChangeFeedConsumer(search_sessions, url, batch_size=100, poll_interval_ms=10)
+
+    # Событие 1 удалено до того, как попало в индекс: потребитель сообщает о пропуске и идет дальше
+    assert consumer.poll_once() == 1
+    stats = consumer.stats()
+    assert stats["missed_events"] is True
+    assert stats["purged_seq"] == 1
+    assert stats["last_seq"] == 2
+    assert indexed_terms(search_sessions) == {602}
+
+
+def test_worker_behind_purge_reloads_memory(source, search_sessions, monkeypatch):
+    url, source_factory = source
+    add_terms(source_factory, [701, 702])
+    first = ChangeFeedConsumer(search_sessions, url, batch_size=100, poll_interval_ms=10)
+    second = ChangeFeedConsumer(search_sessions, url, batch_size=100, poll_interval_ms=10)
+    first.mark_memory_position()
+    second.mark_memory_position()
+
+    add_events(source_factory, [701, 702], OP_UPSERT)
+    first.poll_once()
+    purge(source_factory)
+
+    reloads = []
+    monkeypatch.setattr(ChangeFeedConsumer, "_reload_memory", staticmethod(lambda db, seq: reloads.append(seq) or seq))
+    # События применены первым воркером и удалены: второй перечитывает состояние из индекса, пропуска нет
+    assert second.poll_once() == 0
+    assert reloads == [2]
+    assert second.stats()["memory_seq"] == 2
+    assert second.stats()["missed_events"] is False
+    second.poll_once()
+    assert reloads == [2]
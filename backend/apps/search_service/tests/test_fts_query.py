@@ -0,0 +1,106 @@
+import random
+import pytest
+from sqlalchemy import create_engine, text
+from apps.search_service.app.core.fts_query import compile_match, compile_title_prefix
+from apps.search_service.app.db.session import create_fts_table
+
+MAX_TERMS = 8
+
+ADVERSARIAL = [
+    "",
+    "   ",
+    "\t\n",
+    '"',
+    '""',
+    '"насилие',
+    'насилие"',
+    '"насилие" "защита',
+    "*",
+    "**",
+    "н*",
+    "насилие*",
+    "*насилие",
+    "NEAR",
+    "NEAR(насилие защита, 50)",
+    "насилие NEAR/2 защита",
+    "AND",
+    "OR",
+    "NOT",
+    "насилие AND",
+    "OR насилие",
+    "NOT насилие",
+    "насилие AND NOT",
+    "насилие AND (защита OR",
+    "(((",
+    ")",
+    "()",
+    "^насилие",
+    "^",
+    "title:",
+    ":насилие",
+    "title:^насилие",
+    "foo:bar",
+    "title:foo:bar",
+    "tags:\"семья",
+    "{title}: насилие",
+    "- насилие + защита",
+    "зорлық-зомбылық",
+    "насилие, защита; семья.",
+    "' OR 1=1 --",
+    "a* b* c* d* e* f* g* h* i* j* k* l*",
+    " OR ".join(["насилие", "защита", "семья"] * 6),
+]
+FUZZ_ALPHABET = list("абвнасилиеқорғауviolence0123456789 \"*():^-+{}[],.;'") + [
+    " AND ", " OR ", " NOT ", " NEAR", "NEAR(", "title:", "tags:", "foo:"
+]
+
+
+@pytest.fixture(scope="module")
+def fts(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('search') / 'search.db'}")
+    with engine.begin() as conn:
+        create_fts_table(conn)
+        conn.execute(
+            text("INSERT INTO fts_terms (term_id, language, title, title_norm, definition, body_norm) VALUES (1, 'ru', :title, :title, :body, :body)"),
+            {"title": "насилие в семье", "body": "защита жертв насилия"}
+        )
+    conn = engine.connect()
+    yield conn
+    conn.close()
+    engine.dispose()
+
+
+def assert_valid(fts, expression):
+    # Выражение принимает настоящий FTS5: синтаксическая ошибка здесь - OperationalError
+    fts.execute(text("SELECT COUNT(*) FROM fts_terms WHERE fts_terms MATCH :q"), {"q": expression}).scalar()
+
+
+@pytest.mark.parametrize("morphology", [True, False])
+@pytest.mark.parametrize("raw", ADVERSARIAL)
+def test_adversarial_input_compiles_to_valid_match(fts, raw, morphology):
+    expression = compile_match(raw, "ru", max_terms=MAX_TERMS, morphology=morphology)
+    if not raw.strip() or raw.strip() in ('"', '""', "*", "**", "(((", ")", "()", "^"):
+        assert expression is None
+    if expression is not None:
+        assert_valid(fts, expression)
+        assert expression.count('"') <= 4 * MAX_TERMS
+
+    prefix = compile_title_prefix(raw, MAX_TERMS)
+    if prefix is not None:
+        assert_valid(fts, prefix)
+
+
+def test_random_input_compiles_to_valid_match(fts):
+    rnd = random.Random(5)
+    for _ in range(2000):
+        raw = "".join(rnd.choices(FUZZ_ALPHABET, k=rnd.randint(1, 40)))
+        for language in ("ru", "kz"):
+            expression = compile_match(raw, language, max_terms=MAX_TERMS)
+            if expression is not None:
+                assert expression.count('"') <= 4 * MAX_TERMS, raw
+                assert_valid(fts, expression)
+
+
+def test_operators_are_plain_words(fts):
+    # Операторы FTS5 в запросе ищутся как слова, а не меняют смысл выражения
+    assert compile_match("насилие OR защита", "ru", MAX_TERMS, morphology=False) == '"насилие" AND "or" AND "защита"*'
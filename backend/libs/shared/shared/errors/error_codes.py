@@ -11,3 +11,4 @@ class ErrorCode:
     EXPIRED_TOKEN = "EXPIRED_TOKEN"
     USER_EXISTS = "USER_EXISTS"
     INVALID_CREDENTIALS = "INVALID_CREDENTIALS"
+    SERVICE_UNAVAILABLE = "SERVICE_UNAVAILABLE"
@@ -53,3 +53,14 @@ class ConflictError(AppException):
             details,
             409
         )
+
+
+class ServiceUnavailableError(AppException):
+    def __init__(self, message: str = "Service temporarily unavailable", retry_after: int = 1):
+        super().__init__(
+            ErrorCode.SERVICE_UNAVAILABLE,
+            message,
+            {"retry_after": retry_after},
+            503
+        )
+        self.headers = {"Retry-After": str(retry_after)}
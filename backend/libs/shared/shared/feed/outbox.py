@@ -0,0 +1,172 @@
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import bindparam, text
+
+# Операции журнала search_outbox. Событие только называет термин: читатель берет его текущее состояние
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+# Изменилось только число просмотров: поиску достаточно обновить популярность, без переиндексации
+OP_VIEWS = "views"
+
+OUTBOX_STATE_NAME = "search_outbox"
+
+
+class OutboxEvent(NamedTuple):
+    seq: int
+    term_id: int
+    op: str
+    created_at: Optional[datetime]
+
+
+def humanize_slug(slug: str) -> str:
+    return slug.replace("-", " ").replace("_", " ")
+
+
+def _in(statement: str, *names: str):
+    return text(statement).bindparams(*(bindparam(name, expanding=True) for name in names))
+
+
+def _datetime(value) -> Optional[datetime]:
+    # SQLite отдает DateTime в обход ORM строкой
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+class OutboxReader:
+    """Журнал search_outbox и документы терминов для индекса из базы dictionary_service.
+    Читает таблицы запросами без моделей dictionary_service: схема ниже - контракт между
+    dictionary_service, который пишет журнал и чистит его по сроку хранения, и search_service,
+    который хранит свою позицию в журнале у себя"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_after(self, seq: int, limit: int) -> List[OutboxEvent]:
+        rows = self.db.execute(
+            text("SELECT seq, term_id, op, created_at FROM search_outbox WHERE seq > :seq ORDER BY seq LIMIT :limit"),
+            {"seq": seq, "limit": limit}
+        ).all()
+        return [OutboxEvent(row.seq, row.term_id, row.op, _datetime(row.created_at)) for row in rows]
+
+    def get_head_seq(self) -> int:
+        head = self.db.execute(text("SELECT MAX(seq) FROM search_outbox")).scalar()
+        if head is None:
+            # Журнал очищен целиком: последний выданный номер хранится в sqlite_sequence (AUTOINCREMENT)
+            head = self.db.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'search_outbox'")).scalar()
+        return head or 0
+
+    def get_purged_seq(self) -> int:
+        """Наибольший номер, удаленный очисткой по сроку хранения: позиция ниже него пропустила события"""
+        purged = self.db.execute(
+            text("SELECT purged_seq FROM search_outbox_state WHERE name = :name"),
+            {"name": OUTBOX_STATE_NAME}
+        ).scalar()
+        return purged or 0
+
+    def get_documents(self, term_ids: List[int]) -> Tuple[List[dict], List[int]]:
+        """Документы живых терминов и id терминов, которых в индексе быть не должно (удалены или не найдены)"""
+        if not term_ids:
+            return [], []
+        terms = self.db.execute(
+            _in("SELECT id, category_id, status, is_deleted, views, created_at FROM terms WHERE id IN :ids", "ids"),
+            {"ids": term_ids}
+        ).all()
+        live = [term for term in terms if not term.is_deleted]
+        live_ids = {term.id for term in live}
+        return self._documents(live), [term_id for term_id in term_ids if term_id not in live_ids]
+
+    def iter_documents(self, batch_size: int = 1000) -> Iterator[List[dict]]:
+        # Keyset по id вместо OFFSET: каждая пачка читается по индексу за O(batch_size)
+        last_id = 0
+        while True:
+            terms = self.db.execute(
+                text(
+                    "SELECT id, category_id, status, is_deleted, views, created_at FROM terms "
+                    "WHERE id > :last_id AND is_deleted = 0 ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size}
+            ).all()
+            if not terms:
+                return
+            yield self._documents(terms)
+            last_id = terms[-1].id
+
+    def get_views(self, term_ids: List[int]) -> Dict[int, int]:
+        if not term_ids:
+            return {}
+        rows = self.db.execute(_in("SELECT id, views FROM terms WHERE id IN :ids", "ids"), {"ids": term_ids}).all()
+        return {row.id: row.views for row in rows}
+
+    def _documents(self, terms) -> List[dict]:
+        """Документы индекса по одному на каждый перевод термина"""
+        if not terms:
+            return []
+        term_ids = [term.id for term in terms]
+        translations: Dict[int, list] = {}
+        for row in self.db.execute(
+            _in(
+                "SELECT term_id, language, title, definition, short_definition, examples, synonyms "
+                "FROM term_translations WHERE term_id IN :ids ORDER BY id",
+                "ids"
+            ),
+            {"ids": term_ids}
+        ):
+            translations.setdefault(row.term_id, []).append(row)
+
+        tags: Dict[int, List[str]] = {}
+        for row in self.db.execute(
+            _in(
+                "SELECT term_tags.term_id, tags.slug FROM term_tags JOIN tags ON tags.id = term_tags.tag_id "
+                "WHERE term_tags.term_id IN :ids ORDER BY tags.id",
+                "ids"
+            ),
+            {"ids": term_ids}
+        ):
+            tags.setdefault(row.term_id, []).append(humanize_slug(row.slug))
+
+        category_ids = list({term.category_id for term in terms if term.category_id is not None})
+        categories: Dict[int, Tuple[str, List[tuple]]] = {}
+        if category_ids:
+            for row in self.db.execute(_in("SELECT id, slug FROM categories WHERE id IN :ids", "ids"), {"ids": category_ids}):
+                categories[row.id] = (row.slug, [])
+            for row in self.db.execute(
+                _in("SELECT category_id, language, title FROM category_translations WHERE category_id IN :ids ORDER BY id", "ids"),
+                {"ids": category_ids}
+            ):
+                categories[row.category_id][1].append((row.language, row.title))
+
+        docs = []
+        for term in terms:
+            created_at = _datetime(term.created_at)
+            tags_text = " ".join(tags.get(term.id, []))
+            category = categories.get(term.category_id)
+            for trans in translations.get(term.id, []):
+                docs.append({
+                    "term_id": term.id,
+                    "language": trans.language,
+                    "title": trans.title,
+                    "definition": trans.definition,
+                    "short_definition": trans.short_definition,
+                    "examples": trans.examples,
+                    "synonyms": trans.synonyms,
+                    "tags_text": tags_text,
+                    "category_text": category_text(category, trans.language),
+                    "status": term.status,
+                    "category_id": term.category_id,
+                    "is_deleted": bool(term.is_deleted),
+                    "views": term.views,
+                    "created_at": created_at.isoformat() if created_at else ""
+                })
+        return docs
+
+
+def category_text(category: Optional[Tuple[str, List[tuple]]], language: str) -> str:
+    """Название категории на языке перевода, при его отсутствии все доступные названия"""
+    if category is None:
+        return ""
+    slug, translations = category
+    titles = [title for lang, title in translations if lang == language]
+    if not titles:
+        titles = [title for _, title in translations]
+    return " ".join(titles + [humanize_slug(slug)])
@@ -0,0 +1,96 @@
+import json
+import logging
+import threading
+import time
+import urllib.request
+from typing import Callable, Dict, Optional
+from jose import JWTError, jwk, jwt
+from jose.exceptions import JOSEError
+
+logger = logging.getLogger(__name__)
+
+# Токены доступа подписывает только auth_service закрытым ключом; HS256 здесь не принимается
+ALGORITHMS = ["RS256"]
+
+
+def fetch_jwks(url: str, timeout_seconds: float = 5.0) -> Callable[[], dict]:
+    def fetch() -> dict:
+        with urllib.request.urlopen(url, timeout=timeout_seconds) as response:
+            return json.load(response)
+
+    return fetch
+
+
+class JWKSKeySet:
+    """Открытые ключи подписи auth_service по kid. Загружаются при старте сервиса (try_load в startup);
+    токен с неизвестным kid - ключ после ротации - перечитывает JWKS, но не чаще min_refresh_seconds,
+    иначе токены с выдуманным kid превращались бы в поток запросов к auth_service.
+    Раз в max_age_seconds набор обновляется, чтобы выведенные из оборота ключи переставали действовать"""
+
+    def __init__(
+        self,
+        fetch: Callable[[], dict],
+        min_refresh_seconds: float = 60.0,
+        max_age_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._fetch = fetch
+        self._min_refresh = min_refresh_seconds
+        self._max_age = max_age_seconds
+        self._clock = clock
+        self._keys: Dict[str, object] = {}
+        self._loaded_at: Optional[float] = None
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def load(self) -> None:
+        keys = {}
+        for data in self._fetch().get("keys", []):
+            if data.get("kty") != "RSA" or data.get("use", "sig") != "sig" or not data.get("kid"):
+                continue
+            keys[data["kid"]] = jwk.construct(data, data.get("alg", ALGORITHMS[0]))
+        # Ключи собираются заранее: разбор JWK на каждый токен дороже самой проверки подписи
+        self._keys = keys
+        self._loaded_at = self._clock()
+        self.loads += 1
+
+    def try_load(self) -> bool:
+        """load() без исключений: недоступный auth_service не роняет сервис, остаются прежние ключи"""
+        try:
+            self.load()
+            return True
+        except (OSError, ValueError, JOSEError) as e:
+            logger.warning("Failed to load JWKS: %s", e)
+            return False
+
+    def get(self, kid: str) -> Optional[object]:
+        key = self._keys.get(kid)
+        now = self._clock()
+        stale = self._loaded_at is None or now - self._loaded_at >= self._max_age
+        if key is None or stale:
+            with self._lock:
+                refresh = now >= self._next_refresh
+                if refresh:
+                    self._next_refresh = now + self._min_refresh
+            if refresh:
+                self.try_load()
+                key = self._keys.get(kid)
+        return key
+
+    def decode(self, token: str) -> dict:
+        """Payload токена с проверенной подписью и сроком или {} - как decode_token auth_service"""
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except JWTError:
+            return {}
+        key = self.get(kid) if kid else None
+        if key is None:
+            return {}
+        try:
+            return jwt.decode(token, key, algorithms=ALGORITHMS)
+        except JWTError:
+            return {}
+
+    def kids(self) -> list:
+        return sorted(self._keys)
@@ -1,9 +1,16 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class TokenClaims(BaseModel):
+    # Один объект отдается из кэша многим запросам: неизменяемый
+    model_config = ConfigDict(frozen=True)
+
     sub: str
-    role: str
+    role: str = "user"
     exp: Optional[int] = None
     iat: Optional[int] = None
+
+    @property
+    def user_id(self) -> int:
+        return int(self.sub)
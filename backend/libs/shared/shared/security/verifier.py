@@ -0,0 +1,66 @@
+import time
+from typing import Callable, Optional
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import ValidationError
+from libs.shared.shared.security.jwt_claims import TokenClaims
+from libs.shared.shared.utils.cache import TTLCache
+
+_bearer = HTTPBearer(auto_error=False)
+_required_bearer = HTTPBearer()
+
+
+class ClaimsVerifier:
+    """Проверка access-токенов: подпись и срок проверяются один раз на токен,
+    результат хранится в LRU до exp токена. decode возвращает payload или {} для неверного токена"""
+
+    def __init__(self, decode: Callable[[str], dict], maxsize: int = 4096, clock: Callable[[], float] = time.time):
+        self._decode = decode
+        self._clock = clock
+        self.cache = TTLCache(maxsize=maxsize)
+
+    def verify(self, token: str) -> Optional[TokenClaims]:
+        claims = self.cache.get(token)
+        if claims is not None:
+            return claims
+
+        payload = self._decode(token)
+        # У refresh-токена и токенов из писем есть type: для доступа к API они не годятся
+        if not payload or payload.get("type") or not str(payload.get("sub", "")).isdigit():
+            return None
+        try:
+            claims = TokenClaims(**payload)
+        except ValidationError:
+            return None
+
+        if claims.exp is not None:
+            ttl = claims.exp - self._clock()
+            if ttl > 0:
+                self.cache.set(token, claims, ttl_seconds=ttl)
+        return claims
+
+
+def verified_claims(verifier: ClaimsVerifier, required: bool = False) -> Callable:
+    """Dependency с проверенными claims токена из Authorization: Bearer.
+    Без required - None для запроса без токена или с неверным токеном, с required - 401.
+    FastAPI вызывает одну dependency один раз за запрос, поэтому производные
+    (id пользователя, роль) должны зависеть от нее, а не проверять токен сами"""
+
+    if required:
+        def get_current_claims(credentials: HTTPAuthorizationCredentials = Depends(_required_bearer)) -> TokenClaims:
+            claims = verifier.verify(credentials.credentials)
+            if claims is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid authentication credentials"
+                )
+            return claims
+    else:
+        def get_current_claims(
+            credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer)
+        ) -> Optional[TokenClaims]:
+            if not credentials:
+                return None
+            return verifier.verify(credentials.credentials)
+
+    return get_current_claims
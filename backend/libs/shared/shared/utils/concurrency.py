@@ -0,0 +1,7 @@
+import anyio.to_thread
+
+
+def configure_threadpool(size: int) -> None:
+    """Размер пула потоков, в котором FastAPI выполняет синхронные обработчики и зависимости.
+    Вызывается из startup: лимитер anyio привязан к работающему event loop"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = size
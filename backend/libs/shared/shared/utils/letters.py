@@ -0,0 +1,50 @@
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+# Алфавиты для навигации по буквам. Ё в словарях идет вместе с Е и в списке не выделяется
+ALPHABETS: Dict[str, str] = {
+    "ru": "АБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ",
+    "kz": "АӘБВГҒДЕЖЗИЙКҚЛМНҢОӨПРСТУҰҮФХҺЦЧШЩЪЫІЬЭЮЯ",
+    "en": "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+}
+
+# Латинские буквы, которые в кириллических словах набирают вместо похожих кириллических
+_CYRILLIC_LOOKALIKES = str.maketrans({
+    "A": "А", "B": "В", "C": "С", "E": "Е", "H": "Н", "K": "К", "M": "М",
+    "O": "О", "P": "Р", "T": "Т", "X": "Х", "Y": "У", "I": "І",
+})
+_FOLD = str.maketrans({"Ё": "Е"})
+NUMERIC = "#"
+
+
+def first_letter(title: Optional[str], language: Optional[str] = None) -> Optional[str]:
+    """Буква, под которой термин показывается в алфавитном указателе: первая буква заголовка
+    в верхнем регистре после NFC. Кавычки, скобки и пробелы в начале пропускаются,
+    заголовки с цифры попадают под NUMERIC"""
+    if not title:
+        return None
+    title = unicodedata.normalize("NFC", title)
+    for char in title:
+        if char.isdigit():
+            return NUMERIC
+        if not char.isalpha():
+            continue
+        letter = char.upper().translate(_FOLD)
+        # Латиница заменяется только в словах с кириллицей: "Cистема" - под С, а "CRM" - под C
+        if language in ("ru", "kz") and letter.isascii() and _has_cyrillic(title):
+            replaced = letter.translate(_CYRILLIC_LOOKALIKES)
+            # В русском алфавите нет І
+            if language == "kz" or replaced != "І":
+                letter = replaced
+        return letter
+    return None
+
+
+def _has_cyrillic(text: str) -> bool:
+    return any("\u0400" <= char <= "\u04ff" for char in text)
+
+
+def sort_letters(letters: Iterable[str], language: str) -> List[str]:
+    """Порядок букв по алфавиту языка; буквы не из алфавита - в конце по коду символа"""
+    alphabet = ALPHABETS.get(language, "")
+    return sorted(letters, key=lambda letter: (alphabet.find(letter) if letter in alphabet else len(alphabet), letter))
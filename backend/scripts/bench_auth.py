@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк проверки access-токена на запрос
+Использование:
+  python scripts/bench_auth.py [--requests 2000] [--rounds 5]
+
+Сравнивает прежние dependencies (HS256 decode_token в каждой: get_current_user_id и
+get_current_user_role проверяли подпись дважды, get_current_user в auth_service
+еще и загружал пользователя) с общими verified_claims, кэшем проверенных токенов и
+проверкой RS256 по JWKS, который сервис получает от auth_service по HTTP.
+Проверяет ротацию ключей и отказ для чужих ключей и HS256, измеряет время импорта
+сервисов и проверяет, что они больше не загружают модули apps.auth_service.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Временные база и ключи до импорта настроек сервисов; JWKS отдает локальный HTTP-сервер
+_tmp = tempfile.mkdtemp(prefix="bench_auth_")
+_jwks_server = ThreadingHTTPServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'auth.db')}"
+os.environ["JWT_KEYS_DIR"] = os.path.join(_tmp, "keys")
+os.environ["JWT_KEY_ACTIVATION_SECONDS"] = "2"
+os.environ["AUTH_JWKS_URL"] = f"http://127.0.0.1:{_jwks_server.server_address[1]}/.well-known/jwks.json"
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.testclient import TestClient
+from jose import JWTError, jwt
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from apps.auth_service.app.core.config import settings
+from apps.auth_service.app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    signing_keys
+)
+from apps.auth_service.app.db.models.user import User
+from apps.auth_service.app.db.session import SessionLocal, engine, get_db, init_db
+from apps.auth_service.app.main import app as auth_app
+from apps.auth_service.app.repositories.user_repo import UserRepository
+from apps.auth_service.app.services.user_service import UserService
+from apps.dictionary_service.app.api.v1.deps import get_current_user_id, get_current_user_role
+from apps.dictionary_service.app.core.security import claims_verifier, jwks
+from libs.shared.shared.security.verifier import ClaimsVerifier
+
+
+class JWKSHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps(signing_keys.jwks()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def legacy_decode(token: str) -> dict:
+    # Прежняя проверка: общий секрет HS256 во всех сервисах
+    try:
+        return jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    except JWTError:
+        return {}
+
+
+def legacy_token(payload: dict) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
+    return jwt.encode({**payload, "exp": expire, "iat": datetime.now(timezone.utc)}, settings.secret_key, algorithm="HS256")
+
+
+def legacy_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+) -> Optional[int]:
+    if not credentials:
+        return None
+    payload = legacy_decode(credentials.credentials)
+    if not payload or "sub" not in payload:
+        return None
+    return int(payload["sub"])
+
+
+def legacy_user_role(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+) -> Optional[str]:
+    if not credentials:
+        return None
+    payload = legacy_decode(credentials.credentials)
+    if not payload:
+        return None
+    return payload.get("role", "user")
+
+
+def legacy_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
+    db: Session = Depends(get_db)
+):
+    payload = legacy_decode(credentials.credentials)
+    if not payload or "sub" not in payload:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+    user = UserRepository(db).get_by_id(int(payload["sub"]))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return user
+
+
+app = FastAPI()
+
+
+@app.get("/none")
+def no_auth():
+    return {}
+
+
+@app.get("/legacy")
+def legacy(user_id: Optional[int] = Depends(legacy_user_id), role: Optional[str] = Depends(legacy_user_role)):
+    return {"user_id": user_id, "role": role}
+
+
+@app.get("/claims")
+def claims(user_id: Optional[int] = Depends(get_current_user_id), role: Optional[str] = Depends(get_current_user_role)):
+    return {"user_id": user_id, "role": role}
+
+
+@auth_app.get("/bench/profile-legacy")
+def profile_legacy(current_user: User = Depends(legacy_current_user), db: Session = Depends(get_db)):
+    return {"user": UserService(db).get_profile(current_user.id)}
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def check_verifier(token: str, user_id: int) -> None:
+    verifier = ClaimsVerifier(decode_token, maxsize=16)
+    claims = verifier.verify(token)
+    assert claims is not None and claims.user_id == user_id and claims.role == "user", claims
+    assert verifier.verify(token) is claims and verifier.cache.hits == 1
+    # Refresh-токен подписан тем же ключом, но для доступа к API не годится
+    assert verifier.verify(create_refresh_token({"sub": str(user_id), "role": "user"})) is None
+    assert verifier.verify("not-a-token") is None
+    # Запись живет не дольше exp; jose сравнивает exp с точностью до секунды, поэтому ждем с запасом
+    short = create_access_token({"sub": str(user_id), "role": "user"}, expires_delta=timedelta(seconds=2))
+    assert verifier.verify(short) is not None
+    time.sleep(2.0)
+    assert verifier.cache.get(short) is None, "cache entry outlived exp"
+    time.sleep(1.1)
+    assert verifier.verify(short) is None, "expired token accepted"
+    print("verifier checks passed")
+
+
+def check_jwks(user_id: int) -> None:
+    payload = {"sub": str(user_id), "role": "user"}
+    first_kid = jwt.get_unverified_header(create_access_token(payload))["kid"]
+    assert jwks.try_load() and jwks.kids() == [first_kid], jwks.kids()
+    loads = jwks.loads
+
+    # Ротация: новый ключ сразу в JWKS, подписывать начинает после jwt_key_activation_seconds
+    new_kid = signing_keys.generate()
+    assert new_kid in [key["kid"] for key in signing_keys.jwks()["keys"]]
+    old_token = create_access_token(payload)
+    assert jwt.get_unverified_header(old_token)["kid"] == first_kid
+    time.sleep(settings.jwt_key_activation_seconds + 0.1)
+    new_token = create_access_token(payload)
+    assert jwt.get_unverified_header(new_token)["kid"] == new_kid
+    # Сервис не знает new_kid: одна перезагрузка JWKS, после нее проходят оба токена
+    assert claims_verifier.verify(new_token).user_id == user_id
+    assert claims_verifier.verify(old_token).user_id == user_id
+    assert jwks.loads == loads + 1, jwks.loads
+
+    # Выдуманные kid не вызывают новых загрузок: следующая не раньше min_refresh_seconds
+    foreign = rsa.generate_private_key(public_exponent=65537, key_size=2048).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    expire = datetime.now(timezone.utc) + timedelta(minutes=5)
+    for i in range(200):
+        forged = jwt.encode({**payload, "exp": expire}, foreign, algorithm="RS256", headers={"kid": f"forged-{i}"})
+        assert claims_verifier.verify(forged) is None
+    assert jwks.loads == loads + 1, jwks.loads
+    # Чужой ключ с настоящим kid и HS256 с секретом из настроек не принимаются
+    assert claims_verifier.verify(jwt.encode({**payload, "exp": expire}, foreign, algorithm="RS256", headers={"kid": new_kid})) is None
+    assert claims_verifier.verify(jwt.encode({**payload, "exp": expire}, settings.secret_key, algorithm="HS256", headers={"kid": new_kid})) is None
+    print(f"jwks checks passed: rotation {first_kid} -> {new_kid}, {jwks.loads} JWKS loads")
+
+
+def timed(client: TestClient, path: str, tokens: list, rounds: int) -> float:
+    # Лучшее среднее из нескольких проходов: на общей машине шум TestClient больше разницы.
+    # Кэш токенов очищается перед проходом, чтобы разные токены всегда были промахами
+    client.get(path, headers={"Authorization": f"Bearer {tokens[0]}"}).raise_for_status()
+    best = float("inf")
+    for _ in range(rounds):
+        claims_verifier.cache.clear()
+        started = time.perf_counter()
+        for value in tokens:
+            client.get(path, headers={"Authorization": f"Bearer {value}"})
+        best = min(best, (time.perf_counter() - started) / len(tokens) * 1000)
+    return best
+
+
+def import_time(module: str, rounds: int) -> tuple:
+    # Отдельный процесс на каждый замер: импорт целиком, как при старте контейнера
+    code = f"import sys, time; t = time.perf_counter(); import {module}; " \
+        "print(time.perf_counter() - t, sum(name.startswith('apps.auth_service') for name in sys.modules))"
+    best, auth_modules = float("inf"), 0
+    for _ in range(rounds):
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, check=True, capture_output=True, text=True,
+            env={**os.environ, "PYTHONPATH": BACKEND_DIR}
+        ).stdout.split()
+        best, auth_modules = min(best, float(output[0])), int(output[1])
+    return best * 1000, auth_modules
+
+
+def main(args) -> None:
+    _jwks_server.RequestHandlerClass = JWKSHandler
+    threading.Thread(target=_jwks_server.serve_forever, daemon=True).start()
+
+    init_db()
+    db = SessionLocal()
+    user = User(name="bench", email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    check_jwks(user_id)
+    token = create_access_token({"sub": str(user_id), "role": "user"})
+    check_verifier(token, user_id)
+
+    old = legacy_token({"sub": str(user_id), "role": "user"})
+    for label, fn, value in (
+        ("HS256 decode (legacy)", legacy_decode, old),
+        ("RS256 decode via JWKS", jwks.decode, token),
+        ("cached verify", claims_verifier.verify, token),
+    ):
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            fn(value)
+        print(f"  {label:<34} {(time.perf_counter() - started) / args.requests * 1e6:7.1f} us")
+
+    payload = {"sub": str(user_id), "role": "user"}
+    # Разные токены: каждый запрос - промах кэша, одна проверка подписи вместо двух
+    cases = (
+        ("same token, HS256 twice", "/legacy", [old] * args.requests),
+        ("same token, verified_claims", "/claims", [token] * args.requests),
+        ("distinct tokens, HS256 twice", "/legacy", [legacy_token({**payload, "n": i}) for i in range(args.requests)]),
+        ("distinct tokens, verified_claims", "/claims", [create_access_token({**payload, "n": i}) for i in range(args.requests)]),
+    )
+    client = TestClient(app)
+    base = timed(client, "/none", [token] * args.requests, args.rounds)
+    print(f"{args.requests} requests x best of {args.rounds}, auth overhead = latency - /none ({base:.3f} ms):")
+    for label, path, tokens in cases:
+        latency = timed(client, path, tokens, args.rounds)
+        print(f"  {label:<34} {latency:7.3f} ms/request   overhead {latency - base:6.3f} ms")
+
+    counter = QueryCounter()
+    auth_client = TestClient(auth_app)
+    for label, path, value in (("GET /profile, legacy", "/bench/profile-legacy", old), ("GET /profile, verified_claims", "/api/v1/profile", token)):
+        auth_client.get(path, headers={"Authorization": f"Bearer {value}"}).raise_for_status()
+        counter.count = 0
+        latency = timed(auth_client, path, [value] * args.requests, 1)
+        print(f"  {label:<34} {latency:7.3f} ms/request   queries {counter.count / args.requests:.0f}")
+
+    print("import time, best of 5 fresh processes:")
+    for module in ("apps.dictionary_service.app.main", "apps.import_export_service.app.main", "apps.admin_service.app.main"):
+        elapsed, auth_modules = import_time(module, 5)
+        print(f"  {module:<40} {elapsed:7.1f} ms   apps.auth_service modules loaded: {auth_modules}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="auth overhead per request")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки dictionary_service на синтетическом словаре
+Использование:
+  python scripts/bench_dictionary.py list [--terms 20000]
+  python scripts/bench_dictionary.py detail [--terms 20000]
+  python scripts/bench_dictionary.py views [--terms 20000]
+  python scripts/bench_dictionary.py writes [--terms 20000]
+  python scripts/bench_dictionary.py bulk [--terms 20000] [--bulk 10000]
+  python scripts/bench_dictionary.py browse [--terms 500000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# База бенчмарка создается во временной директории до импорта настроек сервиса
+_bench_dir = tempfile.mkdtemp(prefix="bench_dictionary_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_bench_dir, 'dictionary_service.db')}"
+
+from sqlalchemy import event, func, insert
+from apps.dictionary_service.app.db.migrations import composite_indexes
+from apps.dictionary_service.app.db.session import SessionLocal, engine, init_db
+from apps.dictionary_service.app.db.models import Category, Favorite, SearchOutbox, Tag, Term, TermRevision, TermTag, TermTranslation
+from apps.dictionary_service.app.repositories.favorite_repo import FavoriteRepository
+from apps.dictionary_service.app.repositories.term_repo import TermRepository
+from apps.dictionary_service.app.db.models.term import TermStatus
+from apps.dictionary_service.app.schemas.term import TermCreateRequest, TermUpdateRequest
+from apps.dictionary_service.app.services import moderation_service as moderation_service_module
+from apps.dictionary_service.app.services import term_cache as term_cache_module
+from apps.dictionary_service.app.services import term_service as term_service_module
+from apps.dictionary_service.app.services.term_cache import InProcessBackend, RedisBackend, TermCache
+from apps.dictionary_service.app.services.term_service import TermService, letter_counts_cache
+from apps.dictionary_service.app.services.view_counter import ViewCounter
+from libs.shared.shared.dto.language import Lang
+from libs.shared.shared.utils.letters import first_letter
+
+LANGUAGES = ["ru", "kz", "en"]
+CATEGORIES = 20
+# Большая часть словаря одобрена, остальное на модерации и в черновиках
+STATUSES = [TermStatus.approved, TermStatus.pending, TermStatus.draft, TermStatus.rejected]
+STATUS_WEIGHTS = [85, 5, 8, 2]
+WORDS = ["насилие", "защита", "право", "семья", "помощь", "жертва", "угроза", "контроль", "зорлық", "отбасы", "көмек"]
+
+
+class QueryCounter:
+    """Считает SQL-запросы и commit, выполненные через engine"""
+
+    def __init__(self):
+        self.count = 0
+        self.commits = 0
+
+    def __enter__(self):
+        self.count = 0
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._on_execute)
+        event.remove(engine, "commit", self._on_commit)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+
+class PlanCapture:
+    """Запоминает выполненные SELECT с параметрами, чтобы получить их EXPLAIN QUERY PLAN"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+    def plans(self) -> list:
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            return [
+                " | ".join(row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall())
+                for statement, parameters in self.statements
+            ]
+        finally:
+            connection.close()
+
+
+def populate(terms: int, seed: int = 42) -> None:
+    rnd = random.Random(seed)
+    db = SessionLocal()
+    db.execute(insert(Category), [{"id": 1, "slug": "general"}] + [{"id": i, "slug": f"category-{i}"} for i in range(2, CATEGORIES + 1)])
+    db.execute(insert(Tag), [{"id": i, "slug": f"tag-{i}"} for i in range(1, 51)])
+
+    term_rows, translation_rows, tag_rows = [], [], []
+    for term_id in range(1, terms + 1):
+        term_rows.append({
+            "id": term_id,
+            "slug": f"term-{term_id}",
+            "category_id": rnd.randint(1, CATEGORIES),
+            "status": rnd.choices(STATUSES, weights=STATUS_WEIGHTS)[0],
+            "author_id": 1,
+            "views": rnd.randint(0, 5000)
+        })
+        # Часть терминов без русского перевода: проверяется цепочка резервных языков
+        for language in rnd.sample(LANGUAGES, rnd.randint(1, 3)):
+            title = " ".join(rnd.sample(WORDS, 2)) + f" {term_id}"
+            translation_rows.append({
+                "term_id": term_id,
+                "language": language,
+                "title": title,
+                "first_letter": first_letter(title, language),
+                "definition": " ".join(rnd.choices(WORDS, k=20)),
+                "short_definition": title
+            })
+        for tag_id in rnd.sample(range(1, 51), rnd.randint(0, 4)):
+            tag_rows.append({"term_id": term_id, "tag_id": tag_id})
+
+    db.execute(insert(Term), term_rows)
+    db.execute(insert(TermTranslation), translation_rows)
+    db.execute(insert(TermTag), tag_rows)
+    db.commit()
+    db.close()
+
+
+def measure(fn, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    }
+
+
+def report(label: str, result: dict, queries: int) -> None:
+    print(f"  {label:<40} {queries:5d} queries   median {result['median_ms']:9.3f} ms   p95 {result['p95_ms']:9.3f} ms")
+
+
+def use_cache(cache: TermCache) -> TermCache:
+    # Сервисы импортируют синглтон term_cache по имени, подменяем ссылку в каждом модуле
+    for module in (term_cache_module, term_service_module, moderation_service_module):
+        module.term_cache = cache
+    return cache
+
+
+def bench_list(args) -> None:
+    # Сравнивается стоимость построения карточек, кэш get_term выключен
+    use_cache(TermCache(None))
+
+    def per_row(service: TermService, lang: Lang, size: int, offset: int):
+        # Прежний GET /terms: страница через get_all и get_term на каждую строку
+        terms = service.term_repo.get_all(limit=size, offset=offset)
+        return [service.get_term(term.id, lang) for term in terms]
+
+    def batched(service: TermService, lang: Lang, size: int, offset: int):
+        return service.list_terms(lang, limit=size, offset=offset)
+
+    # Число запросов и совпадение с get_term проверяются в apps/dictionary_service/tests/test_list_terms.py
+    for size in (20, 100):
+        offset = args.terms // 2
+        print(f"page size {size}:")
+        for lang in (Lang.ru, Lang.kz):
+            for label, fn in (("per-row get_term", per_row), ("list_terms", batched)):
+                db = SessionLocal()
+                service = TermService(db)
+                with QueryCounter() as counter:
+                    fn(service, lang, size, offset)
+                queries = counter.count
+                db.close()
+
+                def run():
+                    session = SessionLocal()
+                    fn(TermService(session), lang, size, offset)
+                    session.close()
+
+                report(f"{label} ({lang.value})", measure(run, args.repeat), queries)
+
+
+def bench_detail(args) -> None:
+    # Популярность карточек по Ципфу: небольшая доля терминов получает большую часть просмотров
+    rnd = random.Random(9)
+    ids = list(range(1, args.terms + 1))
+    weights = [1 / rank for rank in ids]
+    stream = [(term_id, rnd.choice([Lang.ru, Lang.kz])) for term_id in rnd.choices(ids, weights=weights, k=max(args.repeat * 250, 5000))]
+
+    def run_stream():
+        db = SessionLocal()
+        service = TermService(db)
+        for term_id, lang in stream:
+            service.get_term(term_id, lang)
+            # Как в обработчике: одна сессия на запрос
+            db.expunge_all()
+        db.close()
+
+    backends = [("off", None), ("memory", InProcessBackend(10000, 300.0))]
+    try:
+        backends.append(("redis", RedisBackend(os.environ.get("TERM_CACHE_REDIS_URL", "redis://localhost:6379/0"), 300.0)))
+        backends[-1][1].get("ping")
+    except Exception as e:
+        print(f"  redis backend skipped: {e}")
+        backends = backends[:2]
+
+    print(f"{len(stream)} GET /terms/{{id}} lookups, Zipf over {args.terms} terms:")
+    for label, backend in backends:
+        cache = use_cache(TermCache(backend))
+        if backend is not None:
+            # Карточки прошлых запусков (общий Redis) становятся недоступны
+            cache.invalidate(ids[:2000])
+
+        started = time.perf_counter()
+        run_stream()
+        elapsed = time.perf_counter() - started
+        stats = cache.stats()
+        print(
+            f"  {label:<8} {len(stream) / elapsed:9.0f} lookups/s   mean {elapsed / len(stream) * 1000:7.3f} ms"
+            f"   hit ratio {stats['hit_ratio']:.2f}"
+        )
+
+    # Инвалидация после записи проверяется в apps/dictionary_service/tests/test_term_cache.py
+
+
+def bench_views(args) -> None:
+    rnd = random.Random(4)
+    ids = list(range(1, args.terms + 1))
+    views = rnd.choices(ids, weights=[1 / rank for rank in ids], k=max(args.repeat * 100, 2000))
+    workers = 8
+
+    def total_views() -> int:
+        db = SessionLocal()
+        try:
+            return db.query(func.sum(Term.views)).scalar()
+        finally:
+            db.close()
+
+    def per_view_commit(term_id: int) -> None:
+        # Прежний increment_views: загрузка строки и commit на каждый просмотр
+        db = SessionLocal()
+        try:
+            term = db.query(Term).filter(Term.id == term_id, Term.is_deleted == False).first()
+            term.views += 1
+            db.commit()
+        finally:
+            db.close()
+
+    counter = ViewCounter(SessionLocal, flush_interval_ms=1000, max_pending=1000)
+
+    print(f"{len(views)} anonymous views, Zipf over {args.terms} terms, {workers} threads:")
+    for label, record in (("commit per view", per_view_commit), ("ViewCounter.hit", counter.hit)):
+        before = total_views()
+        counter.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(record, views))
+        elapsed = time.perf_counter() - started
+        counter.stop()
+        # commit per view теряет просмотры: два потока читают одно значение и пишут одно и то же +1
+        lost = len(views) - (total_views() - before)
+        print(f"  {label:<20} {len(views) / elapsed:10.0f} views/s   lost {lost}")
+
+    stats = counter.stats()
+    db = SessionLocal()
+    events = db.query(func.count(SearchOutbox.seq)).filter(SearchOutbox.op == "views").scalar()
+    db.close()
+    print(f"  flushes {stats['batches']}, outbox views events {events} for {len(set(views))} distinct terms")
+
+
+def legacy_create(db, data: TermCreateRequest, author_id: int) -> None:
+    # Прежний create_term: commit и refresh после термина, каждого перевода и каждого нового тега
+    if db.query(Term).filter(Term.slug == data.slug, Term.is_deleted == False).first():
+        raise AssertionError("slug exists")
+    term = Term(slug=data.slug, category_id=data.category_id, author_id=author_id, status=TermStatus.draft)
+    db.add(term)
+    db.commit()
+    db.refresh(term)
+    for trans in data.translations:
+        translation = TermTranslation(term_id=term.id, **{**trans.model_dump(), "language": trans.language.value})
+        db.add(translation)
+        db.commit()
+        db.refresh(translation)
+    for tag_slug in data.tag_slugs:
+        tag = db.query(Tag).filter(Tag.slug == tag_slug).first()
+        if not tag:
+            tag = Tag(slug=tag_slug)
+            db.add(tag)
+            db.commit()
+            db.refresh(tag)
+        term.tags.append(tag)
+    db.add(SearchOutbox(term_id=term.id, op="upsert"))
+    db.commit()
+    TermService(db).get_term(term.id, data.translations[0].language)
+
+
+def legacy_update(db, term_id: int, data: TermUpdateRequest) -> None:
+    # Прежний update_term: отдельные commit у update, ревизии, каждого перевода и нового тега
+    term = db.query(Term).filter(Term.id == term_id, Term.is_deleted == False).first()
+    term.slug = data.slug
+    db.commit()
+    db.refresh(term)
+    db.add(TermRevision(term_id=term_id, user_id=term.author_id, old_data_json="{}"))
+    db.commit()
+    for trans in data.translations:
+        translation = db.query(TermTranslation).filter(
+            TermTranslation.term_id == term_id,
+            TermTranslation.language == trans.language.value
+        ).first()
+        if translation:
+            translation.title, translation.definition = trans.title, trans.definition
+        else:
+            db.add(TermTranslation(term_id=term_id, **{**trans.model_dump(), "language": trans.language.value}))
+        db.commit()
+    term.tags.clear()
+    for tag_slug in data.tag_slugs:
+        tag = db.query(Tag).filter(Tag.slug == tag_slug).first()
+        if not tag:
+            tag = Tag(slug=tag_slug)
+            db.add(tag)
+            db.commit()
+            db.refresh(tag)
+        term.tags.append(tag)
+    db.add(SearchOutbox(term_id=term_id, op="upsert"))
+    db.commit()
+    TermService(db).get_term(term_id, Lang.ru)
+
+
+def bench_writes(args) -> None:
+    use_cache(TermCache(None))
+    rnd = random.Random(17)
+    count = max(args.repeat * 10, 200)
+    workers = 8
+
+    def create_request(label: str, index: int) -> TermCreateRequest:
+        # Три перевода, четыре тега: два существующих и два новых
+        return TermCreateRequest(
+            slug=f"{label}-{index}",
+            category_id=1,
+            translations=[
+                {"language": language, "title": " ".join(rnd.sample(WORDS, 2)), "definition": " ".join(rnd.choices(WORDS, k=20))}
+                for language in LANGUAGES
+            ],
+            tag_slugs=[f"tag-{rnd.randint(1, 50)}", f"tag-{rnd.randint(1, 50)}", f"{label}-tag-{index}-a", f"{label}-tag-{index}-b"]
+        )
+
+    def update_request(label: str, index: int) -> TermUpdateRequest:
+        return TermUpdateRequest(
+            slug=f"{label}-updated-{index}",
+            translations=[{"language": language, "title": f"{label} {index} {language}", "definition": "обновлено"} for language in LANGUAGES],
+            tag_slugs=[f"tag-{rnd.randint(1, 50)}", f"{label}-utag-{index}"]
+        )
+
+    def new_create(db, data: TermCreateRequest, author_id: int) -> None:
+        TermService(db).create_term(data, author_id)
+
+    def new_update(db, term_id: int, data: TermUpdateRequest) -> None:
+        TermService(db).update_term(term_id, data, Lang.ru)
+
+    variants = (("legacy", legacy_create, legacy_update), ("unit of work", new_create, new_update))
+    print(f"{count} creates and updates per variant, 3 translations and 4 tags each:")
+    for label, create, update_fn in variants:
+        key = label.replace(" ", "")
+        # Запросы и commit на одну операцию
+        db = SessionLocal()
+        with QueryCounter() as counter:
+            create(db, create_request(f"{key}-probe", 0), 1)
+        create_stats = (counter.count, counter.commits)
+        probe_id = db.query(Term.id).filter(Term.slug == f"{key}-probe-0").scalar()
+        with QueryCounter() as counter:
+            update_fn(db, probe_id, update_request(f"{key}-probe", 0))
+        update_stats = (counter.count, counter.commits)
+        db.close()
+
+        index = iter(range(1, count * 10))
+
+        def run_create():
+            session = SessionLocal()
+            create(session, create_request(f"{key}-seq", next(index)), 1)
+            session.close()
+
+        result = measure(run_create, count)
+        report(f"{label} create ({create_stats[1]} commits)", result, create_stats[0])
+
+        update_ids = iter(range(1, count * 10))
+
+        def run_update():
+            session = SessionLocal()
+            term_id = next(update_ids)
+            update_fn(session, term_id, update_request(f"{key}-seq", term_id))
+            session.close()
+
+        result = measure(run_update, count)
+        report(f"{label} update ({update_stats[1]} commits)", result, update_stats[0])
+
+        # Параллельные редакторы: каждый commit берет блокировку записи SQLite
+        errors = []
+
+        def concurrent_create(i: int):
+            session = SessionLocal()
+            try:
+                create(session, create_request(f"{key}-par", i), 1)
+            except Exception as e:
+                errors.append(e)
+                session.rollback()
+            finally:
+                session.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(concurrent_create, range(count)))
+        elapsed = time.perf_counter() - started
+        print(f"  {label + f' create, {workers} threads':<40} {count / elapsed:9.0f} creates/s   errors {len(errors)}")
+
+    # Результат нового create_term совпадает с тем, что читает get_term
+    db = SessionLocal()
+    service = TermService(db)
+    created = service.create_term(create_request("check", 0), 1)
+    db.expunge_all()
+    assert service.get_term(created.id, Lang.ru) == created, "create_term output differs from get_term"
+    tags = db.query(Tag).filter(Tag.slug.like("check-tag-%")).count()
+    assert tags == 2, f"expected 2 new tags, got {tags}"
+    db.close()
+    print("single-commit and output checks passed")
+
+
+def bench_bulk(args) -> None:
+    use_cache(TermCache(None))
+    rnd = random.Random(18)
+
+    def glossary(label: str, size: int) -> list:
+        return [
+            TermCreateRequest(
+                slug=f"{label}-{i}",
+                category_id=1,
+                translations=[
+                    {"language": language, "title": " ".join(rnd.sample(WORDS, 2)), "definition": " ".join(rnd.choices(WORDS, k=20))}
+                    for language in LANGUAGES
+                ],
+                tag_slugs=[f"tag-{rnd.randint(1, 50)}", f"{label}-tag-{i % 500}"]
+            )
+            for i in range(size)
+        ]
+
+    # Прежний путь: POST /terms на каждый термин, измеряется на части и экстраполируется
+    sample = glossary("single", min(500, args.bulk))
+    db = SessionLocal()
+    service = TermService(db)
+    started = time.perf_counter()
+    for item in sample:
+        service.create_term(item, 1)
+        db.expunge_all()
+    per_term = (time.perf_counter() - started) / len(sample)
+    db.close()
+    print(f"  {'create_term per item':<28} {per_term * 1000:7.2f} ms/term   ~{per_term * args.bulk:6.1f} s for {args.bulk}")
+
+    items = glossary("bulk", args.bulk)
+    # Ошибочные элементы: существующий slug, повтор в запросе, неизвестная категория
+    items[1] = items[1].model_copy(update={"slug": "term-1"})
+    items[2] = items[2].model_copy(update={"slug": items[0].slug})
+    items[3] = items[3].model_copy(update={"category_id": 999})
+    db = SessionLocal()
+    with QueryCounter() as counter:
+        started = time.perf_counter()
+        result = TermService(db).create_terms_bulk(items, 1)
+        elapsed = time.perf_counter() - started
+    db.close()
+    print(
+        f"  {'create_terms_bulk':<28} {elapsed / args.bulk * 1000:7.2f} ms/term   {elapsed:7.1f} s for {args.bulk}"
+        f"   {counter.count} queries, {counter.commits} commit"
+    )
+
+    assert result.created == args.bulk - 3 and result.failed == 3, result.failed
+    assert [r.index for r in result.results if r.error] == [1, 2, 3]
+    db = SessionLocal()
+    created_ids = [r.id for r in result.results if r.id]
+    translations = db.query(func.count(TermTranslation.id)).filter(TermTranslation.term_id.in_(created_ids[:500])).scalar()
+    events = db.query(func.count(SearchOutbox.seq)).filter(SearchOutbox.term_id.in_(created_ids[:500])).scalar()
+    card = TermService(db).get_term(created_ids[-1], Lang.kz)
+    db.close()
+    assert translations == 500 * len(LANGUAGES) and events == 500, (translations, events)
+    assert card.slug == items[-1].slug and len(card.tags) == 2, card
+    print("partial-failure and content checks passed")
+
+
+def bench_browse(args) -> None:
+    use_cache(TermCache(None))
+    rnd = random.Random(19)
+    users = 2000
+    db = SessionLocal()
+    db.execute(insert(Favorite), [
+        {"user_id": user_id, "term_id": term_id}
+        for user_id in range(1, users + 1)
+        for term_id in rnd.sample(range(1, args.terms + 1), 50)
+    ])
+    db.commit()
+    db.close()
+
+    offset = 1000
+    # Сценарий: (название, вызов, индекс, который должен быть в плане основного запроса)
+    scenarios = [
+        ("list status+category", lambda db: TermService(db).list_terms(Lang.ru, category_id=7, status=TermStatus.approved, offset=offset), "ix_terms_live_status_category"),
+        # Только статус: одноколоночный индекс уже упорядочен по rowid, отдельный составной не нужен
+        ("list status", lambda db: TermService(db).list_terms(Lang.ru, status=TermStatus.pending, offset=offset), "ix_terms_status"),
+        ("list category", lambda db: TermService(db).list_terms(Lang.ru, category_id=7, offset=offset), "ix_terms_live_category"),
+        ("count status+category", lambda db: TermRepository(db).count(category_id=7, status=TermStatus.approved), "ix_terms_live_status_category"),
+        ("browse letter", lambda db: TermService(db).list_terms(Lang.ru, letter="з", offset=offset), "ix_term_translations_language_letter"),
+        # Буква, на которую нет слов: без индекса просматривается весь словарь
+        ("browse rare letter", lambda db: TermService(db).list_terms(Lang.kz, letter="ө"), "ix_term_translations_language_letter"),
+        # Указатель без кэша: агрегат по индексу (language, first_letter)
+        ("letter counts", lambda db: (letter_counts_cache.clear(), TermService(db).get_letter_counts(Lang.kz)), "ix_term_translations_language_letter"),
+        ("favorites page", lambda db: FavoriteRepository(db).get_user_favorites(users // 2, limit=20, offset=20), "ix_favorites_user_created"),
+    ]
+    new_indexes = [
+        "ix_terms_live_status_category",
+        "ix_terms_live_category",
+        "ix_term_translations_language_letter",
+        "ix_favorites_user_created"
+    ]
+
+    def run_all(label: str) -> dict:
+        results = {}
+        print(f"{label}:")
+        for name, fn, _ in scenarios:
+            def run():
+                session = SessionLocal()
+                fn(session)
+                session.close()
+            result = measure(run, args.repeat)
+            results[name] = result
+            print(f"  {name:<24} median {result['median_ms']:9.3f} ms   p95 {result['p95_ms']:9.3f} ms")
+        return results
+
+    # База в прежней схеме: без составных индексов, но со статистикой планировщика
+    with engine.begin() as conn:
+        for name in new_indexes:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        conn.exec_driver_sql("ANALYZE")
+    before = run_all("single-column indexes")
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        composite_indexes.upgrade(conn)
+    print(f"migration: {time.perf_counter() - started:.1f}s")
+    with engine.begin() as conn:
+        composite_indexes.upgrade(conn)
+    after = run_all("composite indexes")
+
+    print("speedup:")
+    for name, _, _ in scenarios:
+        print(f"  {name:<24} x{before[name]['median_ms'] / after[name]['median_ms']:.1f}")
+
+    # Планы основных запросов; их проверка - в apps/dictionary_service/tests/test_composite_indexes.py
+    for name, fn, _ in scenarios:
+        db = SessionLocal()
+        with PlanCapture() as capture:
+            fn(db)
+        db.close()
+        print(f"  {name:<24} {capture.plans()[0]}")
+
+    db = SessionLocal()
+    service = TermService(db)
+    letter_counts_cache.clear()
+    counts = service.get_letter_counts(Lang.kz)
+    cached = measure(lambda: service.get_letter_counts(Lang.kz), args.repeat)
+    print(f"  {'letter counts (cached)':<24} median {cached['median_ms']:9.3f} ms   {[(c.letter, c.count) for c in counts[:5]]}")
+    db.close()
+
+
+BENCHMARKS = {
+    "list": bench_list,
+    "detail": bench_detail,
+    "views": bench_views,
+    "writes": bench_writes,
+    "bulk": bench_bulk,
+    "browse": bench_browse,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="dictionary_service benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--terms", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--bulk", type=int, default=10_000)
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    populate(args.terms)
+    print(f"Created {args.terms} synthetic terms in {time.perf_counter() - started:.1f}s ({_bench_dir})")
+
+    BENCHMARKS[args.benchmark](args)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк ограничения частоты запросов auth_service
+Использование:
+  python scripts/bench_rate_limit.py [--keys 1000000] [--workers 4]
+
+Память при большом числе разных ключей (смена IP) у прежнего RateLimiter и GCRA в памяти,
+скорость проверки и общий лимит для нескольких процессов через SQLite.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.auth_service.app.core.rate_limit import MemoryBackend, RatePolicy, SQLiteBackend
+
+
+class LegacyRateLimiter:
+    """Прежний RateLimiter: список datetime на ключ, ключи не удаляются"""
+
+    def __init__(self):
+        self._requests = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, policy: RatePolicy) -> bool:
+        with self._lock:
+            now = datetime.now()
+            if key not in self._requests:
+                self._requests[key] = []
+            window_start = now - timedelta(seconds=policy.period_seconds)
+            self._requests[key] = [req_time for req_time in self._requests[key] if req_time > window_start]
+            if len(self._requests[key]) >= policy.limit:
+                return False
+            self._requests[key].append(now)
+            return True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def churn(limiter, keys: int, policy: RatePolicy, clock: FakeClock = None) -> dict:
+    # Каждый ключ - новый IP с одним запросом; часы идут на 1 мс за запрос
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i in range(keys):
+        if clock is not None:
+            clock.now += 0.001
+        limiter.hit(f"login:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}:{i >> 24}", policy)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"rate": keys / elapsed, "current_mb": current / 2 ** 20, "peak_mb": peak / 2 ** 20}
+
+
+def check_gcra() -> None:
+    clock = FakeClock()
+    backend = MemoryBackend(max_keys=100, clock=clock)
+    policy = RatePolicy(limit=5, period_seconds=60)
+    results = [backend.hit("ip", policy).allowed for _ in range(6)]
+    assert results == [True] * 5 + [False], results
+    denied = backend.hit("ip", policy)
+    assert abs(denied.retry_after - 12.0) < 1e-9, denied
+    clock.now += 12.0
+    assert backend.hit("ip", policy).allowed and not backend.hit("ip", policy).allowed
+    # Ключ, у которого TAT в прошлом, удаляется при следующих вызовах
+    clock.now += 3600
+    backend.hit("other", policy)
+    backend.hit("other", policy)
+    assert backend.stats()["keys"] == 1, backend.stats()
+
+
+def sqlite_worker(url: str, hits: int, queue) -> None:
+    backend = SQLiteBackend(url, evict_interval_seconds=60)
+    policy = RatePolicy(limit=100, period_seconds=3600)
+    queue.put(sum(backend.hit("shared", policy).allowed for _ in range(hits)))
+
+
+def main(args) -> None:
+    check_gcra()
+    print("GCRA checks passed")
+
+    policy = RatePolicy(limit=5, period_seconds=300)
+    print(f"{args.keys} distinct keys, one request each:")
+    legacy = churn(LegacyRateLimiter(), args.keys, policy)
+    print(f"  {'legacy list per key':<34} {legacy['rate']:9.0f} checks/s   memory {legacy['current_mb']:7.1f} MB")
+    # Окно 5 минут: ключи не успевают истечь, память держит предел max_keys
+    clock = FakeClock()
+    capped = churn(MemoryBackend(max_keys=100_000, clock=clock), args.keys, policy, clock)
+    print(f"  {'GCRA memory, max_keys 100k':<34} {capped['rate']:9.0f} checks/s   memory {capped['current_mb']:7.1f} MB")
+    # Окно 10 секунд: истекшие ключи вытесняются по ходу, до предела не доходит
+    clock = FakeClock()
+    backend = MemoryBackend(max_keys=args.keys, clock=clock)
+    short = churn(backend, args.keys, RatePolicy(limit=5, period_seconds=10), clock)
+    print(
+        f"  {'GCRA memory, 10 s window':<34} {short['rate']:9.0f} checks/s   memory {short['current_mb']:7.1f} MB"
+        f"   live keys {backend.stats()['keys']}"
+    )
+    assert capped["current_mb"] < legacy["current_mb"] / 5, "memory backend is not bounded"
+
+    directory = tempfile.mkdtemp(prefix="bench_rate_limit_")
+    url = f"sqlite:///{os.path.join(directory, 'rate_limits.db')}"
+    backend = SQLiteBackend(url, evict_interval_seconds=60)
+    started = time.perf_counter()
+    count = 5000
+    for i in range(count):
+        backend.hit(f"login:{i}", policy)
+    print(f"  {'GCRA sqlite':<34} {count / (time.perf_counter() - started):9.0f} checks/s")
+
+    # Несколько процессов делят один лимит: всего пропущено ровно limit запросов
+    queue = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=sqlite_worker, args=(url, 100, queue)) for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    allowed = sum(queue.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    print(f"  {args.workers} processes x 100 requests against limit 100: allowed {allowed}")
+    assert allowed == 100, allowed
+    print("shared limit check passed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="auth_service rate limiter benchmark")
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    main(parser.parse_args())
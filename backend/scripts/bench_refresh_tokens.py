@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк обновления refresh-токенов auth_service на большой таблице refresh_tokens
+Использование:
+  python scripts/bench_refresh_tokens.py [--rows 10000000] [--refreshes 2000] [--purge-seconds 30]
+
+В таблице rows исторических токенов (истекших, отозванных и живых), как после долгой работы без очистки.
+Прежняя схема - токен целиком в уникальной колонке, поиск по строке, отзыв и выдача нового токена
+в двух транзакциях; новая - jti и sha256 токена, одна транзакция. Затем пакетная очистка новой таблицы.
+Проверяется и миграция прежней таблицы: старые токены после нее продолжают обновляться.
+"""
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Временные база и ключи подписи до импорта настроек сервиса
+_tmp = tempfile.mkdtemp(prefix="bench_refresh_tokens_")
+NEW_DB = os.path.join(_tmp, "auth.db")
+LEGACY_DB = os.path.join(_tmp, "auth_legacy.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{NEW_DB}"
+os.environ["JWT_KEYS_DIR"] = os.path.join(_tmp, "keys")
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+from jose import jwt
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from apps.auth_service.app.core.config import settings
+from apps.auth_service.app.core.security import create_access_token, create_refresh_token, decode_token
+from apps.auth_service.app.db.migrations import refresh_token_hash
+from apps.auth_service.app.db.models.refresh_token import RefreshToken
+from apps.auth_service.app.db.session import SessionLocal, engine, init_db
+from apps.auth_service.app.repositories.token_repo import TokenRepository
+from apps.auth_service.app.repositories.user_repo import UserRepository
+from apps.auth_service.app.services.auth_service import AuthService
+from apps.auth_service.app.services.token_purger import TokenPurger
+
+BATCH = 100000
+LegacyBase = declarative_base()
+# Длина настоящего refresh-токена RS256 с kid
+TOKEN_LENGTH = len(create_refresh_token({"sub": "1", "role": "user"}))
+
+LEGACY_DDL = """
+CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR(150) NOT NULL, email VARCHAR(255) NOT NULL, password_hash VARCHAR(255) NOT NULL,
+    role VARCHAR(20) NOT NULL, is_email_verified BOOLEAN NOT NULL, created_at DATETIME, updated_at DATETIME);
+CREATE TABLE refresh_tokens (id INTEGER NOT NULL, user_id INTEGER NOT NULL, token VARCHAR(500) NOT NULL, is_revoked BOOLEAN NOT NULL,
+    expires_at DATETIME NOT NULL, created_at DATETIME, PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES users (id));
+"""
+LEGACY_INDEXES = (
+    "CREATE INDEX ix_refresh_tokens_id ON refresh_tokens (id)",
+    "CREATE UNIQUE INDEX ix_refresh_tokens_token ON refresh_tokens (token)",
+)
+
+
+def fake_token(i: int) -> str:
+    # Содержимое не важно для базы, важны длина и случайный порядок ключей в индексе
+    return (hashlib.sha256(str(i).encode()).hexdigest() * 16)[:TOKEN_LENGTH]
+
+
+def stored(moment: datetime) -> str:
+    # Так SQLAlchemy пишет DateTime в SQLite
+    return moment.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def history(rows: int):
+    """(id, expires_at, created_at, is_revoked): 80% истекли, 15% отозваны, 5% живые"""
+    now = datetime.now(timezone.utc)
+    rng = random.Random(42)
+    for i in range(1, rows + 1):
+        created = now - timedelta(days=365 * (rows - i) / rows, seconds=rng.random())
+        expires = created + timedelta(days=settings.refresh_token_expire_days)
+        kind = rng.random()
+        if kind >= 0.8:
+            # Отозванные и живые еще не истекли
+            expires = now + timedelta(days=settings.refresh_token_expire_days * rng.random())
+        yield i, stored(min(expires, now) if kind < 0.8 else expires), stored(created), int(0.8 <= kind < 0.95)
+
+
+def bulk_connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF; PRAGMA cache_size=-1000000;")
+    return conn
+
+
+def fill(conn: sqlite3.Connection, insert: str, rows, label: str) -> None:
+    started = time.perf_counter()
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH:
+            conn.executemany(insert, batch)
+            conn.commit()
+            batch = []
+    if batch:
+        conn.executemany(insert, batch)
+        conn.commit()
+    print(f"  {label:<10} rows written in {time.perf_counter() - started:6.1f}s", flush=True)
+
+
+def populate_legacy(rows: int) -> None:
+    conn = bulk_connect(LEGACY_DB)
+    conn.executescript(LEGACY_DDL)
+    conn.execute("INSERT INTO users VALUES (1, 'bench', 'bench@example.com', '-', 'user', 0, NULL, NULL)")
+    fill(
+        conn,
+        "INSERT INTO refresh_tokens VALUES (?, 1, ?, ?, ?, ?)",
+        ((i, fake_token(i), revoked, expires, created) for i, expires, created, revoked in history(rows)),
+        "legacy"
+    )
+    # Индексы строятся после вставки: так в разы быстрее, чем вставка в готовый индекс
+    started = time.perf_counter()
+    for ddl in LEGACY_INDEXES:
+        conn.execute(ddl)
+    conn.execute("ANALYZE")
+    conn.close()
+    print(f"  {'legacy':<10} indexes built in {time.perf_counter() - started:6.1f}s", flush=True)
+
+
+def populate_new(rows: int) -> None:
+    init_db()
+    # Соединение пула после init_db помнит схему с индексами, которые здесь удаляются
+    engine.dispose()
+    conn = bulk_connect(NEW_DB)
+    names = [name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'refresh_tokens' AND sql IS NOT NULL")]
+    for name in names:
+        conn.execute(f"DROP INDEX {name}")
+    conn.execute("INSERT INTO users (id, name, email, password_hash, role, is_email_verified) VALUES (1, 'bench', 'bench@example.com', '-', 'user', 0)")
+    fill(
+        conn,
+        "INSERT INTO refresh_tokens VALUES (?, 1, ?, ?, ?, ?, ?)",
+        ((i, uuid.uuid4().hex, RefreshToken.hash(fake_token(i)), revoked, expires, created) for i, expires, created, revoked in history(rows)),
+        "new"
+    )
+    conn.close()
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        for index in RefreshToken.__table__.indexes:
+            index.create(connection)
+        connection.exec_driver_sql("ANALYZE")
+    print(f"  {'new':<10} indexes built in {time.perf_counter() - started:6.1f}s", flush=True)
+
+
+def file_mb(path: str) -> float:
+    return os.path.getsize(path) / 1024 / 1024
+
+
+def summary(latency: list) -> str:
+    latency = sorted(latency)
+    return f"p50 {statistics.median(latency):7.2f} ms   p99 {latency[int(len(latency) * 0.99)]:7.2f} ms"
+
+
+def issue(count: int) -> list:
+    # Настоящие подписанные токены для измерения
+    return [create_refresh_token({"sub": "1", "role": "user", "jti": uuid.uuid4().hex}) for _ in range(count)]
+
+
+class LegacyRefreshToken(LegacyBase):
+    """Прежняя модель: токен целиком в уникальной колонке"""
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    token = Column(String(500), unique=True, nullable=False, index=True)
+    is_revoked = Column(Boolean, default=False, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class LegacyTokenRepository:
+    """Прежний TokenRepository: каждый метод делает свой commit"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, user_id: int, token: str, expires_at: datetime) -> LegacyRefreshToken:
+        refresh_token = LegacyRefreshToken(user_id=user_id, token=token, expires_at=expires_at)
+        self.db.add(refresh_token)
+        self.db.commit()
+        self.db.refresh(refresh_token)
+        return refresh_token
+
+    def get_by_token(self, token: str) -> Optional[LegacyRefreshToken]:
+        return self.db.query(LegacyRefreshToken).filter(
+            LegacyRefreshToken.token == token,
+            LegacyRefreshToken.is_revoked == False,
+            LegacyRefreshToken.expires_at > datetime.now(timezone.utc)
+        ).first()
+
+    def revoke_token(self, token: str) -> None:
+        refresh_token = self.db.query(LegacyRefreshToken).filter(LegacyRefreshToken.token == token).first()
+        if refresh_token:
+            refresh_token.is_revoked = True
+            self.db.commit()
+
+
+def legacy_refresh(db: Session, refresh_token: str) -> str:
+    """Прежний AuthService.refresh_tokens"""
+    token_repo = LegacyTokenRepository(db)
+    token_data = decode_token(refresh_token)
+    assert token_data.get("type") == "refresh"
+    stored_token = token_repo.get_by_token(refresh_token)
+    assert stored_token is not None
+    user = UserRepository(db).get_by_id(stored_token.user_id)
+    create_access_token(data={"sub": str(user.id), "role": user.role})
+    new_refresh_token = create_refresh_token(data={"sub": str(user.id), "role": user.role})
+    refresh_expires = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+    token_repo.revoke_token(refresh_token)
+    token_repo.create(user.id, new_refresh_token, refresh_expires)
+    return new_refresh_token
+
+
+def bench_refresh(tokens: list) -> tuple:
+    legacy_db = sessionmaker(bind=create_engine(f"sqlite:///{LEGACY_DB}"))()
+    db = SessionLocal()
+    expires = datetime.now(timezone.utc) + timedelta(days=7)
+    legacy_db.add_all(LegacyRefreshToken(user_id=1, token=token, expires_at=expires) for token in tokens)
+    legacy_db.commit()
+    db.add_all(
+        RefreshToken(user_id=1, jti=decode_token(token)["jti"], token_hash=RefreshToken.hash(token), expires_at=expires)
+        for token in tokens
+    )
+    db.commit()
+
+    # Схемы чередуются, чтобы шум машины доставался обеим поровну
+    legacy, new = [], []
+    for token in tokens:
+        started = time.perf_counter()
+        legacy_refresh(legacy_db, token)
+        legacy.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        AuthService(db).refresh_tokens(token)
+        new.append((time.perf_counter() - started) * 1000)
+    legacy_db.close()
+    db.close()
+    return legacy, new
+
+
+def bench_purge(seconds: float, batch_size: int) -> None:
+    """Те же пачки, что у TokenPurger, с замером каждой: пока идет пачка, запись в базу ждет"""
+    db = SessionLocal()
+    before = db.query(RefreshToken).count()
+    repo = TokenRepository(db)
+    now = datetime.now(timezone.utc)
+    deadline = time.perf_counter() + seconds
+    durations = []
+    deleted = 0
+    for delete_batch in (lambda: repo.delete_expired(now, batch_size), lambda: repo.delete_revoked(batch_size)):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            count = delete_batch()
+            db.commit()
+            durations.append((time.perf_counter() - started) * 1000)
+            deleted += count
+            if count < batch_size:
+                break
+    elapsed = sum(durations) / 1000
+    db.close()
+    print(f"  purge: {deleted:,} of {before:,} rows in {elapsed:.1f}s ({deleted / elapsed:,.0f} rows/s), batch of {batch_size}: {summary(durations)}")
+
+
+def check_migration(rows: int) -> None:
+    # Прежняя таблица с живыми токенами HS256 без jti: после миграции и очистки они обновляются по хэшу
+    path = os.path.join(_tmp, "auth_migrate.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_DDL)
+    for ddl in LEGACY_INDEXES:
+        conn.execute(ddl)
+    conn.executemany(
+        "INSERT INTO users VALUES (?, 'bench', ?, '-', 'user', 0, NULL, NULL)",
+        [(user_id, f"bench{user_id}@example.com") for user_id in (1, 2, 3)]
+    )
+    # До перехода на RS256 токены подписывались secret_key
+    legacy_tokens = [
+        jwt.encode({
+            "sub": str(user_id),
+            "role": "user",
+            "exp": datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days),
+            "iat": datetime.now(timezone.utc),
+            "type": "refresh"
+        }, settings.secret_key, algorithm=settings.algorithm)
+        for user_id in (1, 2, 3)
+    ]
+    conn.executemany(
+        "INSERT INTO refresh_tokens (user_id, token, is_revoked, expires_at) VALUES (?, ?, 0, ?)",
+        [(user_id, token, stored(datetime.now(timezone.utc) + timedelta(days=7))) for user_id, token in zip((1, 2, 3), legacy_tokens)]
+    )
+    conn.executemany(
+        "INSERT INTO refresh_tokens (user_id, token, is_revoked, expires_at) VALUES (1, ?, ?, ?)",
+        [(fake_token(i), i % 2, stored(datetime.now(timezone.utc) - timedelta(seconds=i))) for i in range(rows)]
+    )
+    conn.commit()
+    conn.close()
+
+    migrate_engine = create_engine(f"sqlite:///{path}")
+    started = time.perf_counter()
+    with migrate_engine.begin() as connection:
+        refresh_token_hash.upgrade(connection)
+    elapsed = time.perf_counter() - started
+    session_factory = sessionmaker(bind=migrate_engine)
+    purged = TokenPurger(session_factory, 0, settings.refresh_token_purge_batch_size).purge()
+    session = session_factory()
+    for token in legacy_tokens:
+        AuthService(session).refresh_tokens(token)
+    left = session.query(RefreshToken).filter(RefreshToken.is_revoked == False).count()
+    session.close()
+    # Корректность миграции и очистки проверяется в apps/auth_service/tests/test_refresh_tokens.py
+    print(f"  migration of {rows + 3:,} legacy rows: {elapsed:.1f}s, purge removed {purged:,}, {left} live tokens after refresh")
+
+
+def main(args) -> None:
+    print(f"{args.rows:,} historical refresh tokens, token length {TOKEN_LENGTH}")
+    populate_legacy(args.rows)
+    populate_new(args.rows)
+    print(f"  file size: legacy {file_mb(LEGACY_DB):8.0f} MB   new {file_mb(NEW_DB):8.0f} MB")
+
+    tokens = issue(args.refreshes)
+    for token in tokens[:50]:
+        decode_token(token)
+    legacy, new = bench_refresh(tokens)
+    print(f"  refresh, legacy (token lookup, 2 commits): {summary(legacy)}")
+    print(f"  refresh, new (jti lookup, 1 commit):       {summary(new)}")
+
+    bench_purge(args.purge_seconds, settings.refresh_token_purge_batch_size)
+    check_migration(args.migration_rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="auth_service refresh token benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--refreshes", type=int, default=2000)
+    parser.add_argument("--purge-seconds", type=float, default=30.0)
+    parser.add_argument("--migration-rows", type=int, default=100000)
+    try:
+        main(parser.parse_args())
+    finally:
+        # На 10M строк обе базы занимают больше 16 ГБ
+        shutil.rmtree(_tmp, ignore_errors=True)
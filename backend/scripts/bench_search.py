@@ -0,0 +1,664 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки search_service на синтетическом индексе
+Использование:
+  python scripts/bench_search.py count [--rows 200000]
+  python scripts/bench_search.py cursor [--rows 200000]
+  python scripts/bench_search.py history [--rows 200000]
+  python scripts/bench_search.py autocomplete [--rows 200000]
+  python scripts/bench_search.py reindex [--rows 500000]
+  python scripts/bench_search.py denormalized [--rows 200000]
+  python scripts/bench_search.py resultcache [--rows 200000]
+  python scripts/bench_search.py morphology [--rows 100000]
+  python scripts/bench_search.py fuzz [--rows 200000]
+  python scripts/bench_search.py fuzzy [--rows 100000 | --rows 1000000]
+  python scripts/bench_search.py concurrency [--rows 200000]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# База бенчмарка создается во временной директории до импорта настроек сервиса
+_bench_dir = tempfile.mkdtemp(prefix="bench_search_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_bench_dir, 'search_service.db')}"
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from apps.search_service.app.db.session import ReadSessionLocal, SessionLocal, engine, init_db, read_engine
+from apps.search_service.app.repositories import search_repo as search_repo_module
+from apps.search_service.app.repositories.search_repo import SearchRepository
+from apps.search_service.app.repositories.history_repo import HistoryRepository
+from apps.search_service.app.schemas.search import SearchRequestParams
+from apps.search_service.app.core.config import settings
+from apps.search_service.app.services import search_service as search_service_module
+from apps.search_service.app.services.search_service import SearchService
+from apps.search_service.app.services.history_writer import history_writer
+from apps.search_service.app.services.autocomplete_index import autocomplete_index
+from apps.search_service.app.services.indexing_service import IndexingService, index_generation
+from libs.shared.shared.dto.language import Lang
+
+WORDS = [
+    "насилие", "защита", "право", "семья", "помощь", "жертва", "угроза", "контроль",
+    "violence", "protection", "family", "support", "victim", "abuse", "order", "safety",
+    "зорлық", "отбасы", "көмек", "қорғау", "құқық", "қауіп", "бақылау", "әйел",
+]
+TAGS = ["психология", "юриспруденция", "медицина", "социальная работа", "полиция", "образование"]
+CATEGORIES = ["Виды насилия", "Правовая защита", "Поддержка пострадавших", "Профилактика"]
+
+
+def populate(rows: int, seed: int = 42) -> None:
+    rnd = random.Random(seed)
+    fts_rows = []
+    meta_rows = []
+    for term_id in range(1, rows + 1):
+        title = " ".join(rnd.sample(WORDS, 2)) + f" {term_id}"
+        definition = " ".join(rnd.choices(WORDS, k=12))
+        fts_rows.append((term_id, "ru", title, definition, definition[:60], "", "", ""))
+        meta_rows.append((term_id, "approved", rnd.randint(1, 20), 0, rnd.randint(0, 5000), ""))
+
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.executemany(
+            "INSERT INTO fts_terms (term_id, language, title, definition, short_definition, examples, synonyms, tags_text) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            fts_rows
+        )
+        cur.executemany(
+            "INSERT INTO term_meta (term_id, status, category_id, is_deleted, views, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            meta_rows
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def measure(fn, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "p99_ms": timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    }
+
+
+def report(label: str, result: dict) -> None:
+    print(
+        f"  {label:<40} median {result['median_ms']:9.3f} ms"
+        f"   p95 {result['p95_ms']:9.3f} ms   p99 {result['p99_ms']:9.3f} ms"
+    )
+
+
+def bench_count(args) -> None:
+    db = SessionLocal()
+    repo = SearchRepository(db)
+    service = SearchService(db)
+    query = "насилие"
+    size = 20
+
+    total = repo.count(query, "ru")
+    print(f"query={query!r}: {total} matching rows")
+
+    for page in (1, 10, 50):
+        offset = (page - 1) * size
+        params = SearchRequestParams(q=query, lang=Lang.ru, page=page, size=size)
+        print(f"page {page}:")
+
+        report("page only", measure(
+            lambda: repo.search(query, "ru", limit=size, offset=offset), args.repeat
+        ))
+        report("page + COUNT (uncached)", measure(
+            lambda: (repo.search(query, "ru", limit=size, offset=offset), repo.count(query, "ru")),
+            args.repeat
+        ))
+
+        def page_with_cached_count():
+            results = repo.search(query, "ru", limit=size, offset=offset)
+            service._count(params, offset, len(results))
+
+        search_service_module._count_cache.clear()
+        report("page + COUNT (TTL cache)", measure(page_with_cached_count, args.repeat))
+
+    db.close()
+
+
+def bench_cursor(args) -> None:
+    db = SessionLocal()
+    repo = SearchRepository(db)
+    query = "насилие"
+    size = 20
+    checkpoints = (1, 10, 50, 200)
+
+    # Проходим страницы по курсору, запоминая ключ начала каждой контрольной страницы
+    after = None
+    cursors = {}
+    for page in range(1, max(checkpoints) + 1):
+        if page in checkpoints:
+            cursors[page] = after
+        rows = repo.search(query, "ru", limit=size, after=after)
+        if not rows:
+            break
+        last = rows[-1]
+        after = (last["rank"], last["views"], last["term_id"])
+
+    for page in checkpoints:
+        if page not in cursors:
+            break
+        offset = (page - 1) * size
+        print(f"page {page}:")
+        report("LIMIT/OFFSET", measure(
+            lambda: repo.search(query, "ru", limit=size, offset=offset), args.repeat
+        ))
+        report("keyset cursor", measure(
+            lambda: repo.search(query, "ru", limit=size, after=cursors[page]), args.repeat
+        ))
+        assert repo.search(query, "ru", limit=size, offset=offset) == \
+            repo.search(query, "ru", limit=size, after=cursors[page])
+
+    db.close()
+
+
+def bench_history(args) -> None:
+    db = SessionLocal()
+    repo = SearchRepository(db)
+    history_repo = HistoryRepository(db)
+    # Селективный запрос: сам поиск дешевый, видно стоимость записи истории
+    query = "777"
+    filters = {"category_id": None, "letter": None, "status": None}
+
+    def search_with_commit():
+        repo.search(query, "ru", limit=20)
+        history_repo.create(user_id=None, query=query, lang="ru", filters=filters)
+
+    def search_with_queue():
+        repo.search(query, "ru", limit=20)
+        history_writer.enqueue(user_id=None, query=query, lang="ru", filters=filters)
+
+    repeat = max(args.repeat, 200)
+    report("search + HistoryRepository.create", measure(search_with_commit, repeat))
+    history_writer.start()
+    report("search + history_writer.enqueue", measure(search_with_queue, repeat))
+    history_writer.stop()
+    print(f"  writer stats: {history_writer.stats()}")
+
+    db.close()
+
+
+def bench_autocomplete(args) -> None:
+    db = SessionLocal()
+    repo = SearchRepository(db)
+
+    started = time.perf_counter()
+    loaded = autocomplete_index.load(db)
+    print(f"Prefix index: {loaded} titles loaded in {time.perf_counter() - started:.1f}s, "
+          f"{autocomplete_index.stats()['languages']['ru']['nodes']} nodes")
+
+    for prefix in ("н", "на", "нас", "насил", "violence p", "қорғау 12"):
+        print(f"prefix {prefix!r}:")
+        report("SQL (FTS5 title MATCH)", measure(
+            lambda: repo.autocomplete(prefix, "ru", limit=10), args.repeat
+        ))
+        report("in-memory prefix index", measure(
+            lambda: autocomplete_index.search(prefix, "ru", 10), max(args.repeat, 1000)
+        ))
+
+    db.close()
+
+
+def synthetic_docs(rows: int, seed: int = 7, denormalized: bool = False):
+    rnd = random.Random(seed)
+    for term_id in range(1, rows + 1):
+        definition = " ".join(rnd.choices(WORDS, k=12))
+        category_id = rnd.randint(1, 20)
+        yield {
+            "term_id": term_id,
+            "language": "ru",
+            "title": " ".join(rnd.sample(WORDS, 2)) + f" {term_id}",
+            "definition": definition,
+            "short_definition": definition[:60],
+            "examples": None,
+            "synonyms": None,
+            "tags_text": " ".join(rnd.sample(TAGS, 2)) if denormalized else "",
+            "category_text": CATEGORIES[category_id % len(CATEGORIES)] if denormalized else "",
+            "status": "approved",
+            "category_id": category_id,
+            "is_deleted": False,
+            "views": rnd.randint(0, 5000),
+            "created_at": ""
+        }
+
+
+def bench_reindex(args) -> None:
+    db = SessionLocal()
+    service = IndexingService(db)
+    batch_size = 5000
+
+    # Старый путь: DELETE (полный проход по FTS5) + INSERT + два коммита на каждый перевод;
+    # меряем на выборке и экстраполируем
+    sample = 100
+    started = time.perf_counter()
+    for doc in synthetic_docs(sample, seed=11):
+        service.index_term(**doc)
+    per_row = (time.perf_counter() - started) / sample
+    print(f"  {'index_term per row':<40} {1 / per_row:9.0f} rows/sec"
+          f"   (~{per_row * args.rows:.0f}s for {args.rows} rows)")
+
+    def batches():
+        batch = []
+        for doc in synthetic_docs(args.rows):
+            batch.append(doc)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    started = time.perf_counter()
+    indexed = service.rebuild_index(batches())
+    elapsed = time.perf_counter() - started
+    print(f"  {'rebuild_index (shadow + swap)':<40} {indexed / elapsed:9.0f} rows/sec"
+          f"   ({indexed} rows in {elapsed:.1f}s)")
+    assert SearchRepository(db).count("насилие", "ru") > 0
+
+    started = time.perf_counter()
+    batch = list(synthetic_docs(batch_size, seed=13))
+    service.bulk_index_terms(batch)
+    elapsed = time.perf_counter() - started
+    print(f"  {'bulk_index_terms (in place)':<40} {len(batch) / elapsed:9.0f} rows/sec")
+
+    db.close()
+
+
+def bench_denormalized(args) -> None:
+    db = SessionLocal()
+    repo = SearchRepository(db)
+    service = IndexingService(db)
+    weighted_rank = search_repo_module.BM25_RANK
+    queries = ("насилие", "защита семья", "психология", "правовая")
+
+    def batches(denormalized: bool):
+        docs = list(synthetic_docs(args.rows, denormalized=denormalized))
+        for start in range(0, len(docs), 5000):
+            yield docs[start:start + 5000]
+
+    def index_size() -> float:
+        db.execute(text("VACUUM"))
+        return os.path.getsize(engine.url.database) / 1024 / 1024
+
+    for label, denormalized, rank in (
+        ("before: no tags/category, plain bm25", False, "bm25(fts_terms)"),
+        ("after: tags + category, weighted bm25", True, weighted_rank),
+    ):
+        service.rebuild_index(batches(denormalized))
+        search_repo_module.BM25_RANK = rank
+        print(f"{label}: database {index_size():.1f} MB")
+        for query in queries:
+            hits = repo.count(query, "ru")
+            report(f"{query!r} ({hits} hits)", measure(
+                lambda: repo.search(query, "ru", limit=20), args.repeat
+            ))
+
+    # Заголовок должен перевешивать теги: документ с запросом в заголовке выше документа с ним же в тегах
+    service.bulk_index_terms([
+        dict(next(synthetic_docs(1)), term_id=args.rows + 1, title="медицина", tags_text="право"),
+        dict(next(synthetic_docs(1)), term_id=args.rows + 2, title="право", tags_text="медицина"),
+    ])
+    top = repo.search("медицина", "ru", limit=1)
+    assert top and top[0]["term_id"] == args.rows + 1, top
+    search_repo_module.BM25_RANK = weighted_rank
+
+    db.close()
+
+
+def bench_resultcache(args) -> None:
+    db = SessionLocal()
+    service = SearchService(db)
+    rnd = random.Random(3)
+
+    # Поток с тяжелой головой: распределение Ципфа по нескольким сотням разных запросов
+    distinct = [f"{a} {b}" for a in WORDS for b in WORDS if a != b][:300]
+    weights = [1 / (rank + 1) for rank in range(len(distinct))]
+    stream = rnd.choices(distinct, weights=weights, k=max(args.repeat, 500))
+    calls = iter(stream * 2)
+
+    def one_search():
+        service.search(SearchRequestParams(q=next(calls), lang=Lang.ru, size=20))
+
+    original_get = search_service_module._result_cache.get
+    search_service_module._result_cache.get = lambda key, default=None: default
+    report("no result cache", measure(one_search, len(stream)))
+    search_service_module._result_cache.get = original_get
+
+    search_service_module._result_cache.clear()
+    search_service_module._count_cache.clear()
+    report("LRU+TTL result cache", measure(one_search, len(stream)))
+    print(f"  cache stats: {search_service_module.cache_stats()['results']}")
+
+    # Смена поколения индекса делает все прежние записи недоступными
+    params = SearchRequestParams(q=stream[0], lang=Lang.ru, size=20)
+    service.search(params)
+    hits = search_service_module._result_cache.hits
+    index_generation.bump()
+    service.search(params)
+    assert search_service_module._result_cache.hits == hits
+
+    history_writer.stop()
+    db.close()
+
+
+SEED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "domestic_violence_terms.json")
+
+# Размеченные запросы в косвенных формах к терминам сида: (запрос, язык, id термина)
+MORPHOLOGY_QUERIES = [
+    ("домашнего насилия", "ru", 1),
+    ("выученной беспомощности", "ru", 6),
+    ("домашнем рабстве", "ru", 9),
+    ("защитного предписания", "ru", 11),
+    ("инструментализации страха", "ru", 12),
+    ("кризисные центры для женщин", "ru", 17),
+    ("личных границ", "ru", 18),
+    ("маритального изнасилования", "ru", 20),
+    ("насильственного доминирования", "ru", 22),
+    ("патологической ревностью", "ru", 25),
+    ("права ребенка в семье", "ru", 27),
+    ("принудительной беременности", "ru", 28),
+    ("принуждения к браку", "ru", 29),
+    ("гендерных ролей", "ru", 30),
+    ("психологической поддержки подростков", "ru", 31),
+    ("психологического насилия", "ru", 33),
+    ("ранние браки", "ru", 34),
+    ("сексуальной эксплуатации", "ru", 37),
+    ("кибербуллингом", "ru", 15),
+    ("қорғау нұсқамасын", "kz", 11),
+    ("жеке шекараларды", "kz", 18),
+    ("ерте некеге", "kz", 34),
+    ("патологиялық қызғанышты", "kz", 25),
+    ("психологиялық зорлықтың", "kz", 33),
+    ("мәжбүрлі жүктілікке", "kz", 28),
+    ("тұрмыстық құлдықтан", "kz", 9),
+    ("дағдарыс орталықтары", "kz", 17),
+    ("сексуалдық қанауды", "kz", 37),
+    ("психологиялық қолдауды", "kz", 31),
+]
+
+
+def seed_docs():
+    with open(SEED_FILE, encoding="utf-8") as f:
+        terms = json.load(f)["terms"]
+    for term in terms:
+        for language, title in term.get("title", {}).items():
+            language = "kz" if language == "kk" else language
+            if language not in ("ru", "kz", "en"):
+                continue
+            definition = term.get("definition", {}).get("kk" if language == "kz" else language, "")
+            yield {
+                "term_id": term["id"],
+                "language": language,
+                "title": title,
+                "definition": definition,
+                "short_definition": None,
+                "examples": None,
+                "synonyms": None,
+                "tags_text": "",
+                "category_text": "",
+                "status": "approved",
+                "category_id": 1,
+                "is_deleted": False,
+                "views": 0,
+                "created_at": ""
+            }
+
+
+def bench_morphology(args) -> None:
+    db = SessionLocal()
+    repo = SearchRepository(db)
+    service = IndexingService(db)
+
+    def recall(top: int = 10) -> float:
+        found = 0
+        for query, language, term_id in MORPHOLOGY_QUERIES:
+            hits = repo.search(query, language, limit=top)
+            found += any(hit["term_id"] == term_id for hit in hits)
+        return found / len(MORPHOLOGY_QUERIES)
+
+    service.rebuild_index([list(seed_docs())])
+    print(f"seed ({len(MORPHOLOGY_QUERIES)} inflected queries):")
+    for enabled in (False, True):
+        settings.search_morphology = enabled
+        print(f"  {'morphology ' + ('on' if enabled else 'off'):<40} recall@10 {recall():.2f}")
+
+    docs = list(synthetic_docs(args.rows))
+    service.rebuild_index(docs[start:start + 5000] for start in range(0, len(docs), 5000))
+    print(f"synthetic {args.rows} rows:")
+    for query in ("насилие", "насилием", "защиты семьи"):
+        for enabled in (False, True):
+            settings.search_morphology = enabled
+            hits = repo.count(query, "ru")
+            report(f"{query!r} morphology {'on' if enabled else 'off'} ({hits})", measure(
+                lambda: repo.search(query, "ru", limit=20), args.repeat
+            ))
+
+    db.close()
+
+
+WORST_CASE_QUERIES = [
+    "н*",
+    "a* b* c* d* e* f* g* h* i* j* k* l*",
+    " OR ".join(WORDS * 4),
+    "NEAR(насилие защита, 50)",
+    '"насилие',
+    "зорлық-зомбылық",
+    "foo:bar",
+    "насилие AND (защита OR",
+    " ".join(WORDS * 8)[:200],
+]
+
+
+def bench_fuzz(args) -> None:
+    db = SessionLocal()
+    repo = SearchRepository(db)
+
+    # Корректность compile_match на произвольном вводе проверяется в apps/search_service/tests/test_fts_query.py
+    def legacy(query: str):
+        # Прежняя интерполяция f'"{query}"* OR {query}'
+        return db.execute(text(f"""
+            SELECT fts.term_id, bm25(fts_terms) AS rank
+            FROM fts_terms fts
+            JOIN term_meta tm ON fts.term_id = tm.term_id
+            WHERE fts.language = 'ru' AND fts_terms MATCH :query AND tm.is_deleted = 0
+            ORDER BY rank LIMIT 20
+        """), {"query": f'"{query}"* OR {query}'}).fetchall()
+
+    print("worst-case inputs:")
+    for query in WORST_CASE_QUERIES:
+        label = query if len(query) <= 36 else query[:33] + "..."
+        try:
+            result = measure(lambda: legacy(query), args.repeat)
+            legacy_text = f"legacy {result['median_ms']:9.1f} ms"
+        except Exception as e:
+            db.rollback()
+            legacy_text = f"legacy  {type(e).__name__}"
+        result = measure(lambda: repo.search(query, "ru", limit=20), args.repeat)
+        print(f"  {label!r:<40} {legacy_text:<28} compiled {result['median_ms']:9.1f} ms")
+
+    db.close()
+
+
+SYLLABLES = [
+    "ба", "ве", "го", "да", "же", "зи", "ка", "ло", "ми", "не", "ор", "па", "ре", "са", "ту", "фе",
+    "ха", "це", "чи", "ша", "юн", "ям", "ан", "ел", "ир", "ос", "ук", "ет", "ин", "ру", "ст", "пр"
+]
+
+
+def pseudo_word(rnd: random.Random) -> str:
+    return "".join(rnd.choices(SYLLABLES, k=rnd.randint(2, 4)))
+
+
+def typo(word: str, rnd: random.Random) -> str:
+    # Одна опечатка: замена, пропуск или перестановка соседних букв
+    i = rnd.randrange(len(word) - 1)
+    kind = rnd.choice(("substitution", "deletion", "transposition"))
+    if kind == "substitution":
+        return word[:i] + rnd.choice("абвгдеиклмнопрст".replace(word[i], "")) + word[i + 1:]
+    if kind == "deletion":
+        return word[:i] + word[i + 1:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def bench_fuzzy(args) -> None:
+    db = SessionLocal()
+    repo = SearchRepository(db)
+    service = IndexingService(db)
+    rnd = random.Random(11)
+
+    # Разнообразные заголовки из псевдослов: у синтетики из WORDS всего десяток разных слов
+    titles = {}
+    docs = []
+    for doc in synthetic_docs(args.rows):
+        title = f"{pseudo_word(rnd)} {pseudo_word(rnd)}"
+        doc["title"] = title
+        titles[doc["term_id"]] = title
+        docs.append(doc)
+    started = time.perf_counter()
+    service.rebuild_index(docs[start:start + 5000] for start in range(0, len(docs), 5000))
+    print(f"rebuilt {args.rows} titles with trigram index in {time.perf_counter() - started:.1f}s")
+
+    queries = []
+    for term_id in rnd.sample(sorted(titles), 200):
+        words = titles[term_id].split()
+        words[0] = typo(words[0], rnd)
+        queries.append((" ".join(words), term_id))
+
+    exact = sum(any(hit["term_id"] == term_id for hit in repo.search(query, "ru", limit=10)) for query, term_id in queries)
+    timings = []
+    found = 0
+    for query, term_id in queries:
+        started = time.perf_counter()
+        hits = repo.fuzzy_search(
+            query, "ru", limit=10,
+            candidate_cap=settings.search_fuzzy_candidate_cap,
+            max_trigrams=settings.search_fuzzy_max_trigrams,
+            max_postings=settings.search_fuzzy_max_postings
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+        found += any(hit["term_id"] == term_id for hit in hits)
+    timings.sort()
+
+    print(f"{len(queries)} titles with one typo (cap {settings.search_fuzzy_candidate_cap}, "
+          f"{settings.search_fuzzy_max_trigrams} trigrams, {settings.search_fuzzy_max_postings} postings):")
+    print(f"  {'exact FTS recall@10':<40} {exact / len(queries):.2f}")
+    print(f"  {'fuzzy fallback recall@10':<40} {found / len(queries):.2f}")
+    report("fuzzy fallback latency", {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[int(len(timings) * 0.95)],
+        "p99_ms": timings[int(len(timings) * 0.99)]
+    })
+
+    db.close()
+
+
+def bench_concurrency(args) -> None:
+    # Селективные запросы (слово + номер из заголовка): видна конкуренция за соединения и блокировки,
+    # а не стоимость одного тяжелого запроса
+    rnd = random.Random(3)
+    searches = max(args.repeat * 100, 2000)
+    queries = [f"{rnd.choice(WORDS)} {rnd.randint(1, args.rows)}" for _ in range(searches)]
+    filters = {"category_id": None, "letter": None, "status": None}
+
+    def run(read_factory, write_factory, workers: int) -> str:
+        # Параллельно с поиском пишется история: пачка из 50 строк каждые 20 мс, как у history_writer
+        stop = threading.Event()
+
+        def writer():
+            db = write_factory()
+            repo = HistoryRepository(db)
+            while not stop.is_set():
+                repo.create_many([
+                    {"user_id": None, "query": "bench", "lang": "ru", "filters_json": json.dumps(filters)}
+                    for _ in range(50)
+                ])
+                time.sleep(0.02)
+            db.close()
+
+        timings = []
+
+        def worker(index: int) -> None:
+            db = read_factory()
+            repo = SearchRepository(db)
+            for i in range(index, searches, workers):
+                search_started = time.perf_counter()
+                repo.search(queries[i], "ru", limit=20)
+                db.rollback()
+                timings.append((time.perf_counter() - search_started) * 1000)
+            db.close()
+
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(worker, range(workers)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        writer_thread.join()
+        timings.sort()
+        return f"{searches / elapsed:8.1f} searches/s   p99 {timings[int(len(timings) * 0.99)]:8.2f} ms"
+
+    # До: один engine без настроек, журнал отката, поиск и запись через общий пул
+    engine.dispose()
+    legacy_engine = create_engine(os.environ["DATABASE_URL"], connect_args={"check_same_thread": False})
+    with legacy_engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=DELETE")
+    legacy_factory = sessionmaker(autocommit=False, autoflush=False, bind=legacy_engine)
+    for workers in (1, 4, 16):
+        print(f"  {'shared engine, rollback journal':<34} {workers:>2} workers  {run(legacy_factory, legacy_factory, workers)}")
+    legacy_engine.dispose()
+
+    # После: WAL, запись через engine, поиск через пул только для чтения
+    for workers in (1, 4, 16):
+        print(f"  {'WAL + read-only pool':<34} {workers:>2} workers  {run(ReadSessionLocal, SessionLocal, workers)}")
+    print(f"  read pool: {read_engine.pool.status()}")
+
+
+BENCHMARKS = {
+    "count": bench_count,
+    "cursor": bench_cursor,
+    "history": bench_history,
+    "autocomplete": bench_autocomplete,
+    "reindex": bench_reindex,
+    "denormalized": bench_denormalized,
+    "resultcache": bench_resultcache,
+    "morphology": bench_morphology,
+    "fuzz": bench_fuzz,
+    "fuzzy": bench_fuzzy,
+    "concurrency": bench_concurrency,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="search_service benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    populate(args.rows)
+    print(f"Indexed {args.rows} synthetic rows in {time.perf_counter() - started:.1f}s ({_bench_dir})")
+
+    BENCHMARKS[args.benchmark](args)
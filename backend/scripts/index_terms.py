@@ -1,69 +1,68 @@
+import argparse
 import sys
 import os
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from apps.dictionary_service.app.db.session import SessionLocal as DictSession, init_db as init_dict_db
 from apps.search_service.app.db.session import SessionLocal as SearchSession, init_db as init_search_db
-from apps.dictionary_service.app.repositories.term_repo import TermRepository
+from apps.search_service.app.repositories.change_feed_repo import ChangeFeedRepository
 from apps.search_service.app.services.indexing_service import IndexingService
+from apps.search_service.app.services.change_feed import FEED_NAME
+from libs.shared.shared.feed.outbox import OutboxReader
 
-def index_all_terms():
+
+def index_all_terms(batch_size: int, in_place: bool):
     init_dict_db()
     init_search_db()
     
     dict_db = DictSession()
     search_db = SearchSession()
     
-    term_repo = TermRepository(dict_db)
+    reader = OutboxReader(dict_db)
     indexing_service = IndexingService(search_db)
     
-    terms = term_repo.get_all(limit=1000, offset=0)
-    print(f"Found {len(terms)} terms to index")
+    # Позиция журнала берется до чтения терминов: изменения во время переиндексации
+    # потребитель применит повторно, это безопасно
+    head_seq = reader.get_head_seq()
+    stats = {"terms": 0}
+    
+    def batches():
+        for docs in reader.iter_documents(batch_size=batch_size):
+            stats["terms"] += len({doc["term_id"] for doc in docs})
+            yield docs
     
-    indexed = 0
-    for term in terms:
-        if term.is_deleted:
-            continue
-            
-        # Получаем все переводы термина
-        translations = []
-        for lang in ['ru', 'en', 'kz']:
-            trans = term_repo.get_translation(term.id, lang)
-            if trans:
-                translations.append(trans)
-        
-        for trans in translations:
-            try:
-                indexing_service.index_term(
-                    term_id=term.id,
-                    language=trans.language,
-                    title=trans.title,
-                    definition=trans.definition,
-                    short_definition=trans.short_definition,
-                    examples=trans.examples,
-                    synonyms=trans.synonyms,
-                    tags_text="",
-                    status=term.status.value,
-                    category_id=term.category_id,
-                    is_deleted=term.is_deleted,
-                    views=term.views,
-                    created_at=term.created_at.isoformat() if term.created_at else ""
-                )
-                indexed += 1
-            except Exception as e:
-                print(f"Error indexing term {term.id} ({trans.language}): {e}")
+    started = time.perf_counter()
+    if in_place:
+        indexed = sum(indexing_service.bulk_index_terms(docs) for docs in batches())
+    else:
+        indexed = indexing_service.rebuild_index(batches())
+    elapsed = time.perf_counter() - started
     
-    print(f"✓ Indexed {indexed} term translations")
+    ChangeFeedRepository(search_db).set_last_seq(FEED_NAME, head_seq)
+    search_db.commit()
+    
+    print(f"✓ Indexed {indexed} translations of {stats['terms']} terms in {elapsed:.1f}s "
+          f"({indexed / elapsed if elapsed else 0:.0f} rows/sec)")
     
     dict_db.close()
     search_db.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reindex dictionary terms into FTS5")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--in-place",
+        action="store_true",
+        help="upsert into the live index instead of building a shadow copy and swapping it in"
+    )
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Indexing terms in FTS5...")
     print("=" * 60)
-    index_all_terms()
+    index_all_terms(args.batch_size, args.in_place)
     print("=" * 60)
     print("✓ Done!")
     print("=" * 60)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест search_service: быстрые и медленные запросы одновременно
+Использование:
+  python scripts/load_test.py [--rows 200000] [--duration 10] [--slow 8] [--fast 8] [--fast-interval-ms 10]
+
+Медленные запросы - поиск по частому слову с глубокой страницей, быстрые - /health.
+Сравниваются обработчик поиска в виде async def (блокирующий SQLAlchemy в event loop,
+как было раньше) и текущий синхронный обработчик, который FastAPI выполняет в пуле потоков.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# bench_search создает временную базу до импорта настроек сервиса
+from bench_search import WORDS, populate
+
+import httpx
+from apps.search_service.app.core.config import settings
+from apps.search_service.app.db.session import ReadSessionLocal, init_db
+from apps.search_service.app.main import app
+from apps.search_service.app.schemas.search import SearchRequestParams
+from apps.search_service.app.services.search_service import SearchService
+from libs.shared.shared.dto.language import Lang
+from libs.shared.shared.utils.concurrency import configure_threadpool
+
+
+@app.get("/bench/search-async")
+async def search_async(q: str, page: int = 1):
+    # Прежний вид обработчика: синхронная сессия прямо в корутине
+    db = ReadSessionLocal()
+    try:
+        return SearchService(db).search(SearchRequestParams(q=q, lang=Lang.ru, page=page))
+    finally:
+        db.close()
+
+
+async def run(path: str, args) -> dict:
+    deadline = time.perf_counter() + args.duration
+    slow_done = []
+    fast_latency = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        async def slow_client(index: int):
+            page = index * 1000
+            while time.perf_counter() < deadline:
+                page += 1
+                # Разные страницы, чтобы не попадать в кэш результатов
+                response = await client.get(path, params={"q": WORDS[index % len(WORDS)], "page": page % 500 + 1})
+                response.raise_for_status()
+                slow_done.append(1)
+
+        async def fast_client():
+            # Задержка считается от момента, когда запрос должен был уйти по расписанию:
+            # ожидание заблокированного event loop тоже входит в нее
+            due = time.perf_counter()
+            while due < deadline:
+                response = await client.get("/health")
+                response.raise_for_status()
+                finished = time.perf_counter()
+                fast_latency.append((finished - due) * 1000)
+                due = max(due + args.fast_interval_ms / 1000, finished)
+                await asyncio.sleep(max(due - time.perf_counter(), 0))
+
+        await asyncio.gather(
+            *(fast_client() for _ in range(args.fast)),
+            *(slow_client(i) for i in range(args.slow))
+        )
+
+    fast_latency.sort()
+    return {
+        "slow_rps": len(slow_done) / args.duration,
+        "fast_rps": len(fast_latency) / args.duration,
+        "fast_p50_ms": statistics.median(fast_latency) if fast_latency else float("nan"),
+        "fast_p99_ms": fast_latency[int(len(fast_latency) * 0.99)] if fast_latency else float("nan")
+    }
+
+
+async def main(args) -> None:
+    configure_threadpool(settings.threadpool_size)
+    for label, path in (("async def + sync SQLAlchemy", "/bench/search-async"), ("def in threadpool", "/api/v1/search")):
+        result = await run(path, args)
+        print(
+            f"  {label:<30} slow {result['slow_rps']:7.1f} req/s   fast {result['fast_rps']:8.1f} req/s"
+            f"   fast p50 {result['fast_p50_ms']:8.2f} ms   p99 {result['fast_p99_ms']:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="search_service mixed load test")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--slow", type=int, default=8)
+    parser.add_argument("--fast", type=int, default=8)
+    parser.add_argument("--fast-interval-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    settings.search_fuzzy_fallback = False
+    init_db()
+    populate(args.rows)
+    print(f"{args.rows} rows, {args.slow} slow + {args.fast} fast clients, {args.duration:.0f}s each, threadpool {settings.threadpool_size}")
+    asyncio.run(main(args))
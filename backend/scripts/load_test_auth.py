@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест входа в auth_service
+Использование:
+  python scripts/load_test_auth.py [--clients 50] [--duration 10] [--rounds 10] [--max-pending 64]
+
+Логины идут с clients одновременных клиентов, параллельно с ними /health по расписанию.
+Сравнивается bcrypt в потоке обработчика (как было раньше) и в пуле процессов,
+в том числе с короткой очередью, когда лишние логины получают 503.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Временные база и ключи подписи до импорта настроек сервиса
+_tmp = tempfile.mkdtemp(prefix="load_test_auth_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'auth.db')}"
+os.environ["JWT_KEYS_DIR"] = os.path.join(_tmp, "keys")
+
+import bcrypt
+import httpx
+from fastapi.testclient import TestClient
+from apps.auth_service.app.core import hashing, rate_limit, security
+from apps.auth_service.app.core.config import settings
+from apps.auth_service.app.core.hashing import PasswordHasher
+from apps.auth_service.app.core.rate_limit import RateDecision
+from apps.auth_service.app.db.models.user import User
+from apps.auth_service.app.db.session import SessionLocal, init_db
+from apps.auth_service.app.main import app
+from libs.shared.shared.utils.concurrency import configure_threadpool
+
+PASSWORD = "password123"
+
+
+class NoRateLimit:
+    # Все клиенты теста приходят с одного адреса: лимит на логин здесь не проверяется
+    def hit(self, key, policy):
+        return RateDecision(True)
+
+
+def populate(users: int, rounds: int) -> None:
+    db = SessionLocal()
+    hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+    db.add_all(User(name=f"user{i}", email=f"user{i}@example.com", password_hash=hashed) for i in range(users))
+    db.commit()
+    db.close()
+
+
+def check_rehash() -> None:
+    db = SessionLocal()
+    user = User(name="old", email="old@example.com", password_hash=bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(4)).decode("utf-8"))
+    db.add(user)
+    db.commit()
+    db.close()
+
+    # Без startup пул не запущен, хэширование идет в потоке
+    client = TestClient(app)
+    response = client.post("/api/v1/auth/login", json={"email": "old@example.com", "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    db = SessionLocal()
+    hashed = db.query(User.password_hash).filter(User.email == "old@example.com").scalar()
+    db.close()
+    assert hashed.startswith(f"$2b${settings.bcrypt_rounds:02d}$"), hashed
+    print(f"rehash on login: $2b$04$ -> {hashed[:7]}")
+
+
+async def run(hasher: PasswordHasher, args) -> dict:
+    # security.py и password_slot берут модульный password_hasher: подменяем его на хэшер режима
+    security.password_hasher = hasher
+    hashing.password_hasher = hasher
+    hasher.start()
+    deadline = time.perf_counter() + args.duration
+    latency = []
+    rejected = []
+    health_latency = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=None) as client:
+        async def login_client(index: int):
+            # Клиент перебирает своих пользователей
+            user = index
+            while time.perf_counter() < deadline:
+                user = (user + args.clients) % args.users
+                started = time.perf_counter()
+                response = await client.post("/api/v1/auth/login", json={"email": f"user{user}@example.com", "password": PASSWORD})
+                if response.status_code == 503:
+                    rejected.append(1)
+                    # Клиент выполняет Retry-After, а не повторяет сразу
+                    await asyncio.sleep(float(response.headers["Retry-After"]))
+                    continue
+                response.raise_for_status()
+                latency.append((time.perf_counter() - started) * 1000)
+
+        async def health_client():
+            due = time.perf_counter()
+            while due < deadline:
+                response = await client.get("/health")
+                response.raise_for_status()
+                finished = time.perf_counter()
+                health_latency.append((finished - due) * 1000)
+                due = max(due + 0.01, finished)
+                await asyncio.sleep(max(due - time.perf_counter(), 0))
+
+        await asyncio.gather(health_client(), *(login_client(i) for i in range(args.clients)))
+
+    hasher.shutdown()
+    latency.sort()
+    health_latency.sort()
+    return {
+        "rps": len(latency) / args.duration,
+        "p50_ms": statistics.median(latency) if latency else float("nan"),
+        "p99_ms": latency[int(len(latency) * 0.99)] if latency else float("nan"),
+        "rejected": len(rejected),
+        "health_p99_ms": health_latency[int(len(health_latency) * 0.99)]
+    }
+
+
+async def main(args) -> None:
+    configure_threadpool(settings.threadpool_size)
+    modes = (
+        ("bcrypt in handler thread", PasswordHasher(0, args.max_pending)),
+        (f"process pool x{settings.password_hash_workers}", PasswordHasher(settings.password_hash_workers, args.max_pending)),
+        (f"process pool, queue {args.short_queue}", PasswordHasher(settings.password_hash_workers, args.short_queue)),
+    )
+    for label, hasher in modes:
+        result = await run(hasher, args)
+        print(
+            f"  {label:<28} login {result['rps']:6.1f} req/s   p50 {result['p50_ms']:8.1f} ms   p99 {result['p99_ms']:8.1f} ms"
+            f"   503 {result['rejected']:5d}   /health p99 {result['health_p99_ms']:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="auth_service login load test")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--short-queue", type=int, default=8)
+    args = parser.parse_args()
+
+    settings.bcrypt_rounds = args.rounds
+    rate_limit._rate_limiter = NoRateLimit()
+    init_db()
+    populate(args.users, args.rounds)
+    check_rehash()
+    print(f"{args.clients} clients, {args.duration:.0f}s each, bcrypt rounds {args.rounds}, threadpool {settings.threadpool_size}")
+    asyncio.run(main(args))
@@ -94,6 +94,7 @@ def seed_dictionary(admin_id: int):
             antonyms="аналогтық формат"
         )
         term_repo.update(term1, views=1250)
+        db.commit()
         print("✓ Created term 'Digitalization' with translations (ru, en, kz)")
     else:
         print("✓ Term 'Digitalization' already exists")
@@ -138,6 +139,7 @@ def seed_dictionary(admin_id: int):
             antonyms="инфрақұрылымның жоқтығы"
         )
         term_repo.update(term2, views=980)
+        db.commit()
         print("✓ Created term 'Infrastructure' with translations (ru, en, kz)")
     else:
         print("✓ Term 'Infrastructure' already exists")